@@ -0,0 +1,445 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional,
+                    Sequence, Tuple, Union)
+
+from database import (
+    DatabaseManager, AttendanceResult, BulkImportResult, BulkWriteResult, CourseStatistics,
+    GradingResult, Page, Record, StudentRecord,
+    AT_RISK_THRESHOLD, DEFAULT_BULK_CHUNK_SIZE, DEFAULT_FETCH_BATCH_SIZE, DEFAULT_PAGE_SIZE,
+    DEFAULT_PERCENTILES, DEFAULT_SORT
+)
+from models import Student
+from query import StudentQuery
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READERS = 4
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+class _RunningCall:
+    """Tracks the connection a worker thread is using so it can be interrupted"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.cancelled = False
+
+    def start(self, conn: sqlite3.Connection):
+        with self._lock:
+            if self.cancelled:
+                raise asyncio.CancelledError()
+            self._conn = conn
+
+    def finish(self):
+        with self._lock:
+            self._conn = None
+
+    def interrupt(self):
+        with self._lock:
+            self.cancelled = True
+            if self._conn is not None:
+                self._conn.interrupt()
+
+
+class AsyncDatabaseManager:
+    """
+    Asyncio front end for DatabaseManager.
+
+    Every public DatabaseManager method is available as a coroutine. Reads
+    run on a pool of reader threads, each with its own pooled connection, so
+    they proceed in parallel under WAL. Writes run on a single writer thread,
+    which serializes them without holding up readers. At most max_concurrency
+    calls are in flight at once; further callers wait.
+
+    Cancelling a call that is still queued drops it. Cancelling one that is
+    running interrupts its SQLite statement, and a write is rolled back.
+    """
+
+    def __init__(self, db_name: str = "student_management.db",
+                 readers: int = DEFAULT_READERS,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 **db_options):
+        """
+        Args:
+            db_name: Path of the SQLite database file
+            readers: Number of reader threads/connections
+            max_concurrency: Maximum calls in flight (queued in executors or running)
+            **db_options: Passed to DatabaseManager (e.g. result_cache_size)
+        """
+        if db_options.get("pooled") is False:
+            raise ValueError("AsyncDatabaseManager requires pooled connections")
+        self.db = DatabaseManager(db_name, **db_options)
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix="db-reader")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="db-writer")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    async def open(cls, db_name: str = "student_management.db", **options) -> "AsyncDatabaseManager":
+        """Create a manager without blocking the event loop on schema setup"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, partial(cls, db_name, **options))
+
+    async def close(self):
+        """Wait for in-flight calls, then stop the threads and close connections"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._readers.shutdown)
+        await loop.run_in_executor(None, self._writer.shutdown)
+        self.db.close()
+
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _run(self, executor: ThreadPoolExecutor, func: Callable, *args, **kwargs):
+        """Run func on executor, interrupting its statement if we are cancelled"""
+        call = _RunningCall()
+
+        def run():
+            call.start(self.db.pool.get_connection())
+            try:
+                return func(*args, **kwargs)
+            finally:
+                call.finish()
+
+        async with self._semaphore:
+            future = asyncio.get_running_loop().run_in_executor(executor, run)
+            try:
+                return await future
+            except asyncio.CancelledError:
+                call.interrupt()
+                raise
+
+    def _read(self, func: Callable, *args, **kwargs):
+        return self._run(self._readers, func, *args, **kwargs)
+
+    def _write(self, func: Callable, *args, **kwargs):
+        return self._run(self._writer, func, *args, **kwargs)
+
+    # Writes
+
+    async def add_student(self, student_data: Union[Student, Mapping[str, Any]]) -> int:
+        """Async variant of DatabaseManager.add_student"""
+        return await self._write(self.db.add_student, student_data)
+
+    async def add_students_bulk(self, students: Iterable[Dict[str, Any]],
+                                chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                                validate: bool = False) -> BulkImportResult:
+        """Async variant of DatabaseManager.add_students_bulk"""
+        return await self._write(self.db.add_students_bulk, students, chunk_size, validate)
+
+    async def update_student(self, student_id: str, update_data: Mapping[str, Any]) -> bool:
+        """Async variant of DatabaseManager.update_student"""
+        return await self._write(self.db.update_student, student_id, update_data)
+
+    async def delete_student(self, student_id: str) -> bool:
+        """Async variant of DatabaseManager.delete_student"""
+        return await self._write(self.db.delete_student, student_id)
+
+    async def update_students(self, changes: Mapping[str, Any],
+                              student_ids: Optional[Iterable[str]] = None,
+                              attendance_delta: Optional[float] = None,
+                              dry_run: bool = False, **filters) -> BulkWriteResult:
+        """Async variant of DatabaseManager.update_students"""
+        if student_ids is not None:
+            student_ids = list(student_ids)
+        return await self._write(self.db.update_students, changes, student_ids,
+                                 attendance_delta, dry_run, **filters)
+
+    async def delete_students(self, student_ids: Optional[Iterable[str]] = None,
+                              dry_run: bool = False, **filters) -> BulkWriteResult:
+        """Async variant of DatabaseManager.delete_students"""
+        if student_ids is not None:
+            student_ids = list(student_ids)
+        return await self._write(self.db.delete_students, student_ids, dry_run, **filters)
+
+    async def record_attendance(self, marks: Iterable[Tuple[str, str, bool]],
+                                chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> AttendanceResult:
+        """Async variant of DatabaseManager.record_attendance"""
+        return await self._write(self.db.record_attendance, marks, chunk_size)
+
+    async def rebuild_attendance(self) -> int:
+        """Async variant of DatabaseManager.rebuild_attendance"""
+        return await self._write(self.db.rebuild_attendance)
+
+    async def add_assessment(self, course: str, name: str, weight: float,
+                             max_score: float = 100.0) -> int:
+        """Async variant of DatabaseManager.add_assessment"""
+        return await self._write(self.db.add_assessment, course, name, weight, max_score)
+
+    async def delete_assessment(self, course: str, name: str) -> bool:
+        """Async variant of DatabaseManager.delete_assessment"""
+        return await self._write(self.db.delete_assessment, course, name)
+
+    async def record_scores(self, course: str, assessment: str,
+                            scores: Iterable[Tuple[str, float]],
+                            chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> int:
+        """Async variant of DatabaseManager.record_scores"""
+        return await self._write(self.db.record_scores, course, assessment, scores, chunk_size)
+
+    async def regrade_course(self, course: str, dry_run: bool = False) -> GradingResult:
+        """Async variant of DatabaseManager.regrade_course"""
+        return await self._write(self.db.regrade_course, course, dry_run)
+
+    async def allocate_student_id(self, year: Optional[int] = None) -> str:
+        """Async variant of DatabaseManager.allocate_student_id"""
+        return await self._write(self.db.allocate_student_id, year)
+
+    async def allocate_student_ids(self, count: int, year: Optional[int] = None) -> List[str]:
+        """Async variant of DatabaseManager.allocate_student_ids"""
+        return await self._write(self.db.allocate_student_ids, count, year)
+
+    async def rebuild_statistics(self):
+        """Async variant of DatabaseManager.rebuild_statistics"""
+        return await self._write(self.db.rebuild_statistics)
+
+    async def rebuild_search_index(self):
+        """Async variant of DatabaseManager.rebuild_search_index"""
+        return await self._write(self.db.rebuild_search_index)
+
+    async def migrate(self) -> int:
+        """Async variant of DatabaseManager.migrate"""
+        return await self._write(self.db.migrate)
+
+    # Reads
+
+    async def get_student(self, student_id: str) -> Optional[StudentRecord]:
+        """Async variant of DatabaseManager.get_student"""
+        return await self._read(self.db.get_student, student_id)
+
+    async def get_all_students(self) -> List[StudentRecord]:
+        """Async variant of DatabaseManager.get_all_students"""
+        return await self._read(self.db.get_all_students)
+
+    async def search_students(self, search_term: str) -> List[StudentRecord]:
+        """Async variant of DatabaseManager.search_students"""
+        return await self._read(self.db.search_students, search_term)
+
+    async def filter_by_course(self, course: str) -> List[StudentRecord]:
+        """Async variant of DatabaseManager.filter_by_course"""
+        return await self._read(self.db.filter_by_course, course)
+
+    async def filter_by_attendance(self, threshold: float) -> List[StudentRecord]:
+        """Async variant of DatabaseManager.filter_by_attendance"""
+        return await self._read(self.db.filter_by_attendance, threshold)
+
+    async def filter_by_grade(self, grade: str) -> List[StudentRecord]:
+        """Async variant of DatabaseManager.filter_by_grade"""
+        return await self._read(self.db.filter_by_grade, grade)
+
+    async def get_attendance_counts(self, student_id: str) -> Optional[Tuple[int, int]]:
+        """Async variant of DatabaseManager.get_attendance_counts"""
+        return await self._read(self.db.get_attendance_counts, student_id)
+
+    async def verify_attendance(self) -> List[str]:
+        """Async variant of DatabaseManager.verify_attendance"""
+        return await self._read(self.db.verify_attendance)
+
+    async def get_assessments(self, course: str) -> List[Record]:
+        """Async variant of DatabaseManager.get_assessments"""
+        return await self._read(self.db.get_assessments, course)
+
+    async def get_final_grades(self, course: str) -> List[Record]:
+        """Async variant of DatabaseManager.get_final_grades"""
+        return await self._read(self.db.get_final_grades, course)
+
+    async def get_course_statistics(self, course: Optional[str] = None,
+                                    percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+                                    at_risk_below: float = AT_RISK_THRESHOLD
+                                    ) -> List[CourseStatistics]:
+        """Async variant of DatabaseManager.get_course_statistics"""
+        return await self._read(self.db.get_course_statistics, course, percentiles,
+                                at_risk_below)
+
+    async def get_overall_statistics(self, percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+                                     at_risk_below: float = AT_RISK_THRESHOLD
+                                     ) -> CourseStatistics:
+        """Async variant of DatabaseManager.get_overall_statistics"""
+        return await self._read(self.db.get_overall_statistics, percentiles, at_risk_below)
+
+    async def get_unique_courses(self) -> List[str]:
+        """Async variant of DatabaseManager.get_unique_courses"""
+        return await self._read(self.db.get_unique_courses)
+
+    async def get_students_page(self, limit: int = DEFAULT_PAGE_SIZE,
+                                page_token: Optional[str] = None) -> Page:
+        """Async variant of DatabaseManager.get_students_page"""
+        return await self._read(self.db.get_students_page, limit, page_token)
+
+    async def search_students_page(self, search_term: str, limit: int = DEFAULT_PAGE_SIZE,
+                                   page_token: Optional[str] = None) -> Page:
+        """Async variant of DatabaseManager.search_students_page"""
+        return await self._read(self.db.search_students_page, search_term, limit, page_token)
+
+    async def filter_by_course_page(self, course: str, limit: int = DEFAULT_PAGE_SIZE,
+                                    page_token: Optional[str] = None) -> Page:
+        """Async variant of DatabaseManager.filter_by_course_page"""
+        return await self._read(self.db.filter_by_course_page, course, limit, page_token)
+
+    async def filter_by_attendance_page(self, threshold: float, limit: int = DEFAULT_PAGE_SIZE,
+                                        page_token: Optional[str] = None) -> Page:
+        """Async variant of DatabaseManager.filter_by_attendance_page"""
+        return await self._read(self.db.filter_by_attendance_page, threshold, limit, page_token)
+
+    async def filter_by_grade_page(self, grade: str, limit: int = DEFAULT_PAGE_SIZE,
+                                   page_token: Optional[str] = None) -> Page:
+        """Async variant of DatabaseManager.filter_by_grade_page"""
+        return await self._read(self.db.filter_by_grade_page, grade, limit, page_token)
+
+    async def query_students(self, query: StudentQuery) -> List[StudentRecord]:
+        """Async variant of DatabaseManager.query_students"""
+        return await self._read(self.db.query_students, query)
+
+    async def count_query_students(self, query: StudentQuery) -> int:
+        """Async variant of DatabaseManager.count_query_students"""
+        return await self._read(self.db.count_query_students, query)
+
+    async def query_students_page(self, query: StudentQuery, limit: int = DEFAULT_PAGE_SIZE,
+                                  page_token: Optional[str] = None) -> Page:
+        """Async variant of DatabaseManager.query_students_page"""
+        return await self._read(self.db.query_students_page, query, limit, page_token)
+
+    async def get_students_sorted(self, sort: Sequence[Tuple[str, bool]] = DEFAULT_SORT,
+                                  offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                                  after: Optional[Sequence[Any]] = None,
+                                  **filters) -> List[StudentRecord]:
+        """Async variant of DatabaseManager.get_students_sorted"""
+        return await self._read(self.db.get_students_sorted, sort, offset, limit, after,
+                                **filters)
+
+    async def get_students_at(self, offset: int,
+                              limit: int = DEFAULT_PAGE_SIZE) -> List[StudentRecord]:
+        """Async variant of DatabaseManager.get_students_at"""
+        return await self._read(self.db.get_students_at, offset, limit)
+
+    async def count_students(self, **filters) -> int:
+        """Async variant of DatabaseManager.count_students"""
+        return await self._read(self.db.count_students, **filters)
+
+    async def student_position(self, student: Mapping[str, Any],
+                               sort: Sequence[Tuple[str, bool]] = DEFAULT_SORT,
+                               **filters) -> int:
+        """Async variant of DatabaseManager.student_position"""
+        return await self._read(self.db.student_position, student, sort, **filters)
+
+    async def data_version(self) -> int:
+        """
+        Async variant of DatabaseManager.data_version. The counter belongs to
+        one connection, so this always reads the writer thread's: successive
+        values are comparable, and they change when another connection or
+        process commits (not on this manager's own writes).
+        """
+        return await self._write(self.db.data_version)
+
+    async def schema_version(self) -> int:
+        """Async variant of DatabaseManager.schema_version"""
+        return await self._read(self.db.schema_version)
+
+    async def explain_queries(self) -> Dict[str, List[str]]:
+        """Async variant of DatabaseManager.explain_queries"""
+        return await self._read(self.db.explain_queries)
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Result cache counters (in memory, no I/O)"""
+        return self.db.cache_stats()
+
+    def clear_cache(self):
+        """Drop every cached result (in memory, no I/O)"""
+        self.db.clear_cache()
+
+    def metrics_snapshot(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Per-method query metrics (in memory, no I/O); needs instrument=True"""
+        return self.db.metrics_snapshot()
+
+    def metrics_prometheus(self) -> str:
+        """Query metrics in the Prometheus text format (in memory, no I/O)"""
+        return self.db.metrics_prometheus()
+
+    def startup_timings(self) -> Dict[str, Optional[float]]:
+        """Startup phase timings of the underlying manager (in memory, no I/O)"""
+        return self.db.startup_timings()
+
+    # Streaming. A sync iter_* generator keeps a cursor open on one thread's
+    # connection, so the async variants walk keyset pages instead: each batch
+    # is an independent query that any reader thread can serve.
+
+    async def iter_students(self, batch_size: int = DEFAULT_FETCH_BATCH_SIZE
+                            ) -> AsyncIterator[StudentRecord]:
+        """Async variant of DatabaseManager.iter_students"""
+        async for row in self._iter_pages(self.db.get_students_page, batch_size):
+            yield row
+
+    async def iter_search_students(self, search_term: str,
+                                   batch_size: int = DEFAULT_FETCH_BATCH_SIZE
+                                   ) -> AsyncIterator[StudentRecord]:
+        """Async variant of DatabaseManager.iter_search_students (ordered by name)"""
+        async for row in self._iter_pages(
+                partial(self.db.search_students_page, search_term), batch_size):
+            yield row
+
+    async def iter_filter_by_course(self, course: str,
+                                    batch_size: int = DEFAULT_FETCH_BATCH_SIZE
+                                    ) -> AsyncIterator[StudentRecord]:
+        """Async variant of DatabaseManager.iter_filter_by_course"""
+        async for row in self._iter_pages(
+                partial(self.db.filter_by_course_page, course), batch_size):
+            yield row
+
+    async def iter_filter_by_attendance(self, threshold: float,
+                                        batch_size: int = DEFAULT_FETCH_BATCH_SIZE
+                                        ) -> AsyncIterator[StudentRecord]:
+        """Async variant of DatabaseManager.iter_filter_by_attendance"""
+        async for row in self._iter_pages(
+                partial(self.db.filter_by_attendance_page, threshold), batch_size):
+            yield row
+
+    async def iter_filter_by_grade(self, grade: str,
+                                   batch_size: int = DEFAULT_FETCH_BATCH_SIZE
+                                   ) -> AsyncIterator[StudentRecord]:
+        """Async variant of DatabaseManager.iter_filter_by_grade"""
+        async for row in self._iter_pages(
+                partial(self.db.filter_by_grade_page, grade), batch_size):
+            yield row
+
+    async def iter_query_students(self, query: StudentQuery,
+                                  batch_size: int = DEFAULT_FETCH_BATCH_SIZE
+                                  ) -> AsyncIterator[StudentRecord]:
+        """Async variant of DatabaseManager.iter_query_students (the query's window is ignored)"""
+        async for row in self._iter_pages(
+                partial(self.db.query_students_page, query), batch_size):
+            yield row
+
+    async def iter_students_sorted(self, sort: Sequence[Tuple[str, bool]] = DEFAULT_SORT,
+                                   batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+                                   **filters) -> AsyncIterator[StudentRecord]:
+        """
+        Async variant of DatabaseManager.iter_students_sorted. Each batch
+        seeks past the previous one's last sort key.
+        """
+        after = None
+        while True:
+            rows = await self._read(self.db.get_students_sorted, sort, 0, batch_size,
+                                    after, **filters)
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            after = self.db.sort_key(rows[-1], sort)
+
+    async def _iter_pages(self, fetch_page: Callable[..., Page],
+                          batch_size: int) -> AsyncIterator[StudentRecord]:
+        page_token = None
+        while True:
+            page = await self._read(fetch_page, batch_size, page_token)
+            for row in page.rows:
+                yield row
+            if not page.has_more:
+                return
+            page_token = page.next_token
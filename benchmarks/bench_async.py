@@ -0,0 +1,76 @@
+"""
+Compare concurrent get_student lookups through AsyncDatabaseManager with
+sequential lookups through the sync DatabaseManager.
+
+Usage:
+    python -m benchmarks.bench_async [--students N] [--lookups N] [--readers N]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from async_database import AsyncDatabaseManager
+from database import DatabaseManager
+
+
+def populate(db: DatabaseManager, students: int):
+    db.add_students_bulk(
+        {"full_name": f"Student {i}", "student_id": f"2024{i:06d}", "course": f"Course {i % 20}",
+         "email": f"student{i}@example.com", "phone": None}
+        for i in range(students)
+    )
+
+
+def bench_sync(db: DatabaseManager, ids) -> float:
+    start = time.perf_counter()
+    for student_id in ids:
+        db.get_student(student_id)
+    return time.perf_counter() - start
+
+
+async def bench_async(db_name: str, ids, readers: int, concurrency: int) -> float:
+    async with AsyncDatabaseManager(db_name, readers=readers,
+                                    max_concurrency=concurrency) as adb:
+        queue = iter(ids)
+
+        async def worker():
+            for student_id in queue:
+                await adb.get_student(student_id)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "bench.db")
+        db = DatabaseManager(db_name)
+        populate(db, args.students)
+        rng = random.Random(7)
+        ids = [f"2024{rng.randrange(args.students):06d}" for _ in range(args.lookups)]
+
+        sync_time = bench_sync(db, ids)
+        db.close()
+        async_time = asyncio.run(bench_async(db_name, ids, args.readers, args.concurrency))
+
+    print(f"{args.lookups:,} lookups over {args.students:,} students")
+    print(f"sync, sequential:        {args.lookups / sync_time:>10,.0f} lookups/s")
+    print(f"async, {args.concurrency} concurrent on {args.readers} readers: "
+          f"{args.lookups / async_time:>10,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
@@ -0,0 +1,89 @@
+"""
+Measure the per-record cost of building models.Student from trusted rows
+(from_row/from_rows) and from user input (validate/validate_many), next to an
+equivalent pydantic v2 model when pydantic is installed.
+
+Usage:
+    python -m benchmarks.bench_models [--rows N] [--repeat R]
+"""
+import argparse
+import os
+import tempfile
+from typing import List
+
+from benchmarks.bench_rows import best_of, fetch_all, populate
+from models import Student
+from records import Record
+
+try:
+    from pydantic import BaseModel, ConfigDict, Field
+except ImportError:
+    BaseModel = None
+
+
+def make_pydantic_model():
+    """Student's fields and (approximately) its rules as a pydantic model"""
+    class PydanticStudent(BaseModel):
+        model_config = ConfigDict(str_strip_whitespace=True)
+
+        id: int = None
+        full_name: str = Field(min_length=1)
+        student_id: str = Field(default=None, pattern=r"^\d{4}(\d{3}|\d{6})$")
+        course: str = Field(min_length=1)
+        email: str = Field(pattern=r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+        phone: str = ''
+        attendance_percent: float = Field(default=0.0, ge=0, le=100)
+        grade: str = Field(default='N/A', pattern=r"^(A|B|C|D|F|N/A)$")
+        created_at: str = None
+
+    return PydanticStudent
+
+
+def input_records(rows: List[Record]) -> List[dict]:
+    """User-input style dicts (strings, no id/created_at) built from rows"""
+    return [{"full_name": row["full_name"], "student_id": row["student_id"],
+             "course": row["course"], "email": row["email"], "phone": row["phone"],
+             "attendance_percent": str(row["attendance_percent"]), "grade": row["grade"]}
+            for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "bench.db")
+        populate(db_name, args.rows)
+        rows = fetch_all(db_name, lambda: Record)
+    dicts = [dict(row) for row in rows]
+    records = input_records(rows)
+
+    students, errors = Student.validate_many(records)
+    assert not any(errors), errors[:3]
+    assert Student.from_rows(rows) == Student.from_rows(dicts)
+
+    cases = {
+        "Student.from_row": lambda: [Student.from_row(row) for row in rows],
+        "Student.from_rows": lambda: Student.from_rows(rows),
+        "Student.validate": lambda: [Student.validate(record) for record in records],
+        "Student.validate_many": lambda: Student.validate_many(records),
+    }
+    if BaseModel is not None:
+        model = make_pydantic_model()
+        cases["pydantic model_construct"] = lambda: [model.model_construct(**row) for row in dicts]
+        cases["pydantic model_validate"] = lambda: [model.model_validate(record)
+                                                    for record in records]
+
+    print(f"{args.rows:,} records, best of {args.repeat}")
+    print(f"{'':<26} {'records/s':>12} {'us/record':>10}")
+    for label, func in cases.items():
+        elapsed = best_of(args.repeat, func)
+        print(f"{label:<26} {args.rows / elapsed:>12,.0f} {elapsed / args.rows * 1e6:>10.2f}")
+    if BaseModel is None:
+        print("pydantic is not installed; skipped the pydantic comparison")
+
+
+if __name__ == "__main__":
+    main()
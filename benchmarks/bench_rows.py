@@ -0,0 +1,119 @@
+"""
+Compare row representations for "SELECT * FROM students": the per-row dicts
+DatabaseManager used to build, plain sqlite3.Row and the StudentRecord rows
+(records.Record) it returns now.
+
+Usage:
+    python -m benchmarks.bench_rows [--rows N] [--repeat R]
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List
+
+from database import DatabaseManager
+from records import Record
+
+
+def populate(db_name: str, rows: int):
+    db = DatabaseManager(db_name)
+    db.add_students_bulk(
+        {"full_name": f"Student {i}", "student_id": f"2024{i:06d}", "course": f"Course {i % 20}",
+         "email": f"student{i}@example.com", "phone": f"+233-20-{i % 1000:03d}-{i % 10000:04d}",
+         "attendance_percent": float(i % 101), "grade": "ABCDF"[i % 5]}
+        for i in range(rows)
+    )
+    db.close()
+
+
+def legacy_dict(cursor: sqlite3.Cursor, row: tuple) -> dict:
+    """The old DatabaseManager._row_to_dict: column list rebuilt for every row"""
+    columns = [col[0] for col in cursor.description]
+    return dict(zip(columns, row))
+
+
+def connect(db_name: str, row_factory) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_name)
+    conn.row_factory = row_factory
+    return conn
+
+
+FACTORIES = {
+    "dict (old)": lambda: legacy_dict,
+    "sqlite3.Row": lambda: sqlite3.Row,
+    "StudentRecord": lambda: Record,
+}
+
+
+def fetch_all(db_name: str, make_factory: Callable) -> List:
+    conn = connect(db_name, make_factory())
+    try:
+        return conn.execute("SELECT * FROM students ORDER BY full_name;").fetchall()
+    finally:
+        conn.close()
+
+
+def read_columns(rows: List) -> List[tuple]:
+    """Read every displayed column by name, as the GUI and CLI listings do"""
+    return [(row["student_id"], row["full_name"], row["course"], row["email"], row["phone"],
+             row["attendance_percent"], row["grade"]) for row in rows]
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def retained_bytes(func: Callable[[], object]) -> int:
+    """Bytes still allocated while func's result is alive"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "bench.db")
+        populate(db_name, args.rows)
+
+        # Every representation must expose the same data by column name
+        reference = [dict(row) for row in fetch_all(db_name, FACTORIES["dict (old)"])]
+        for label, make_factory in FACTORIES.items():
+            rows = fetch_all(db_name, make_factory)
+            assert [{key: row[key] for key in row.keys()} for row in rows] == reference, label
+
+        print(f"{args.rows:,} rows, best of {args.repeat}")
+        print(f"{'':<14} {'fetch rows/s':>13} {'7 reads rows/s':>15} "
+              f"{'both rows/s':>12} {'bytes/row':>10}")
+        for label, make_factory in FACTORIES.items():
+            fetch = best_of(args.repeat, lambda: fetch_all(db_name, make_factory))
+            rows = fetch_all(db_name, make_factory)
+            read = best_of(args.repeat, lambda: read_columns(rows))
+            del rows
+            both = best_of(args.repeat, lambda: read_columns(fetch_all(db_name, make_factory)))
+            size = retained_bytes(lambda: fetch_all(db_name, make_factory)) / args.rows
+            print(f"{label:<14} {args.rows / fetch:>13,.0f} {args.rows / read:>15,.0f} "
+                  f"{args.rows / both:>12,.0f} {size:>10,.0f}")
+
+if __name__ == "__main__":
+    main()
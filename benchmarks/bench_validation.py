@@ -0,0 +1,117 @@
+"""
+Benchmark the batch validators in validation.py against the per-value
+helpers in utils.py.
+
+Usage:
+    python -m benchmarks.bench_validation [--rows N] [--repeat R]
+"""
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from utils import (
+    validate_email, validate_phone, format_phone_number, sanitize_input, validate_attendance
+)
+from validation import (
+    VALID_GRADES, validate_email_column, validate_phone_column, sanitize_column,
+    validate_student_records
+)
+
+
+def make_column_data(rows: int, seed: int = 42):
+    """Deterministic mix of valid and invalid emails, phones and names"""
+    rng = random.Random(seed)
+    first = ["Ama", "Kofi", "Yaw", "Esi", "John", "Mary", "Kwame", "Akosua"]
+    last = ["Mensah", "Owusu", "Boateng", "Asante", "Doe", "Smith"]
+    # Roughly 5% of emails and phones are malformed, as in a typical import
+    domains = ["example.com", "ug.edu.gh", "mail.org"] * 13 + ["bad_domain", "x.c"]
+    emails, phones, names = [], [], []
+    for i in range(rows):
+        name = f"{rng.choice(first)} {rng.choice(last)}"
+        local = name.lower().replace(" ", rng.choice([".", "_", ""] * 10 + [".."])) + str(i)
+        emails.append(f"{local}@{rng.choice(domains)}")
+        phones.append(rng.choice([
+            f"0{rng.randint(200000000, 599999999)}",
+            f"+233-{rng.randint(20, 59)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        ] * 10 + [f"{rng.randint(1000, 99999)}"]))
+        names.append(rng.choice([name, f"  {name}  ", f"{name}<script>", f"{name};"]))
+    return emails, phones, names
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """Best wall-clock time of several runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def report(label: str, rows: int, per_call: float, batch: float):
+    print(f"{label:<10} per-call {rows / per_call:>12,.0f} rows/s   "
+          f"batch {rows / batch:>12,.0f} rows/s   speedup {per_call / batch:5.2f}x")
+
+
+def per_call_phones(phones: List[str]):
+    return [format_phone_number(p) if validate_phone(p) else None for p in phones]
+
+
+def per_call_records(records: List[dict]):
+    """Record validation written with the per-value helpers, as main.py/gui.py do"""
+    results = []
+    for record in records:
+        full_name = sanitize_input(record["full_name"])
+        course = sanitize_input(record["course"])
+        email = record["email"].strip()
+        phone = record["phone"]
+        grade = record["grade"].strip().upper()
+        try:
+            attendance = float(record["attendance_percent"])
+        except ValueError:
+            attendance = None
+        if (full_name and course and validate_email(email) and validate_phone(phone)
+                and validate_attendance(attendance) and grade in VALID_GRADES):
+            results.append({"full_name": full_name, "student_id": None, "course": course,
+                            "email": email, "phone": format_phone_number(phone),
+                            "attendance_percent": attendance, "grade": grade})
+        else:
+            results.append(None)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    emails, phones, names = make_column_data(args.rows)
+    records = [{"full_name": n, "course": "Computer Science", "email": e, "phone": p,
+                "attendance_percent": "80", "grade": "b"}
+               for e, p, n in zip(emails, phones, names)]
+
+    # The two implementations must agree before their speed is compared
+    assert validate_email_column(emails).valid == [validate_email(e) for e in emails]
+    assert validate_phone_column(phones).values == per_call_phones(phones)
+    assert sanitize_column(names).values == [sanitize_input(n) for n in names]
+    assert validate_student_records(records).records == per_call_records(records)
+
+    print(f"{args.rows:,} rows, best of {args.repeat}")
+    report("email", args.rows,
+           best_of(args.repeat, lambda: [validate_email(e) for e in emails]),
+           best_of(args.repeat, lambda: validate_email_column(emails)))
+    report("phone", args.rows,
+           best_of(args.repeat, lambda: per_call_phones(phones)),
+           best_of(args.repeat, lambda: validate_phone_column(phones)))
+    report("sanitize", args.rows,
+           best_of(args.repeat, lambda: [sanitize_input(n) for n in names]),
+           best_of(args.repeat, lambda: sanitize_column(names)))
+    report("records", args.rows,
+           best_of(args.repeat, lambda: per_call_records(records)),
+           best_of(args.repeat, lambda: validate_student_records(records)))
+
+
+if __name__ == "__main__":
+    main()
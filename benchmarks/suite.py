@@ -0,0 +1,551 @@
+"""
+Reproducible benchmark suite.
+
+Loads a synthetic roster (benchmarks.synthetic) of each requested size into a
+fresh database, then times every public DatabaseManager method and the
+validators in utils.py. Each case reports p50/p95/p99 latency, throughput
+and the process's peak RSS so far; the run is written as JSON. Comparing two
+runs flags cases that got slower than a threshold.
+
+Usage:
+    python -m benchmarks.suite run [--students 10k 100k 1m] [--calls N] [--output FILE]
+    python -m benchmarks.suite compare BASELINE.json CURRENT.json [--threshold 0.25]
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import utils
+from benchmarks.synthetic import COURSES, DEFAULT_SEED, LAST_NAMES, generate_students
+from database import DatabaseManager
+from query import StudentQuery
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SUITE_VERSION = 1
+DEFAULT_SIZES = ("10k",)
+DEFAULT_CALLS = 200
+DEFAULT_THRESHOLD = 0.25
+# Latency changes smaller than this are noise, whatever the ratio
+DEFAULT_MIN_DELTA_MS = 0.02
+# Cases with fewer calls than this compare only p50 (their p95 is the slowest call)
+MIN_CALLS_FOR_P95 = 20
+
+# Scriptable CLI, run in a fresh interpreter by the cold-start cases
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cli.py")
+# Cold-start cases each start a process, so they run this many times at most
+COLD_START_CALLS = 10
+
+# Sorts exercised by the get_students_sorted/student_position cases
+BENCH_SORTS = (
+    (("full_name", False),),
+    (("attendance_percent", True),),
+    (("course", False), ("full_name", False)),
+    (("grade", False), ("attendance_percent", True)),
+)
+
+
+@dataclass
+class Case:
+    """One benchmarked callable and the argument tuples of its calls"""
+    name: str
+    func: Callable
+    args: List[tuple]
+
+
+def parse_size(text: str) -> int:
+    """Parse a roster size such as 10000, 10k or 1m"""
+    text = text.strip().lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    number = text[:-1] if scale != 1 else text
+    try:
+        size = int(float(number) * scale)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid roster size: {text!r}") from None
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"roster size must be positive: {text!r}")
+    return size
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(latencies_ns: Sequence[int], elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles (ms) and throughput of one case"""
+    if len(latencies_ns) > 1:
+        cuts = statistics.quantiles(latencies_ns, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies_ns[0]
+    return {
+        "calls": len(latencies_ns),
+        "p50_ms": round(p50 / 1e6, 4),
+        "p95_ms": round(p95 / 1e6, 4),
+        "p99_ms": round(p99 / 1e6, 4),
+        "mean_ms": round(statistics.fmean(latencies_ns) / 1e6, 4),
+        "throughput_per_s": round(len(latencies_ns) / elapsed, 1) if elapsed else None,
+    }
+
+
+def run_case(case: Case) -> Dict[str, Any]:
+    func = case.func
+    clock = time.perf_counter_ns
+    latencies = []
+    append = latencies.append
+    for args in case.args:
+        start = clock()
+        func(*args)
+        append(clock() - start)
+    result = summarize(latencies, sum(latencies) / 1e9)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def consume(iterator) -> None:
+    deque(iterator, maxlen=0)
+
+
+def database_cases(db: DatabaseManager, instrumented: DatabaseManager, shared: DatabaseManager,
+                   students: int, calls: int, seed: int) -> List[Case]:
+    """
+    Cases for every public DatabaseManager method, plus a few repeated on an
+    instrumented manager to measure the overhead of query metrics. shared is
+    an open shared manager, so shared construction takes its warm path.
+
+    Point lookups get calls calls, whole-table reads and rebuilds a few, so
+    a 1M-student run finishes in minutes. Writes run last; they add, change
+    and remove students beyond the loaded roster.
+    """
+    rng = random.Random(seed)
+    scans = max(3, calls // 40)
+    rebuilds = 3
+    sample = [dict(student) for student in
+              (db.get_students_at(rng.randrange(students), 1)[0] for _ in range(calls))]
+    ids = [student["student_id"] for student in sample]
+    courses = [name for name, _, _ in COURSES]
+    terms = [rng.choice(LAST_NAMES) for _ in range(calls)]
+    grades = ["A", "B", "C", "D", "F", "N/A"]
+
+    def some(values, count=calls):
+        return [(values[i % len(values)],) for i in range(count)]
+
+    tokens = [None]
+    while len(tokens) < calls:
+        page = db.get_students_page(page_token=tokens[-1])
+        if not page.has_more:
+            break
+        tokens.append(page.next_token)
+
+    def combined_query(i):
+        # "course X students with grade D or F and attendance below 60%", by attendance
+        return (StudentQuery()
+                .where(course=courses[i % len(courses)], grade=("D", "F"), attendance_below=60.0)
+                .order_by("attendance_percent").take(100))
+
+    def attendance_marks(batch):
+        # 1000 marks over the sampled students, in sessions no other batch uses
+        marks = ((student_id, f"bench-{batch}-{n}", (n + i) % 5 != 0)
+                 for n in itertools.count() for i, student_id in enumerate(ids))
+        return list(itertools.islice(marks, 1000))
+
+    def first_query(manager, student_id):
+        manager.get_student(student_id)
+        manager.close()
+
+    def sorted_window(sort, offset):
+        return db.get_students_sorted(sort, offset=offset)
+
+    def sorted_filtered(sort, course):
+        return db.get_students_sorted(sort, course=course)
+
+    new_students = list(generate_students(calls, seed, start=students))
+    new_ids = [student["student_id"] for student in new_students]
+    bulk_batches = [list(generate_students(1000, seed, start=students + calls + 1000 * i))
+                    for i in range(rebuilds)]
+
+    # Gradebook of the largest course (COURSES is in enrollment order); every
+    # student gets a score on each assessment in the write cases
+    graded_course = courses[0]
+    assessments = (("Midterm", 30.0, 50.0), ("Final", 50.0, 100.0), ("Labs", 20.0, 20.0))
+    if not db.get_assessments(graded_course):
+        for name, weight, max_score in assessments:
+            db.add_assessment(graded_course, name, weight, max_score)
+    course_ids = [student["student_id"] for student in db.iter_filter_by_course(graded_course)]
+    score_batches = [(graded_course, name, [(student_id, round(rng.uniform(0, max_score), 1))
+                                            for student_id in course_ids])
+                     for name, _, max_score in assessments]
+
+    return [
+        Case("DatabaseManager.__init__", lambda: DatabaseManager(db.db_name).close(),
+             [()] * scans),
+        Case("DatabaseManager.__init__ (shared)",
+             lambda: DatabaseManager(shared.db_name, shared=True).close(), [()] * calls),
+        Case("DatabaseManager.__init__ + get_student (time to first query)",
+             lambda student_id: first_query(DatabaseManager(db.db_name), student_id),
+             some(ids, scans)),
+        Case("DatabaseManager.startup_timings", db.startup_timings, [()] * calls),
+        Case("DatabaseManager.init_database", db.init_database, [()] * scans),
+        Case("DatabaseManager.migrate", db.migrate, [()] * calls),
+        Case("DatabaseManager.schema_version", db.schema_version, [()] * calls),
+        Case("DatabaseManager.data_version", db.data_version, [()] * calls),
+        Case("DatabaseManager.get_student", db.get_student, some(ids)),
+        Case("DatabaseManager.get_student (missing)", db.get_student,
+             [(f"1999{i:06d}",) for i in range(calls)]),
+        Case("DatabaseManager.get_all_students", db.get_all_students, [()] * scans),
+        Case("DatabaseManager.search_students", db.search_students, some(terms, scans)),
+        Case("DatabaseManager.filter_by_course", db.filter_by_course, some(courses, scans)),
+        Case("DatabaseManager.filter_by_attendance", db.filter_by_attendance,
+             some([95.0, 75.0, 50.0], scans)),
+        Case("DatabaseManager.filter_by_grade", db.filter_by_grade, some(grades, scans)),
+        Case("DatabaseManager.iter_students", lambda: consume(db.iter_students()), [()] * scans),
+        Case("DatabaseManager.iter_search_students",
+             lambda term: consume(db.iter_search_students(term)), some(terms, scans)),
+        Case("DatabaseManager.iter_filter_by_course",
+             lambda course: consume(db.iter_filter_by_course(course)), some(courses, scans)),
+        Case("DatabaseManager.iter_filter_by_attendance",
+             lambda threshold: consume(db.iter_filter_by_attendance(threshold)),
+             some([95.0, 75.0, 50.0], scans)),
+        Case("DatabaseManager.iter_filter_by_grade",
+             lambda grade: consume(db.iter_filter_by_grade(grade)), some(grades, scans)),
+        Case("DatabaseManager.get_students_page", db.get_students_page,
+             [(100, token) for token in tokens]),
+        Case("DatabaseManager.search_students_page", db.search_students_page, some(terms)),
+        Case("DatabaseManager.filter_by_course_page", db.filter_by_course_page, some(courses)),
+        Case("DatabaseManager.filter_by_attendance_page", db.filter_by_attendance_page,
+             some([95.0, 75.0, 50.0])),
+        Case("DatabaseManager.filter_by_grade_page", db.filter_by_grade_page, some(grades)),
+        Case("DatabaseManager.get_students_at", db.get_students_at,
+             [(rng.randrange(students),) for _ in range(calls)]),
+        Case("DatabaseManager.get_students_sorted", sorted_window,
+             [(BENCH_SORTS[i % len(BENCH_SORTS)], rng.randrange(students))
+              for i in range(calls)]),
+        Case("DatabaseManager.get_students_sorted (filtered)", sorted_filtered,
+             [(BENCH_SORTS[i % len(BENCH_SORTS)], courses[i % len(courses)])
+              for i in range(calls)]),
+        Case("DatabaseManager.iter_students_sorted",
+             lambda sort: consume(db.iter_students_sorted(sort)), some(BENCH_SORTS, scans)),
+        Case("DatabaseManager.sort_key", db.sort_key,
+             [(student, BENCH_SORTS[i % len(BENCH_SORTS)]) for i, student in enumerate(sample)]),
+        Case("DatabaseManager.student_position", db.student_position,
+             [(student, BENCH_SORTS[i % len(BENCH_SORTS)]) for i, student in enumerate(sample)]),
+        Case("DatabaseManager.query_students", db.query_students,
+             [(combined_query(i),) for i in range(calls)]),
+        Case("DatabaseManager.iter_query_students",
+             lambda query: consume(db.iter_query_students(query)),
+             [(combined_query(i).take(None),) for i in range(scans)]),
+        Case("DatabaseManager.count_query_students", db.count_query_students,
+             [(combined_query(i),) for i in range(calls)]),
+        Case("DatabaseManager.query_students_page", db.query_students_page,
+             [(combined_query(i), 100) for i in range(calls)]),
+        Case("DatabaseManager.count_students", db.count_students, [()] * calls),
+        Case("DatabaseManager.count_students (filtered)",
+             lambda course: db.count_students(course=course), some(courses)),
+        Case("DatabaseManager.get_unique_courses", db.get_unique_courses, [()] * calls),
+        Case("DatabaseManager.get_course_statistics", db.get_course_statistics, [()] * calls),
+        Case("DatabaseManager.get_course_statistics (one course)", db.get_course_statistics,
+             some(courses)),
+        Case("DatabaseManager.get_overall_statistics", db.get_overall_statistics, [()] * calls),
+        Case("DatabaseManager.explain_queries", db.explain_queries, [()] * scans),
+        Case("DatabaseManager.cache_stats", db.cache_stats, [()] * calls),
+        Case("DatabaseManager.clear_cache", db.clear_cache, [()] * calls),
+        Case("DatabaseManager.get_student (instrumented)", instrumented.get_student, some(ids)),
+        Case("DatabaseManager.get_students_page (instrumented)", instrumented.get_students_page,
+             [(100, token) for token in tokens]),
+        Case("DatabaseManager.iter_filter_by_course (instrumented)",
+             lambda course: consume(instrumented.iter_filter_by_course(course)),
+             some(courses, scans)),
+        Case("DatabaseManager.metrics_snapshot", instrumented.metrics_snapshot, [()] * calls),
+        Case("DatabaseManager.metrics_prometheus", instrumented.metrics_prometheus,
+             [()] * scans),
+        # Writes
+        Case("DatabaseManager.allocate_student_id", db.allocate_student_id, [()] * calls),
+        Case("DatabaseManager.allocate_student_ids", db.allocate_student_ids,
+             [(100,)] * calls),
+        Case("DatabaseManager.add_student", db.add_student, [(s,) for s in new_students]),
+        Case("DatabaseManager.update_student", db.update_student,
+             [(student_id, {"grade": grades[i % 5], "attendance_percent": float(i % 101)})
+              for i, student_id in enumerate(new_ids)]),
+        Case("DatabaseManager.update_students (dry run)",
+             lambda course: db.update_students({"grade": "B"}, course=course, dry_run=True),
+             some(courses, scans)),
+        Case("DatabaseManager.update_students (course)",
+             lambda course: db.update_students({}, attendance_delta=0.0, course=course),
+             some(courses, scans)),
+        Case("DatabaseManager.update_students (IDs)",
+             lambda delta: db.update_students({}, new_ids, attendance_delta=delta),
+             some([1.0, -1.0], scans)),
+        Case("DatabaseManager.delete_students (dry run)",
+             lambda year: db.delete_students(year=year, dry_run=True), some([2021, 2022], scans)),
+        Case("DatabaseManager.record_attendance (1000 marks)", db.record_attendance,
+             [(attendance_marks(batch),) for batch in range(scans)]),
+        Case("DatabaseManager.get_attendance_counts", db.get_attendance_counts, some(ids)),
+        Case("DatabaseManager.verify_attendance", db.verify_attendance, [()] * rebuilds),
+        Case("DatabaseManager.rebuild_attendance", db.rebuild_attendance, [()] * rebuilds),
+        Case("DatabaseManager.record_scores (whole course)", db.record_scores, score_batches),
+        Case("DatabaseManager.get_final_grades", db.get_final_grades,
+             [(graded_course,)] * rebuilds),
+        Case("DatabaseManager.regrade_course (dry run)",
+             lambda course: db.regrade_course(course, dry_run=True), [(graded_course,)] * rebuilds),
+        Case("DatabaseManager.regrade_course", db.regrade_course, [(graded_course,)] * rebuilds),
+        Case("DatabaseManager.delete_student", db.delete_student, some(new_ids)),
+        Case("DatabaseManager.add_students_bulk (1000 rows)", db.add_students_bulk,
+             [(batch,) for batch in bulk_batches]),
+        Case("DatabaseManager.add_students_bulk (1000 rows, validate)",
+             lambda batch: db.add_students_bulk(batch, validate=True),
+             [([dict(s, student_id=None, email="v." + s["email"]) for s in batch],)
+              for batch in bulk_batches]),
+        Case("DatabaseManager.delete_students", db.delete_students,
+             [([s["student_id"] for s in batch],) for batch in bulk_batches]),
+        Case("DatabaseManager.rebuild_search_index", db.rebuild_search_index,
+             [()] * rebuilds),
+        Case("DatabaseManager.rebuild_statistics", db.rebuild_statistics, [()] * rebuilds),
+    ]
+
+
+def validator_cases(calls: int, seed: int) -> List[Case]:
+    """Cases for the per-value helpers in utils.py, on roster values plus bad input"""
+    students = list(generate_students(calls, seed))
+    bad = ["", "not-an-email", "12345", "<script>alert(1)</script>", "  spaced   out  "]
+
+    def mixed(field):
+        return [(s[field],) if i % 10 else (bad[i % len(bad)],)
+                for i, s in enumerate(students)]
+
+    names = [s["full_name"].split(" ", 1) for s in students]
+    return [
+        Case("utils.validate_email", utils.validate_email, mixed("email")),
+        Case("utils.validate_phone", utils.validate_phone, mixed("phone")),
+        Case("utils.format_phone_number", utils.format_phone_number, mixed("phone")),
+        Case("utils.validate_student_id", utils.validate_student_id, mixed("student_id")),
+        Case("utils.sanitize_input", utils.sanitize_input, mixed("full_name")),
+        Case("utils.format_name", utils.format_name, [tuple(pair) for pair in names]),
+        Case("utils.validate_attendance", utils.validate_attendance,
+             [(s["attendance_percent"],) for s in students]),
+        Case("utils.calculate_grade", utils.calculate_grade,
+             [(s["attendance_percent"],) for s in students]),
+        Case("utils.format_student_id", utils.format_student_id,
+             [(2024, i + 1, utils.WIDE_STUDENT_ID_SEQUENCE_DIGITS) for i in range(calls)]),
+        Case("utils.generate_student_id", utils.generate_student_id, [(2024,)] * calls),
+    ]
+
+
+def cli_cases(db_name: str, students: int, calls: int, seed: int) -> List[Case]:
+    """
+    Cold start of the scriptable CLI: each call is a new interpreter running
+    cli.py to completion, timed against bare interpreter startup.
+    """
+    runs = min(calls, COLD_START_CALLS)
+    ids = [next(generate_students(1, seed, start=i))["student_id"]
+           for i in range(0, students, max(1, students // runs))][:runs]
+
+    def run_cli(*args):
+        subprocess.run([sys.executable, CLI_PATH, *args, "--db", db_name],
+                       check=True, stdout=subprocess.DEVNULL)
+
+    return [
+        Case("python -c pass (interpreter startup)",
+             lambda: subprocess.run([sys.executable, "-c", "pass"], check=True), [()] * runs),
+        Case("cli.py get (cold start)", lambda student_id: run_cli("get", student_id),
+             [(student_id,) for student_id in ids]),
+        Case("cli.py filter --count (cold start)",
+             lambda: run_cli("filter", "--course", COURSES[0][0], "--grade", "F", "--count"),
+             [()] * runs),
+        Case("cli.py stats (cold start)", lambda: run_cli("stats"), [()] * runs),
+    ]
+
+
+def run_size(students: int, calls: int, seed: int, validator_calls: int) -> Dict[str, Any]:
+    """Load a roster of the given size and run every case against it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "bench.db")
+        db = DatabaseManager(db_name, wide_student_ids=True)
+        start = time.perf_counter()
+        loaded = db.add_students_bulk(generate_students(students, seed))
+        load_seconds = time.perf_counter() - start
+        if loaded.failed:
+            raise RuntimeError(f"synthetic roster failed to load: {loaded.failed[:3]}")
+
+        instrumented = DatabaseManager(db_name, wide_student_ids=True, instrument=True,
+                                       slow_query_ms=None)
+        shared = DatabaseManager(db_name, wide_student_ids=True, shared=True)
+        cases = {}
+        for case in (database_cases(db, instrumented, shared, students, calls, seed)
+                     + validator_cases(validator_calls, seed)
+                     + cli_cases(db_name, students, calls, seed)):
+            cases[case.name] = run_case(case)
+            print(f"  {case.name:<58} p50 {cases[case.name]['p50_ms']:>10.4f} ms",
+                  file=sys.stderr)
+        instrumented.close()
+        shared.close()
+        db.close()
+        database_mb = os.path.getsize(db_name) / (1024 * 1024)
+
+    return {
+        "students": students,
+        "load": {
+            "seconds": round(load_seconds, 3),
+            "rows_per_s": round(students / load_seconds, 1),
+        },
+        "database_mb": round(database_mb, 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "cases": cases,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                  capture_output=True, text=True, timeout=5,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        revision = ""
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "revision": revision or None,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(sizes: Sequence[int], calls: int, seed: int) -> Dict[str, Any]:
+    report = {
+        "suite_version": SUITE_VERSION,
+        "environment": environment(),
+        "seed": seed,
+        "calls": calls,
+        "runs": {},
+    }
+    for students in sizes:
+        print(f"{students:,} students", file=sys.stderr)
+        report["runs"][str(students)] = run_size(students, calls, seed, calls * 50)
+    return report
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[Dict[str, Any]]:
+    """
+    Compare two reports case by case.
+
+    A case regresses when its p50 or p95 latency grew by more than threshold
+    (a fraction) and by more than min_delta_ms; p95 is only compared for
+    cases with at least MIN_CALLS_FOR_P95 calls. Bulk load throughput and
+    peak RSS are compared with the same threshold. Returns one entry per
+    metric present in both reports, with a "regression" flag.
+    """
+    rows = []
+
+    def add(size, name, metric, before, after, higher_is_worse=True):
+        if before is None or after is None:
+            return
+        change = (after - before) / before if before else 0.0
+        worse = change if higher_is_worse else -change
+        regression = worse > threshold
+        if metric.endswith("_ms"):
+            regression = regression and abs(after - before) > min_delta_ms
+        rows.append({"students": size, "case": name, "metric": metric, "baseline": before,
+                     "current": after, "change": round(change, 4), "regression": regression})
+
+    for size, base_run in baseline.get("runs", {}).items():
+        run_ = current.get("runs", {}).get(size)
+        if run_ is None:
+            continue
+        add(size, "load", "rows_per_s", base_run["load"]["rows_per_s"],
+            run_["load"]["rows_per_s"], higher_is_worse=False)
+        add(size, "process", "peak_rss_mb", base_run.get("peak_rss_mb"),
+            run_.get("peak_rss_mb"))
+        for name, base_case in base_run["cases"].items():
+            case = run_["cases"].get(name)
+            if case is None:
+                continue
+            add(size, name, "p50_ms", base_case["p50_ms"], case["p50_ms"])
+            if min(base_case["calls"], case["calls"]) >= MIN_CALLS_FOR_P95:
+                add(size, name, "p95_ms", base_case["p95_ms"], case["p95_ms"])
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], show_all: bool = False):
+    print(f"{'students':>9} {'case':<58} {'metric':<12} {'baseline':>10} {'current':>10} "
+          f"{'change':>8}")
+    for row in rows:
+        if not (show_all or row["regression"]):
+            continue
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{int(row['students']):>9,} {row['case']:<58} {row['metric']:<12} "
+              f"{row['baseline']:>10.4g} {row['current']:>10.4g} {row['change']:>+8.1%}{flag}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{regressions} regression(s) in {len(rows)} compared metrics")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the suite and write a JSON report")
+    run_parser.add_argument("--students", nargs="+", type=parse_size,
+                            default=[parse_size(size) for size in DEFAULT_SIZES],
+                            help="Roster sizes, e.g. 10k 100k 1m")
+    run_parser.add_argument("--calls", type=int, default=DEFAULT_CALLS,
+                            help="Calls per point-query case (whole-table cases run fewer)")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--output", help="Report file (default: stdout)")
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two reports; exits with status 1 on regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Allowed slowdown as a fraction (default: %(default)s)")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                                help="Ignore latency changes below this (default: %(default)s)")
+    compare_parser.add_argument("--all", action="store_true",
+                                help="Show every metric, not only regressions")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if args.calls < 2:
+            parser.error("--calls must be at least 2")
+        report = run(args.students, args.calls, args.seed)
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        rows = compare(baseline, current, args.threshold, args.min_delta_ms)
+        print_comparison(rows, args.all)
+        sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
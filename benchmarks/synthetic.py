@@ -0,0 +1,117 @@
+"""
+Deterministic synthetic student rosters for benchmarks.
+
+The same (count, seed) always produces the same students, so runs on
+different machines or commits measure the same data. Courses have realistic
+relative sizes, attendance clusters per course around 70-90%, and grades
+follow attendance with noise (a few students are not graded yet).
+
+Usage:
+    python -m benchmarks.synthetic [--students N] [--seed S] > roster.jsonl
+"""
+import argparse
+import json
+import random
+import sys
+from typing import Any, Dict, Iterator, Tuple
+
+from utils import WIDE_STUDENT_ID_SEQUENCE_DIGITS, calculate_grade, format_student_id
+
+DEFAULT_SEED = 20240901
+
+# Enrollment years students are spread across (IDs are <year><6-digit sequence>)
+ENROLLMENT_YEARS = (2021, 2022, 2023, 2024)
+
+# (course, relative enrollment, mean attendance)
+COURSES: Tuple[Tuple[str, int, float], ...] = (
+    ("Computer Science", 18, 84.0),
+    ("Business Administration", 16, 79.0),
+    ("Nursing", 12, 90.0),
+    ("Accounting", 10, 82.0),
+    ("Mechanical Engineering", 8, 85.0),
+    ("Electrical Engineering", 7, 85.0),
+    ("Economics", 7, 77.0),
+    ("Law", 6, 86.0),
+    ("Medicine", 5, 93.0),
+    ("Psychology", 5, 78.0),
+    ("Mathematics", 4, 81.0),
+    ("Architecture", 3, 83.0),
+    ("Agriculture", 3, 74.0),
+    ("History", 2, 72.0),
+    ("Fine Arts", 2, 70.0),
+    ("Philosophy", 1, 71.0),
+)
+
+FIRST_NAMES = (
+    "Kwame", "Ama", "Kofi", "Akosua", "Yaw", "Abena", "Kojo", "Efua", "Kwabena", "Adwoa",
+    "Kwesi", "Esi", "Fiifi", "Afia", "Nana", "Yaa", "Emmanuel", "Grace", "Samuel", "Mary",
+    "Daniel", "Elizabeth", "Michael", "Patience", "Joseph", "Comfort", "David", "Mercy",
+    "Isaac", "Gifty", "John", "Sarah", "Richard", "Linda", "Stephen", "Priscilla", "James",
+    "Rebecca", "Peter", "Deborah", "Francis", "Janet", "Eric", "Hannah", "Paul", "Joyce",
+    "Ebenezer", "Vida", "Prince", "Dorcas",
+)
+
+LAST_NAMES = (
+    "Mensah", "Owusu", "Boateng", "Asante", "Osei", "Agyeman", "Appiah", "Amoah", "Addo",
+    "Ofori", "Danso", "Acheampong", "Antwi", "Darko", "Frimpong", "Gyamfi", "Kyei", "Nkrumah",
+    "Opoku", "Quaye", "Sarpong", "Tetteh", "Yeboah", "Adjei", "Amponsah", "Bonsu", "Badu",
+    "Donkor", "Kusi", "Larbi", "Manu", "Nyarko", "Obeng", "Poku", "Sakyi", "Takyi", "Wiredu",
+    "Annan", "Bediako", "Quartey",
+)
+
+# Share of students without a grade yet, and without a phone number
+UNGRADED_RATE = 0.04
+NO_PHONE_RATE = 0.08
+
+
+def generate_students(count: int, seed: int = DEFAULT_SEED,
+                      start: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield count students as add_students_bulk input.
+
+    Students are numbered from start; student i is the same whatever count
+    is, so a larger roster extends a smaller one, and generate_students(n,
+    seed, start=count) yields fresh students that do not collide with the
+    first count.
+    """
+    courses = [name for name, _, _ in COURSES]
+    weights = [weight for _, weight, _ in COURSES]
+    mean_attendance = {name: mean for name, _, mean in COURSES}
+    years = len(ENROLLMENT_YEARS)
+    for i in range(start, start + count):
+        rng = random.Random(seed * 1_000_003 + i)
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        course = rng.choices(courses, weights)[0]
+        attendance = round(min(100.0, max(0.0, rng.gauss(mean_attendance[course], 12.0))), 1)
+        if rng.random() < UNGRADED_RATE:
+            grade = 'N/A'
+        else:
+            grade = calculate_grade(rng.gauss(attendance - 8.0, 10.0))
+        phone = ''
+        if rng.random() >= NO_PHONE_RATE:
+            phone = (f"+233-{rng.choice((20, 24, 26, 27, 50, 54, 55, 59))}-"
+                     f"{rng.randrange(1000):03d}-{rng.randrange(10000):04d}")
+        yield {
+            "full_name": f"{first} {last}",
+            "student_id": format_student_id(ENROLLMENT_YEARS[i % years], i // years + 1,
+                                            WIDE_STUDENT_ID_SEQUENCE_DIGITS),
+            "course": course,
+            "email": f"{first}.{last}.{i}@students.example.edu".lower(),
+            "phone": phone,
+            "attendance_percent": attendance,
+            "grade": grade,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    for student in generate_students(args.students, args.seed):
+        sys.stdout.write(json.dumps(student) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Non-interactive command line interface, for scripts and cron jobs.
+
+    python cli.py get 2024000001
+    python cli.py filter --course Nursing --grade D --grade F --attendance-below 60
+    python cli.py list --sort attendance_percent:desc --limit 10 --format csv
+    python cli.py import students.csv --validate
+    python cli.py export -o roster.jsonl --format jsonl --course Law
+    python cli.py stats
+
+`python main.py <subcommand> ...` does the same. Results go to stdout as
+JSON (default), JSON Lines or CSV; errors and logging go to stderr. Exit
+status is 0 on success, 1 when the command failed (student not found,
+invalid data, rows rejected by an import) and 2 for usage errors.
+
+This module imports only argparse and sys up front. Each subcommand imports
+what it needs when it runs, usually the database layer (which brings in the
+query, cache, metrics and validation modules), so the GUI (tkinter) and the
+optional benchmark dependencies are never loaded.
+"""
+import argparse
+import sys
+
+DEFAULT_DB = "student_management.db"
+OUTPUT_FORMATS = ("json", "jsonl", "csv")
+STATS_GRADES = ("A", "B", "C", "D", "F", "N/A")
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+
+def positive_int(text: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def non_negative_int(text: str) -> int:
+    """argparse type for limits and offsets"""
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, not {value}")
+    return value
+
+
+def sort_spec(text: str):
+    """argparse type for 'column' or 'column:asc|desc'; returns (column, descending)"""
+    from database import DatabaseManager
+    column, _, direction = text.partition(":")
+    if direction not in ("", "asc", "desc"):
+        raise argparse.ArgumentTypeError(f"direction must be asc or desc, not {direction!r}")
+    if column not in DatabaseManager.SORTABLE_COLUMNS:
+        raise argparse.ArgumentTypeError(
+            f"cannot sort by {column!r}; use one of "
+            f"{', '.join(sorted(DatabaseManager.SORTABLE_COLUMNS))}")
+    return column, direction == "desc"
+
+
+def _open_db(args: argparse.Namespace):
+    from database import DatabaseManager
+    return DatabaseManager(args.db)
+
+
+def _build_query(args: argparse.Namespace, **filters):
+    from query import StudentQuery
+    query = StudentQuery().where(**filters)
+    for column, descending in getattr(args, "sort", None) or ():
+        query = query.order_by(column, descending)
+    return query.take(args.limit, args.offset)
+
+
+def _query_filters(args: argparse.Namespace) -> dict:
+    return {"course": args.course, "grade": args.grade, "attendance_below": args.attendance_below,
+            "attendance_at_least": args.attendance_at_least, "search": args.search,
+            "year": args.year}
+
+
+def write_records(records, out, output_format: str, columns=None) -> int:
+    """Stream records to out as a JSON array, JSON Lines or CSV; returns the count"""
+    if output_format == "csv":
+        import csv
+        if columns is None:
+            from models import STUDENT_COLUMNS
+            columns = STUDENT_COLUMNS
+        writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        count = 0
+        for record in records:
+            writer.writerow(dict(record))
+            count += 1
+        return count
+
+    import json
+    count = 0
+    if output_format == "json":
+        out.write("[")
+    for record in records:
+        text = json.dumps(dict(record), ensure_ascii=False, default=str)
+        if output_format == "json":
+            out.write(",\n" if count else "\n")
+        out.write(text)
+        if output_format == "jsonl":
+            out.write("\n")
+        count += 1
+    if output_format == "json":
+        out.write("\n]\n" if count else "]\n")
+    return count
+
+
+def write_record(record, out, output_format: str, columns=None):
+    """Write one record: a JSON object, or a one-row JSON Lines/CSV output"""
+    if output_format == "json":
+        import json
+        out.write(json.dumps(dict(record), ensure_ascii=False, default=str, indent=2) + "\n")
+    else:
+        write_records([record], out, output_format, columns)
+
+
+def error(message: str) -> int:
+    print(f"error: {message}", file=sys.stderr)
+    return EXIT_FAILED
+
+
+def cmd_add(args: argparse.Namespace) -> int:
+    import sqlite3
+    from models import Student, StudentValidationError
+    data = {"full_name": args.name, "course": args.course, "email": args.email,
+            "phone": args.phone, "attendance_percent": args.attendance, "grade": args.grade,
+            "student_id": args.student_id}
+    try:
+        student = Student.validate({key: value for key, value in data.items()
+                                    if value is not None})
+    except StudentValidationError as e:
+        for field, message in e.errors.items():
+            print(f"error: {field}: {message}", file=sys.stderr)
+        return EXIT_FAILED
+    db = _open_db(args)
+    try:
+        db.add_student(student)  # sets student.student_id when it was allocated
+    except sqlite3.IntegrityError as e:
+        return error(f"Student already exists: {e}")
+    write_record(db.get_student(student.student_id), sys.stdout, args.format)
+    return EXIT_OK
+
+
+def cmd_get(args: argparse.Namespace) -> int:
+    student = _open_db(args).get_student(args.student_id)
+    if student is None:
+        return error(f"No student with ID {args.student_id}")
+    write_record(student, sys.stdout, args.format)
+    return EXIT_OK
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    db = _open_db(args)
+    write_records(db.iter_query_students(_build_query(args)), sys.stdout, args.format)
+    return EXIT_OK
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    db = _open_db(args)
+    query = _build_query(args, search=args.term)
+    write_records(db.iter_query_students(query), sys.stdout, args.format)
+    return EXIT_OK
+
+
+def cmd_filter(args: argparse.Namespace) -> int:
+    db = _open_db(args)
+    query = _build_query(args, **_query_filters(args))
+    if args.count:
+        write_record({"count": db.count_query_students(query)}, sys.stdout, args.format,
+                     columns=("count",))
+    else:
+        write_records(db.iter_query_students(query), sys.stdout, args.format)
+    return EXIT_OK
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    from importer import import_file
+    result = import_file(_open_db(args), args.path, args.input_format, args.chunk_size,
+                         validate=args.validate)
+    summary = {"inserted": result.inserted, "failed": len(result.failed),
+               "elapsed": round(result.elapsed, 3)}
+    if args.format == "csv":
+        write_records(({"row": index, "student_id": student_id, "error": message}
+                       for index, student_id, message in result.failed),
+                      sys.stdout, "csv", columns=("row", "student_id", "error"))
+    else:
+        summary["failures"] = [{"row": index, "student_id": student_id, "error": message}
+                               for index, student_id, message in result.failed]
+        write_record(summary, sys.stdout, args.format)
+    return EXIT_FAILED if result.failed else EXIT_OK
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    from exporter import export_students
+    db = _open_db(args)
+    records = db.iter_query_students(_build_query(args, **_query_filters(args)))
+    export_students(records, args.output, args.format)
+    return EXIT_OK
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    from dataclasses import asdict
+    db = _open_db(args)
+    courses = db.get_course_statistics(args.course)
+    if args.course is None:
+        courses.append(db.get_overall_statistics())
+    elif not courses:
+        return error(f"No students in {args.course}")
+
+    if args.format == "csv":
+        percentiles = sorted({p for stats in courses for p in stats.attendance_percentiles})
+        columns = (["course", "students"] + list(STATS_GRADES)
+                   + ["attendance_mean", "attendance_median"]
+                   + [f"attendance_p{p}" for p in percentiles] + ["at_risk"])
+        rows = []
+        for stats in courses:
+            row = {"course": stats.course if stats.course is not None else "",
+                   "students": stats.students, "attendance_mean": stats.attendance_mean,
+                   "attendance_median": stats.attendance_median, "at_risk": stats.at_risk}
+            row.update({grade: stats.grades.get(grade, 0) for grade in STATS_GRADES})
+            row.update({f"attendance_p{p}": value
+                        for p, value in stats.attendance_percentiles.items()})
+            rows.append(row)
+        write_records(rows, sys.stdout, "csv", columns=columns)
+    else:
+        write_records((asdict(stats) for stats in courses), sys.stdout, args.format)
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", default=DEFAULT_DB, help="Database file")
+    common.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=OUTPUT_FORMATS, default="json",
+                        help="Output format (default: json)")
+
+    window = argparse.ArgumentParser(add_help=False)
+    window.add_argument("--sort", action="append", type=sort_spec, metavar="COLUMN[:desc]",
+                        help="Sort column, repeatable (default: name)")
+    window.add_argument("--limit", type=non_negative_int, help="At most this many students")
+    window.add_argument("--offset", type=non_negative_int, default=0,
+                        help="Skip this many students")
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--course", action="append", help="Course (repeatable: any of)")
+    filters.add_argument("--grade", action="append", help="Grade (repeatable: any of)")
+    filters.add_argument("--attendance-below", type=float, metavar="PERCENT")
+    filters.add_argument("--attendance-at-least", type=float, metavar="PERCENT")
+    filters.add_argument("--search", help="Words matched against name, email and course")
+    filters.add_argument("--year", type=int, help="Enrollment year")
+
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="Student Management System command line interface")
+    subparsers = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    add = subparsers.add_parser("add", parents=[common, output], help="Add a student")
+    add.add_argument("--name", required=True, help="Full name")
+    add.add_argument("--course", required=True)
+    add.add_argument("--email", required=True)
+    add.add_argument("--phone")
+    add.add_argument("--attendance", type=float, help="Attendance percentage")
+    add.add_argument("--grade")
+    add.add_argument("--student-id", help="Student ID (allocated when omitted)")
+    add.set_defaults(handler=cmd_add)
+
+    get = subparsers.add_parser("get", parents=[common, output], help="Show one student")
+    get.add_argument("student_id")
+    get.set_defaults(handler=cmd_get)
+
+    listing = subparsers.add_parser("list", parents=[common, output, window],
+                                    help="List students")
+    listing.set_defaults(handler=cmd_list)
+
+    search = subparsers.add_parser("search", parents=[common, output, window],
+                                   help="Search names, emails and courses")
+    search.add_argument("term")
+    search.set_defaults(handler=cmd_search)
+
+    filtering = subparsers.add_parser("filter", parents=[common, output, window, filters],
+                                      help="List students matching every given filter")
+    filtering.add_argument("--count", action="store_true",
+                           help="Print only the number of matching students")
+    filtering.set_defaults(handler=cmd_filter)
+
+    importing = subparsers.add_parser("import", parents=[common, output],
+                                      help="Bulk import students from CSV or JSONL")
+    importing.add_argument("path")
+    importing.add_argument("--input-format", choices=("csv", "jsonl"),
+                           help="Override format detection")
+    importing.add_argument("--chunk-size", type=positive_int, default=1000,
+                           help="Rows per transaction")
+    importing.add_argument("--validate", action="store_true",
+                           help="Validate and normalize rows before inserting")
+    importing.set_defaults(handler=cmd_import)
+
+    export = subparsers.add_parser("export", parents=[common, window, filters],
+                                   help="Export students to CSV or JSONL")
+    export.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    export.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    export.set_defaults(handler=cmd_export)
+
+    stats = subparsers.add_parser("stats", parents=[common, output],
+                                  help="Grade and attendance statistics per course")
+    stats.add_argument("--course", help="Only this course")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    import logging
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(levelname)s %(name)s: %(message)s")
+    try:
+        return args.handler(args)
+    except ValueError as e:
+        return error(str(e))
+    except BrokenPipeError:
+        # Downstream reader (e.g. `head`) closed the pipe early
+        sys.stderr.close()
+        return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
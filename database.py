@@ -1,88 +1,1442 @@
+import base64
+import json
+import os
 import sqlite3
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import (
+    List, Optional, Dict, Any, Callable, Iterable, Iterator, Mapping, Sequence, Tuple, Union
+)
 from contextlib import contextmanager
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+from cache import LRUCache, MISSING
+from metrics import QueryMetrics, InstrumentedCursor, DEFAULT_SLOW_QUERY_MS
+from query import (
+    StudentQuery, Order, compile_filters, compile_statement, fts_match_expression, key_nulls,
+    seek_params
+)
+from records import Record
+from models import Student, STUDENT_COLUMNS
+from validation import validate_student_records
+from utils import (
+    format_student_id, FAILING_GRADE, GRADE_BOUNDARIES, STUDENT_ID_SEQUENCE_DIGITS,
+    WIDE_STUDENT_ID_SEQUENCE_DIGITS
+)
+
 logger = logging.getLogger(__name__)
 
+# Connection tuning defaults
+DEFAULT_BUSY_TIMEOUT = 5.0                 # seconds
+DEFAULT_CACHE_SIZE_KB = 16 * 1024          # 16 MiB page cache per connection
+DEFAULT_MMAP_SIZE = 64 * 1024 * 1024       # 64 MiB memory-mapped I/O
+DEFAULT_CACHED_STATEMENTS = 256            # prepared statements kept per connection
+DEFAULT_BULK_CHUNK_SIZE = 1000             # rows per bulk-insert transaction
+DEFAULT_FETCH_BATCH_SIZE = 500             # rows per fetchmany when streaming
+DEFAULT_PAGE_SIZE = 50                     # rows per keyset page
+BULK_ID_CHUNK_SIZE = 500                   # IDs per IN (...) lookup, under SQLite's variable limit
+DEFAULT_SORT = (("full_name", False),)     # (column, descending) pairs
+AT_RISK_THRESHOLD = 75.0                   # attendance % below which a student is at risk
+DEFAULT_PERCENTILES = (25, 50, 75, 90)     # attendance percentiles in statistics
+
+# Row type of query results; student queries return STUDENT_COLUMNS
+StudentRecord = Record
+
+STUDENT_INSERT_QUERY = """
+INSERT INTO students (full_name, student_id, course, email, phone, attendance_percent, grade)
+VALUES (?, ?, ?, ?, ?, ?, ?);
+"""
+
+
+# Placeholder for rows of a bulk-import chunk rejected by validation
+_SKIP_ROW = object()
+
+# Insert errors that belong to a row (constraint violations, values sqlite3
+# cannot bind). Anything else, such as a locked database, an I/O error or an
+# interrupted statement, aborts the bulk import.
+_ROW_ERRORS = (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError)
+
+
+@dataclass(frozen=True)
+class RejectedRow:
+    """
+    Stand-in for an input row a reader could not parse (e.g. malformed
+    JSON). add_students_bulk reports it as a failure with this reason.
+    """
+    reason: str
+
+
+@dataclass
+class BulkImportResult:
+    """Outcome of a bulk insert: counts, per-row failures and timing"""
+    inserted: int = 0
+    failed: List[Tuple[int, Optional[str], str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + len(self.failed)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.inserted} inserted, {len(self.failed)} failed "
+                f"in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)")
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome of update_students/delete_students"""
+    affected: int = 0
+    student_ids: List[str] = field(default_factory=list)  # matched rows, in request/ID order
+    unmatched: List[str] = field(default_factory=list)    # requested IDs that matched no row
+    dry_run: bool = False
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        verb = "would change" if self.dry_run else "changed"
+        text = f"{verb} {self.affected} students in {self.elapsed:.2f}s"
+        if self.unmatched:
+            text += f", {len(self.unmatched)} IDs not matched"
+        return text
+
+
+@dataclass
+class AttendanceResult:
+    """Outcome of record_attendance"""
+    recorded: int = 0
+    skipped: int = 0          # unknown students or sessions already marked
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        rate = (self.recorded + self.skipped) / self.elapsed if self.elapsed > 0 else 0.0
+        return (f"{self.recorded} marks recorded, {self.skipped} skipped "
+                f"in {self.elapsed:.2f}s ({rate:,.0f} marks/s)")
+
+
+@dataclass
+class GradingResult:
+    """Outcome of regrade_course"""
+    course: str
+    graded: int = 0           # students with at least one score
+    changed: List[Tuple[str, str, str]] = field(default_factory=list)  # (student_id, old, new)
+    dry_run: bool = False
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        verb = "would change" if self.dry_run else "changed"
+        return (f"{self.course}: {self.graded} students graded, {verb} {len(self.changed)} "
+                f"grades in {self.elapsed:.2f}s")
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated query"""
+    rows: List[StudentRecord]
+    next_token: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_token is not None
+
+
+@dataclass
+class CourseStatistics:
+    """Grade distribution and attendance summary for one course (or all, if course is None)"""
+    course: Optional[str]
+    students: int = 0
+    grades: Dict[str, int] = field(default_factory=dict)
+    attendance_mean: Optional[float] = None
+    attendance_median: Optional[float] = None
+    attendance_percentiles: Dict[int, float] = field(default_factory=dict)
+    at_risk: int = 0
+
+
+def histogram_percentile(values: Sequence[float], cumulative: Sequence[int], p: float) -> float:
+    """
+    p-th percentile (0-100) of data given as a histogram.
+
+    values are the distinct values in ascending order and cumulative[i] is
+    the number of items <= values[i]. Interpolates linearly between the two
+    nearest ranks, like numpy.percentile's default method.
+    """
+    total = cumulative[-1]
+    rank = (total - 1) * p / 100
+    lower = int(rank)
+    low = values[bisect_right(cumulative, lower)]
+    high = values[bisect_right(cumulative, min(lower + 1, total - 1))]
+    return low + (high - low) * (rank - lower)
+
+
+def encode_page_token(key: Tuple[Any, ...]) -> str:
+    """Encode a seek key as an opaque continuation token"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_page_token(token: str, key_length: int) -> Tuple[Any, ...]:
+    """Decode a continuation token back into its seek key"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+    if not isinstance(key, list) or len(key) != key_length:
+        raise ValueError(f"Invalid page token: {token!r}")
+    return tuple(key)
+
+
+class ConnectionPool:
+    """
+    Per-thread pool of tuned SQLite connections.
+
+    Each thread gets one long-lived connection the first time it asks for
+    one. Pragmas are applied once when the connection is opened:
+    - journal_mode=WAL so readers do not block the writer
+    - synchronous=NORMAL (safe with WAL, far fewer fsyncs)
+    - cache_size and mmap_size to keep hot pages in memory
+    - busy_timeout so concurrent writers wait instead of failing
+    """
+
+    def __init__(self, db_name: str,
+                 busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+                 cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+                 mmap_size: int = DEFAULT_MMAP_SIZE):
+        self.db_name = db_name
+        self.busy_timeout = busy_timeout
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and tune a new connection"""
+        # check_same_thread is disabled only so close_all() can run from any
+        # thread; each connection is otherwise used by its owning thread.
+        conn = sqlite3.connect(self.db_name, timeout=self.busy_timeout,
+                               check_same_thread=False,
+                               cached_statements=DEFAULT_CACHED_STATEMENTS)
+        conn.row_factory = Record
+        if self.db_name != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)};")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)};")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)};")
+        return conn
+
+    def close_thread_connection(self):
+        """
+        Close the calling thread's connection, if it has one. Other threads
+        keep theirs; this thread gets a new one the next time it asks.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._connections = [c for c in self._connections if c is not conn]
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Error closing connection: %s", e)
+
+    def close_all(self):
+        """Close every connection handed out by this pool"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Error closing connection: %s", e)
+        self._local = threading.local()
+
+
+class SharedState:
+    """
+    Connections, result cache and schema state of one database file, shared
+    by the DatabaseManager(shared=True) instances that open it in a process.
+    The pool is closed when the last of them is closed.
+    """
+
+    def __init__(self, pool: Optional[ConnectionPool], cache: Optional[LRUCache]):
+        self.pool = pool
+        self.cache = cache
+        self.schema_version = 0   # last version seen current; never goes down
+        self.fts_enabled = False
+        self.users = 0
+
+
+# Shared states by (real path, pooled)
+_shared_states: Dict[Tuple[str, bool], SharedState] = {}
+_shared_states_lock = threading.Lock()
+
+
+# Full-text index over the searchable columns. It is an external-content
+# FTS5 table: it stores only the index, and triggers keep it in sync.
+FTS_TABLE_QUERY = """
+CREATE VIRTUAL TABLE students_fts USING fts5(
+    full_name, email, course,
+    content='students', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+"""
+FTS_TRIGGER_QUERIES = (
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students BEGIN
+        INSERT INTO students_fts(rowid, full_name, email, course)
+        VALUES (new.id, new.full_name, new.email, new.course);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students BEGIN
+        INSERT INTO students_fts(students_fts, rowid, full_name, email, course)
+        VALUES ('delete', old.id, old.full_name, old.email, old.course);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_update
+    AFTER UPDATE OF full_name, email, course ON students BEGIN
+        INSERT INTO students_fts(students_fts, rowid, full_name, email, course)
+        VALUES ('delete', old.id, old.full_name, old.email, old.course);
+        INSERT INTO students_fts(rowid, full_name, email, course)
+        VALUES (new.id, new.full_name, new.email, new.course);
+    END;
+    """,
+)
+
+
+# Summary tables for the statistics API: student counts per (course, grade)
+# and per (course, attendance value). Triggers keep them in step with the
+# students table, so statistics read O(courses) rows, not O(students). The
+# attendance histogram is what makes exact medians and percentiles possible
+# without scanning students.
+STATS_TABLE_QUERIES = (
+    """
+    CREATE TABLE IF NOT EXISTS course_grade_counts (
+        course TEXT NOT NULL,
+        grade TEXT NOT NULL,
+        students INTEGER NOT NULL,
+        PRIMARY KEY (course, grade)
+    ) WITHOUT ROWID;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS course_attendance_counts (
+        course TEXT NOT NULL,
+        attendance_percent REAL NOT NULL,
+        students INTEGER NOT NULL,
+        PRIMARY KEY (course, attendance_percent)
+    ) WITHOUT ROWID;
+    """,
+)
+_STATS_ADD_GRADE = """
+    INSERT INTO course_grade_counts(course, grade, students)
+    VALUES (new.course, COALESCE(new.grade, 'N/A'), 1)
+    ON CONFLICT(course, grade) DO UPDATE SET students = students + 1;
+"""
+_STATS_REMOVE_GRADE = """
+    UPDATE course_grade_counts SET students = students - 1
+    WHERE course = old.course AND grade = COALESCE(old.grade, 'N/A');
+    DELETE FROM course_grade_counts
+    WHERE course = old.course AND grade = COALESCE(old.grade, 'N/A') AND students <= 0;
+"""
+_STATS_ADD_ATTENDANCE = """
+    INSERT INTO course_attendance_counts(course, attendance_percent, students)
+    SELECT new.course, new.attendance_percent, 1 WHERE new.attendance_percent IS NOT NULL
+    ON CONFLICT(course, attendance_percent) DO UPDATE SET students = students + 1;
+"""
+_STATS_REMOVE_ATTENDANCE = """
+    UPDATE course_attendance_counts SET students = students - 1
+    WHERE course = old.course AND attendance_percent = old.attendance_percent;
+    DELETE FROM course_attendance_counts
+    WHERE course = old.course AND attendance_percent = old.attendance_percent AND students <= 0;
+"""
+STATS_TRIGGER_QUERIES = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_stats_insert AFTER INSERT ON students BEGIN
+        {_STATS_ADD_GRADE}
+        {_STATS_ADD_ATTENDANCE}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_stats_delete AFTER DELETE ON students BEGIN
+        {_STATS_REMOVE_GRADE}
+        {_STATS_REMOVE_ATTENDANCE}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_stats_update_grade
+    AFTER UPDATE OF course, grade ON students
+    WHEN old.course IS NOT new.course OR old.grade IS NOT new.grade BEGIN
+        {_STATS_REMOVE_GRADE}
+        {_STATS_ADD_GRADE}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_stats_update_attendance
+    AFTER UPDATE OF course, attendance_percent ON students
+    WHEN old.course IS NOT new.course
+        OR old.attendance_percent IS NOT new.attendance_percent BEGIN
+        {_STATS_REMOVE_ATTENDANCE}
+        {_STATS_ADD_ATTENDANCE}
+    END;
+    """,
+)
+STATS_BACKFILL_QUERIES = (
+    "DELETE FROM course_grade_counts;",
+    "DELETE FROM course_attendance_counts;",
+    """
+    INSERT INTO course_grade_counts(course, grade, students)
+    SELECT course, COALESCE(grade, 'N/A'), COUNT(*) FROM students GROUP BY 1, 2;
+    """,
+    """
+    INSERT INTO course_attendance_counts(course, attendance_percent, students)
+    SELECT course, attendance_percent, COUNT(*) FROM students
+    WHERE attendance_percent IS NOT NULL GROUP BY 1, 2;
+    """,
+)
+
+
+# Attendance is recorded as an append-only log of (student, session,
+# present) marks, one per student and session. attendance_counters keeps
+# running present/total counts per student, and students.attendance_percent
+# is set from them, so reading a student's attendance or filtering on it
+# never touches the log.
+ATTENDANCE_TABLE_QUERIES = (
+    """
+    CREATE TABLE IF NOT EXISTS attendance_events (
+        id INTEGER PRIMARY KEY,
+        student_id TEXT NOT NULL,
+        session TEXT NOT NULL,
+        present INTEGER NOT NULL CHECK (present IN (0, 1)),
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (student_id, session)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance_counters (
+        student_id TEXT PRIMARY KEY,
+        present INTEGER NOT NULL,
+        total INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    """,
+)
+# Marks for unknown students or already-marked sessions are skipped
+ATTENDANCE_INSERT_QUERY = """
+INSERT OR IGNORE INTO attendance_events (student_id, session, present)
+SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM students WHERE student_id = ?);
+"""
+# Fold the events with id > ? (those just inserted) into the counters, then
+# refresh attendance_percent of the students they belong to
+ATTENDANCE_APPLY_QUERIES = (
+    """
+    INSERT INTO attendance_counters (student_id, present, total)
+    SELECT student_id, SUM(present), COUNT(*) FROM attendance_events
+    WHERE id > ? GROUP BY student_id
+    ON CONFLICT(student_id) DO UPDATE SET present = present + excluded.present,
+                                          total = total + excluded.total;
+    """,
+    """
+    UPDATE students SET attendance_percent = (
+        SELECT ROUND(100.0 * present / total, 1) FROM attendance_counters c
+        WHERE c.student_id = students.student_id)
+    WHERE student_id IN (SELECT student_id FROM attendance_events WHERE id > ?);
+    """,
+)
+ATTENDANCE_REBUILD_QUERIES = (
+    "DELETE FROM attendance_counters;",
+    """
+    INSERT INTO attendance_counters (student_id, present, total)
+    SELECT student_id, SUM(present), COUNT(*) FROM attendance_events GROUP BY student_id;
+    """,
+    """
+    UPDATE students SET attendance_percent = (
+        SELECT ROUND(100.0 * present / total, 1) FROM attendance_counters c
+        WHERE c.student_id = students.student_id)
+    WHERE student_id IN (SELECT student_id FROM attendance_counters)
+      AND attendance_percent IS NOT (
+        SELECT ROUND(100.0 * present / total, 1) FROM attendance_counters c
+        WHERE c.student_id = students.student_id);
+    """,
+)
+# Students whose counters or attendance_percent disagree with the log
+ATTENDANCE_VERIFY_QUERY = """
+SELECT log.student_id FROM (
+    SELECT student_id, SUM(present) AS present, COUNT(*) AS total
+    FROM attendance_events GROUP BY student_id
+) AS log
+LEFT JOIN attendance_counters c ON c.student_id = log.student_id
+JOIN students s ON s.student_id = log.student_id
+WHERE c.present IS NOT log.present OR c.total IS NOT log.total
+   OR s.attendance_percent IS NOT ROUND(100.0 * log.present / log.total, 1)
+UNION
+SELECT c.student_id FROM attendance_counters c
+WHERE NOT EXISTS (SELECT 1 FROM attendance_events e WHERE e.student_id = c.student_id)
+ORDER BY 1;
+"""
+
+
+# Gradebook: weighted assessments per course and each student's score on
+# them. A student's final score is the weighted mean of their scores as a
+# percentage of each assessment's max_score; a missing score counts as 0.
+GRADEBOOK_TABLE_QUERIES = (
+    """
+    CREATE TABLE IF NOT EXISTS assessments (
+        id INTEGER PRIMARY KEY,
+        course TEXT NOT NULL,
+        name TEXT NOT NULL,
+        weight REAL NOT NULL CHECK (weight > 0),
+        max_score REAL NOT NULL DEFAULT 100 CHECK (max_score > 0),
+        UNIQUE (course, name)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS assessment_scores (
+        assessment_id INTEGER NOT NULL,
+        student_id TEXT NOT NULL,
+        score REAL NOT NULL CHECK (score >= 0),
+        PRIMARY KEY (assessment_id, student_id)
+    ) WITHOUT ROWID;
+    """,
+)
+# Scores outside 0..max_score, or for students not in the course, are skipped
+SCORE_UPSERT_QUERY = """
+INSERT INTO assessment_scores (assessment_id, student_id, score)
+SELECT ?, ?, ? WHERE ? BETWEEN 0 AND ?
+  AND EXISTS (SELECT 1 FROM students WHERE student_id = ? AND course = ?)
+ON CONFLICT (assessment_id, student_id) DO UPDATE SET score = excluded.score;
+"""
+# Letter grade of a score, mirroring utils.calculate_grade
+GRADE_CASE_SQL = ("CASE " + " ".join(f"WHEN final_score >= {minimum} THEN '{letter}'"
+                                     for minimum, letter in GRADE_BOUNDARIES)
+                  + f" ELSE '{FAILING_GRADE}' END")
+# Final score and letter of every student in the course (:course) with at
+# least one score: one grouped pass over the course's scores, then a unique
+# index lookup to drop students who have since left the course
+FINAL_GRADES_QUERY = f"""
+SELECT f.student_id, f.final_score, {GRADE_CASE_SQL} AS grade FROM (
+    SELECT sc.student_id,
+           100.0 * SUM(a.weight * sc.score / a.max_score) / total.weight AS final_score
+    FROM assessments a
+    JOIN assessment_scores sc ON sc.assessment_id = a.id
+    CROSS JOIN (SELECT SUM(weight) AS weight FROM assessments WHERE course = :course) AS total
+    WHERE a.course = :course
+    GROUP BY sc.student_id
+) AS f
+JOIN students s ON s.student_id = f.student_id AND s.course = :course
+"""
+# Student ID sequences: id_sequences holds each year's next sequence number
+# and its width in digits. Inserting a student whose ID is ahead of its
+# year's counter (an ID typed in by hand) moves the counter past it, so
+# allocated IDs never collide with entered ones.
+ID_SEQUENCE_COLUMN_QUERY = f"""
+ALTER TABLE id_sequences ADD COLUMN digits INTEGER NOT NULL
+DEFAULT {STUDENT_ID_SEQUENCE_DIGITS};
+"""
+_ID_SEQUENCE_MAX_SQL = """
+SELECT {expression} FROM students
+WHERE student_id GLOB printf('%04d', id_sequences.year) || '[0-9]*'
+  AND length(student_id) IN (7, 10)
+"""
+ID_SEQUENCE_BACKFILL_QUERY = f"""
+UPDATE id_sequences
+SET next_value = MAX(next_value, COALESCE(({_ID_SEQUENCE_MAX_SQL.format(
+    expression="MAX(CAST(substr(student_id, 5) AS INTEGER)) + 1")}), 1)),
+    digits = MAX(digits, COALESCE(({_ID_SEQUENCE_MAX_SQL.format(
+    expression="MAX(length(student_id)) - 4")}), 0));
+"""
+ID_SEQUENCE_TRIGGER_QUERY = """
+CREATE TRIGGER IF NOT EXISTS students_id_sequence AFTER INSERT ON students
+WHEN length(new.student_id) IN (7, 10) AND new.student_id NOT GLOB '*[^0-9]*' BEGIN
+    UPDATE id_sequences
+    SET next_value = MAX(next_value, CAST(substr(new.student_id, 5) AS INTEGER) + 1),
+        digits = MAX(digits, length(new.student_id) - 4)
+    WHERE year = CAST(substr(new.student_id, 1, 4) AS INTEGER)
+      AND (next_value <= CAST(substr(new.student_id, 5) AS INTEGER)
+           OR digits < length(new.student_id) - 4);
+END;
+"""
+# First allocation for a year: start after its highest existing ID, at the
+# width of its widest one
+ID_SEQUENCE_SEED_QUERY = """
+SELECT COALESCE(MAX(CAST(substr(student_id, 5) AS INTEGER)), 0) + 1,
+       COALESCE(MAX(length(student_id)) - 4, 0)
+FROM students WHERE student_id GLOB ? AND length(student_id) IN (7, 10);
+"""
+ID_SEQUENCE_UPSERT_QUERY = """
+INSERT INTO id_sequences (year, next_value, digits) VALUES (?, ?, ?)
+ON CONFLICT(year) DO UPDATE SET next_value = excluded.next_value, digits = excluded.digits;
+"""
+
+# Scratch table for regrade_course, private to the connection
+FINAL_GRADES_TEMP_QUERY = """
+CREATE TEMP TABLE IF NOT EXISTS final_grades (
+    student_id TEXT PRIMARY KEY,
+    final_score REAL NOT NULL,
+    grade TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _migration_create_students(cursor: sqlite3.Cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS students (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        full_name TEXT NOT NULL,
+        student_id TEXT UNIQUE NOT NULL,
+        course TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        phone TEXT,
+        attendance_percent REAL DEFAULT 0.0,
+        grade TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+
+def _migration_search_index(cursor: sqlite3.Cursor):
+    """
+    Create and backfill the FTS5 index. On SQLite builds without FTS5 this
+    is skipped and search falls back to LIKE scans.
+    """
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts';"
+    )
+    if cursor.fetchone() is None:
+        try:
+            cursor.execute(FTS_TABLE_QUERY)
+        except sqlite3.OperationalError as e:
+            logger.warning("FTS5 unavailable, search will use LIKE scans: %s", e)
+            return
+        cursor.execute("INSERT INTO students_fts(students_fts) VALUES ('rebuild');")
+    for trigger_query in FTS_TRIGGER_QUERIES:
+        cursor.execute(trigger_query)
+
+
+def _migration_secondary_indexes(cursor: sqlite3.Cursor):
+    """
+    Indexes that cover the filter column plus the sort/seek key of each
+    query, so filters become range scans and ORDER BY needs no temp B-tree.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_name "
+                   "ON students(full_name, student_id);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_course "
+                   "ON students(course, full_name, student_id);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_grade "
+                   "ON students(grade, full_name, student_id);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_attendance "
+                   "ON students(attendance_percent, student_id);")
+    cursor.execute("ANALYZE;")
+
+
+def _migration_id_sequences(cursor: sqlite3.Cursor):
+    """Per-year counters for DatabaseManager.allocate_student_ids"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS id_sequences (
+        year INTEGER PRIMARY KEY,
+        next_value INTEGER NOT NULL
+    );
+    """)
+
+
+def _migration_phone_index(cursor: sqlite3.Cursor):
+    """Lets the GUI sort by phone with an index like every other column"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_phone "
+                   "ON students(phone, student_id);")
+
+
+def _migration_statistics(cursor: sqlite3.Cursor):
+    """Create, backfill and start maintaining the statistics summary tables"""
+    for query in STATS_TABLE_QUERIES + STATS_BACKFILL_QUERIES + STATS_TRIGGER_QUERIES:
+        cursor.execute(query)
+
+
+def _migration_planner_statistics(cursor: sqlite3.Cursor):
+    """
+    Drop the planner statistics from migration 3. On a new database they
+    were gathered from empty tables, and the tiny row counts they record for
+    the FTS shadow tables make every insert slower as the table grows (about
+    10x slower at 40k students). The indexes are picked as well without them.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1';")
+    if cursor.fetchone() is not None:
+        cursor.execute("DELETE FROM sqlite_stat1;")
+
+
+def _migration_attendance_events(cursor: sqlite3.Cursor):
+    """Attendance event log and per-student counters (empty to start with)"""
+    for query in ATTENDANCE_TABLE_QUERIES:
+        cursor.execute(query)
+
+
+def _migration_gradebook(cursor: sqlite3.Cursor):
+    """Assessment and score tables for the gradebook"""
+    for query in GRADEBOOK_TABLE_QUERIES:
+        cursor.execute(query)
+
+
+def _migration_id_sequence_widths(cursor: sqlite3.Cursor):
+    """
+    Store each year's ID width, and keep the counters ahead of IDs that
+    were entered by hand. Skips the column if it is already there.
+    """
+    cursor.execute("SELECT 1 FROM pragma_table_info('id_sequences') WHERE name = 'digits';")
+    if cursor.fetchone() is None:
+        cursor.execute(ID_SEQUENCE_COLUMN_QUERY)
+    cursor.execute(ID_SEQUENCE_BACKFILL_QUERY)
+    cursor.execute(ID_SEQUENCE_TRIGGER_QUERY)
+
+
+def _migration_created_at_index(cursor: sqlite3.Cursor):
+    """Lets sorting by enrollment time walk an index like the other columns"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_created_at "
+                   "ON students(created_at, student_id);")
+
+
+def _migration_drop_planner_statistics(cursor: sqlite3.Cursor):
+    """
+    Remove the statistics tables migration 3's ANALYZE created (migration 7
+    only emptied them), so nothing is left for the planner to read.
+    """
+    for table in ("sqlite_stat1", "sqlite_stat4"):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;",
+                       (table,))
+        if cursor.fetchone() is not None:
+            cursor.execute(f"DROP TABLE {table};")
+
+
+# Ordered schema migrations: (version, description, function). The applied
+# version is tracked in PRAGMA user_version. Never edit or reorder an entry
+# that has shipped; append a new one instead.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "create students table", _migration_create_students),
+    (2, "full-text search index", _migration_search_index),
+    (3, "secondary indexes on name, course, grade and attendance",
+     _migration_secondary_indexes),
+    (4, "per-year student ID sequences", _migration_id_sequences),
+    (5, "phone sort index", _migration_phone_index),
+    (6, "course statistics summary tables", _migration_statistics),
+    (7, "drop planner statistics gathered on empty tables", _migration_planner_statistics),
+    (8, "attendance event log and counters", _migration_attendance_events),
+    (9, "gradebook assessments and scores", _migration_gradebook),
+    (10, "stored student ID widths, sequences kept ahead of entered IDs",
+     _migration_id_sequence_widths),
+    (11, "created_at sort index", _migration_created_at_index),
+    (12, "drop the planner statistics tables", _migration_drop_planner_statistics),
+]
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Startup check: the schema version stamp and whether FTS5 is in use, in one
+# read. No DDL runs unless the stamp is behind LATEST_SCHEMA_VERSION.
+SCHEMA_CHECK_QUERY = """
+SELECT (SELECT user_version FROM pragma_user_version),
+       EXISTS (SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts');
+"""
+
+
 class DatabaseManager:
-    def __init__(self, db_name: str = "student_management.db"):
+    def __init__(self, db_name: str = "student_management.db",
+                 pooled: bool = True,
+                 busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+                 cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+                 mmap_size: int = DEFAULT_MMAP_SIZE,
+                 result_cache_size: int = 0,
+                 result_cache_ttl: Optional[float] = None,
+                 wide_student_ids: bool = False,
+                 instrument: bool = False,
+                 slow_query_ms: Optional[float] = DEFAULT_SLOW_QUERY_MS,
+                 shared: bool = False):
+        """
+        Args:
+            db_name: Path of the SQLite database file
+            pooled: Reuse one tuned connection per thread instead of opening
+                a new connection for every operation
+            busy_timeout: Seconds to wait on a locked database
+            cache_size_kb: Page cache size per pooled connection
+            mmap_size: Bytes of memory-mapped I/O per pooled connection
+            result_cache_size: Entries in the read-through LRU cache for
+                get_student, get_unique_courses and filter_by_*; 0 disables it
+            result_cache_ttl: Seconds a cached result stays valid (None = no expiry)
+            wide_student_ids: Allocate IDs with 6 sequence digits (2024000001)
+                instead of 3 (2024001) from the start. Without it a year
+                is widened once its 3-digit IDs run out.
+            instrument: Record per-method query timings, row counts and
+                connection waits (see metrics_snapshot); off, queries run
+                on plain cursors with no overhead
+            slow_query_ms: With instrument, log queries taking at least this
+                long; None disables the slow-query log
+            shared: Share connections, the result cache and the schema
+                check with other shared instances for the same file in this
+                process. The first one's pool and cache settings apply; later
+                ones skip the schema check entirely.
+        """
+        started = time.perf_counter()
         self.db_name = db_name
+        self.busy_timeout = busy_timeout
+        self.pool: Optional[ConnectionPool] = None
+        self.fts_enabled = False
+        self.cache: Optional[LRUCache] = None
+        self._shared: Optional[SharedState] = None
+        self._startup: Dict[str, Optional[float]] = {}
+        self._started = started
+        self._awaiting_first_query = False
+        if shared and db_name != ":memory:":
+            key = (os.path.realpath(db_name), pooled)
+            with _shared_states_lock:
+                state = _shared_states.get(key)
+                if state is None:
+                    state = _shared_states[key] = SharedState(
+                        self._new_pool(pooled, cache_size_kb, mmap_size),
+                        LRUCache(result_cache_size, result_cache_ttl)
+                        if result_cache_size > 0 else None)
+                state.users += 1
+            self._shared = state
+            self.pool, self.cache = state.pool, state.cache
+        else:
+            self.pool = self._new_pool(pooled, cache_size_kb, mmap_size)
+            if result_cache_size > 0:
+                self.cache = LRUCache(result_cache_size, result_cache_ttl)
+        self.student_id_digits = (WIDE_STUDENT_ID_SEQUENCE_DIGITS if wide_student_ids
+                                  else STUDENT_ID_SEQUENCE_DIGITS)
+        self.metrics: Optional[QueryMetrics] = None
+        if instrument:
+            self.metrics = QueryMetrics(slow_query_ms)
+            for name in dir(type(self)):
+                if not name.startswith("_") and name not in self.UNINSTRUMENTED_METHODS \
+                        and callable(getattr(type(self), name)):
+                    setattr(self, name, self.metrics.instrument(name, getattr(self, name)))
         self.init_database()
+        self._startup["init_ms"] = (time.perf_counter() - started) * 1000
+        self._startup["first_query_ms"] = None
+        self._awaiting_first_query = True
+
+    # Public methods that never query, or that report on the instrumentation itself
+    UNINSTRUMENTED_METHODS = frozenset(("get_db_cursor", "close", "cache_stats", "clear_cache",
+                                        "metrics_snapshot", "metrics_prometheus", "sort_key",
+                                        "startup_timings"))
+
+    def _new_pool(self, pooled: bool, cache_size_kb: int,
+                  mmap_size: int) -> Optional[ConnectionPool]:
+        if not pooled:
+            return None
+        return ConnectionPool(self.db_name, busy_timeout=self.busy_timeout,
+                              cache_size_kb=cache_size_kb, mmap_size=mmap_size)
 
     @contextmanager
     def get_db_cursor(self):
         """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_name)
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        if self.pool is not None:
+            conn = self.pool.get_connection()
+        else:
+            conn = sqlite3.connect(self.db_name, timeout=self.busy_timeout)
+            conn.row_factory = Record
+        cursor = conn.cursor()
+        if metrics is not None:
+            operation = metrics.current_operation()
+            metrics.record_wait(operation, time.perf_counter() - start)
+            cursor = InstrumentedCursor(cursor, metrics, operation)
         try:
-            cursor = conn.cursor()
             yield cursor
-            conn.commit()
+            if metrics is not None and conn.in_transaction:
+                cursor.close()
+                start = time.perf_counter()
+                conn.commit()
+                metrics.record_query(operation, "COMMIT;", (), time.perf_counter() - start, 0)
+            else:
+                conn.commit()
         except Exception as e:
             conn.rollback()
-            logger.error(f"Database error: {str(e)}")
+            logger.error("Database error: %s", e)
             raise
         finally:
-            conn.close()
+            cursor.close()
+            if self.pool is None:
+                conn.close()
+            if self._awaiting_first_query:
+                self._awaiting_first_query = False
+                self._startup["first_query_ms"] = (time.perf_counter() - self._started) * 1000
+                logger.debug("Time to first query on %s: %.1f ms", self.db_name,
+                             self._startup["first_query_ms"])
+
+    def close(self):
+        """
+        Close pooled connections (no-op in unpooled mode). A shared instance
+        closes them only when it is the last one open for its file.
+        """
+        state, self._shared = self._shared, None
+        if state is None:
+            if self.pool is not None:
+                self.pool.close_all()
+            return
+        with _shared_states_lock:
+            state.users -= 1
+            last = state.users == 0
+            if last:
+                for key, value in list(_shared_states.items()):
+                    if value is state:
+                        del _shared_states[key]
+        if last and state.pool is not None:
+            state.pool.close_all()
 
     def init_database(self):
-        """Initialize the database with the students table"""
-        create_table_query = """
-        CREATE TABLE IF NOT EXISTS students (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            full_name TEXT NOT NULL,
-            student_id TEXT UNIQUE NOT NULL,
-            course TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            phone TEXT,
-            attendance_percent REAL DEFAULT 0.0,
-            grade TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """
-        with self.get_db_cursor() as cursor:
-            cursor.execute(create_table_query)
-            logger.info("Database initialized successfully")
-
-    def add_student(self, student_data: Dict[str, Any]) -> int:
-        """Add a new student to the database"""
-        insert_query = """
-        INSERT INTO students (full_name, student_id, course, email, phone, attendance_percent, grade)
-        VALUES (?, ?, ?, ?, ?, ?, ?);
         """
+        Make sure the schema is current.
+
+        One read checks the version stamp (PRAGMA user_version); migrations,
+        and so any DDL, run only when it is behind. A shared instance whose
+        file was already checked in this process skips even that.
+        """
+        state = self._shared
+        if state is not None and state.schema_version >= LATEST_SCHEMA_VERSION:
+            self.fts_enabled = state.fts_enabled
+            self._startup.update(connect_ms=0.0, schema_check_ms=0.0, migrate_ms=0.0)
+            return
+
+        start = time.perf_counter()
+        if self.pool is not None:
+            self.pool.get_connection()
+        connected = time.perf_counter()
+        with self.get_db_cursor() as cursor:
+            cursor.execute(SCHEMA_CHECK_QUERY)
+            version, fts_enabled = cursor.fetchone()
+        checked = time.perf_counter()
+        if version < LATEST_SCHEMA_VERSION:
+            version = self.migrate()
+            with self.get_db_cursor() as cursor:
+                cursor.execute(SCHEMA_CHECK_QUERY)
+                fts_enabled = cursor.fetchone()[1]
+            logger.info("Database initialized at schema version %d", version)
+        elif version > LATEST_SCHEMA_VERSION:
+            logger.warning("Database schema version %d is newer than this program's (%d)",
+                           version, LATEST_SCHEMA_VERSION)
+        self.fts_enabled = bool(fts_enabled)
+        if state is not None:
+            state.fts_enabled = self.fts_enabled
+            state.schema_version = max(state.schema_version, version)
+        self._startup.update(connect_ms=(connected - start) * 1000,
+                             schema_check_ms=(checked - connected) * 1000,
+                             migrate_ms=(time.perf_counter() - checked) * 1000)
+
+    def startup_timings(self) -> Dict[str, Optional[float]]:
+        """
+        Milliseconds spent starting up: opening the first connection, checking
+        the schema stamp, migrating, the whole constructor, and from the start
+        of the constructor to the end of the first query after it (None until
+        that query has run).
+        """
+        return dict(self._startup)
+
+    def schema_version(self) -> int:
+        """Return the schema version stored in PRAGMA user_version"""
+        with self.get_db_cursor() as cursor:
+            cursor.execute("PRAGMA user_version;")
+            return cursor.fetchone()[0]
+
+    def migrate(self) -> int:
+        """
+        Apply pending migrations in order and return the new schema version.
+
+        Each migration runs in its own BEGIN IMMEDIATE transaction together
+        with the user_version bump, so a failed migration leaves the schema
+        at the previous version, and concurrent processes starting at the
+        same time apply each migration only once.
+        """
+        version = self.schema_version()
+        applied = False
+        for target, description, migration in MIGRATIONS:
+            if target <= version:
+                continue
+            with self.get_db_cursor() as cursor:
+                cursor.execute("BEGIN IMMEDIATE;")
+                cursor.execute("PRAGMA user_version;")
+                if cursor.fetchone()[0] >= target:
+                    continue
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {int(target)};")
+            logger.info("Applied migration %d: %s", target, description)
+            version = target
+            applied = True
+        if applied and self.pool is not None and self.db_name != ":memory:":
+            # Statements this connection prepared before the migrations (FTS5
+            # caches its own per connection) were planned against the old
+            # schema and statistics; start again with a fresh connection.
+            # Only this thread's: the pool may be shared with other managers
+            # whose threads are using theirs, and their statements are
+            # re-prepared by SQLite when they see the schema change.
+            self.pool.close_thread_connection()
+        return version
+
+    def rebuild_search_index(self):
+        """Rebuild the full-text search index from the students table"""
+        if not self.fts_enabled:
+            raise RuntimeError("Full-text search is not available in this SQLite build")
+        with self.get_db_cursor() as cursor:
+            cursor.execute("INSERT INTO students_fts(students_fts) VALUES ('rebuild');")
+            cursor.execute("INSERT INTO students_fts(students_fts) VALUES ('optimize');")
+            logger.info("Rebuilt full-text search index")
+
+    def rebuild_statistics(self):
+        """Recompute the statistics summary tables from the students table"""
+        with self.get_db_cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE;")
+            for query in STATS_BACKFILL_QUERIES:
+                cursor.execute(query)
+            logger.info("Rebuilt statistics summary tables")
+
+    def record_attendance(self, marks: Iterable[Tuple[str, str, bool]],
+                          chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> AttendanceResult:
+        """
+        Append (student_id, session, present) marks to the attendance log.
+
+        Each chunk is one transaction: a single executemany into the log,
+        then two set-based statements that add the chunk's counts to the
+        per-student counters and recompute attendance_percent for just the
+        students in the chunk. Marks for unknown students, or for a session
+        the student already has a mark for, are skipped. The input is
+        consumed lazily.
+
+        Once a student has marks, attendance_percent follows them; a value
+        typed in by hand is replaced at the next recorded session.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        result = AttendanceResult()
+        start = time.perf_counter()
+        marks = iter(marks)
+        while True:
+            chunk = [(student_id, session, 1 if present else 0, student_id)
+                     for student_id, session, present in islice(marks, chunk_size)]
+            if not chunk:
+                break
+            with self.get_db_cursor() as cursor:
+                cursor.execute("BEGIN IMMEDIATE;")
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM attendance_events;")
+                last_id = cursor.fetchone()[0]
+                cursor.executemany(ATTENDANCE_INSERT_QUERY, chunk)
+                recorded = cursor.rowcount
+                if recorded:
+                    for query in ATTENDANCE_APPLY_QUERIES:
+                        cursor.execute(query, (last_id,))
+            result.recorded += recorded
+            result.skipped += len(chunk) - recorded
+
+        result.elapsed = time.perf_counter() - start
+        if self.cache is not None and result.recorded:
+            self.cache.clear()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Attendance: %s", result.summary())
+        return result
+
+    def get_attendance_counts(self, student_id: str) -> Optional[Tuple[int, int]]:
+        """(sessions present, sessions recorded) for a student, or None if none are recorded"""
+        with self.get_db_cursor() as cursor:
+            cursor.execute("SELECT present, total FROM attendance_counters WHERE student_id = ?;",
+                           (student_id,))
+            row = cursor.fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def verify_attendance(self) -> List[str]:
+        """
+        Student IDs whose counters or attendance_percent disagree with the
+        attendance log (empty when everything is consistent). Scans the log.
+        """
+        with self.get_db_cursor() as cursor:
+            cursor.execute(ATTENDANCE_VERIFY_QUERY)
+            return [row[0] for row in cursor.fetchall()]
+
+    def rebuild_attendance(self) -> int:
+        """
+        Recompute the attendance counters and attendance_percent from the log.
+        Returns the number of students whose attendance_percent changed.
+        """
+        with self.get_db_cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE;")
+            for query in ATTENDANCE_REBUILD_QUERIES:
+                cursor.execute(query)
+            changed = cursor.rowcount
+            logger.info("Rebuilt attendance counters; %d students changed", changed)
+        if self.cache is not None and changed:
+            self.cache.clear()
+        return changed
+
+    def add_assessment(self, course: str, name: str, weight: float,
+                       max_score: float = 100.0) -> int:
+        """Add a weighted assessment to a course's gradebook; returns its id"""
+        if weight <= 0 or max_score <= 0:
+            raise ValueError("weight and max_score must be positive")
+        with self.get_db_cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO assessments (course, name, weight, max_score) VALUES (?, ?, ?, ?);",
+                (course, name, weight, max_score))
+            logger.info("Added assessment %r to %s", name, course)
+            return cursor.lastrowid
+
+    def get_assessments(self, course: str) -> List[Record]:
+        """A course's assessments (id, name, weight, max_score), in the order they were added"""
+        with self.get_db_cursor() as cursor:
+            cursor.execute("SELECT id, name, weight, max_score FROM assessments "
+                           "WHERE course = ? ORDER BY id;", (course,))
+            return cursor.fetchall()
+
+    def delete_assessment(self, course: str, name: str) -> bool:
+        """Remove an assessment and its scores; grades change at the next regrade_course"""
+        with self.get_db_cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE;")
+            cursor.execute("SELECT id FROM assessments WHERE course = ? AND name = ?;",
+                           (course, name))
+            row = cursor.fetchone()
+            if row is None:
+                return False
+            cursor.execute("DELETE FROM assessment_scores WHERE assessment_id = ?;", (row[0],))
+            cursor.execute("DELETE FROM assessments WHERE id = ?;", (row[0],))
+            logger.info("Deleted assessment %r from %s", name, course)
+            return True
+
+    def record_scores(self, course: str, assessment: str, scores: Iterable[Tuple[str, float]],
+                      chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> int:
+        """
+        Record (student_id, score) pairs for one of a course's assessments,
+        replacing earlier scores. Scores outside 0..max_score, or for
+        students not in the course, are skipped. Each chunk is one
+        executemany in one transaction. Returns the number recorded.
+        Grades change at the next regrade_course.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        with self.get_db_cursor() as cursor:
+            cursor.execute("SELECT id, max_score FROM assessments WHERE course = ? AND name = ?;",
+                           (course, assessment))
+            row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"{course} has no assessment {assessment!r}")
+        assessment_id, max_score = row
+
+        recorded = 0
+        scores = iter(scores)
+        while True:
+            chunk = [(assessment_id, student_id, score, score, max_score, student_id, course)
+                     for student_id, score in islice(scores, chunk_size)]
+            if not chunk:
+                break
+            with self.get_db_cursor() as cursor:
+                cursor.execute("BEGIN IMMEDIATE;")
+                cursor.executemany(SCORE_UPSERT_QUERY, chunk)
+                recorded += cursor.rowcount
+        return recorded
+
+    def get_final_grades(self, course: str) -> List[Record]:
+        """
+        (student_id, final_score, grade) of every student in the course with
+        at least one score, as regrade_course would set them. Does not write.
+        """
+        with self.get_db_cursor() as cursor:
+            cursor.execute(FINAL_GRADES_QUERY + " ORDER BY f.student_id;", {"course": course})
+            return cursor.fetchall()
+
+    def regrade_course(self, course: str, dry_run: bool = False) -> GradingResult:
+        """
+        Compute every final score and letter grade in a course from the
+        gradebook and write the grades that changed.
+
+        The whole course is graded by one grouped SELECT into a temporary
+        table and written back by one UPDATE, in one transaction, so the
+        cost is a scan of the course's scores whatever its size. Students
+        with no scores keep their grade. With dry_run=True the changes are
+        reported but not written.
+        """
+        result = GradingResult(course=course, dry_run=dry_run)
+        start = time.perf_counter()
+        with self.get_db_cursor() as cursor:
+            cursor.execute(FINAL_GRADES_TEMP_QUERY)
+            cursor.execute("BEGIN IMMEDIATE;")
+            cursor.execute("INSERT INTO temp.final_grades " + FINAL_GRADES_QUERY + ";",
+                           {"course": course})
+            result.graded = cursor.rowcount
+            # Keep only the grades that change
+            cursor.execute("DELETE FROM temp.final_grades WHERE grade IS (SELECT s.grade "
+                           "FROM students s WHERE s.student_id = final_grades.student_id);")
+            cursor.execute("SELECT f.student_id, s.grade, f.grade FROM temp.final_grades f "
+                           "JOIN students s ON s.student_id = f.student_id "
+                           "ORDER BY f.student_id;")
+            result.changed = [tuple(row) for row in cursor.fetchall()]
+            if result.changed and not dry_run:
+                cursor.execute(
+                    "UPDATE students SET grade = (SELECT f.grade FROM temp.final_grades f "
+                    "WHERE f.student_id = students.student_id) "
+                    "WHERE student_id IN (SELECT student_id FROM temp.final_grades);")
+            # Rolled back with the transaction on error
+            cursor.execute("DELETE FROM temp.final_grades;")
+
+        result.elapsed = time.perf_counter() - start
+        if self.cache is not None and result.changed and not dry_run:
+            self.cache.clear()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Regrade %s", result.summary())
+        return result
+
+    def add_student(self, student_data: Union[Student, Mapping[str, Any]]) -> int:
+        """
+        Add a new student to the database.
+
+        Anything other than a Student is first validated and normalized with
+        Student.validate, which raises StudentValidationError. A missing
+        student ID is allocated (and set on a Student passed in).
+        """
+        student = student_data if isinstance(student_data, Student) \
+            else Student.validate(student_data)
+        if not student.student_id:
+            student.student_id = self.allocate_student_id()
         try:
             with self.get_db_cursor() as cursor:
-                cursor.execute(insert_query, (
-                    student_data['full_name'],
-                    student_data['student_id'],
-                    student_data['course'],
-                    student_data['email'],
-                    student_data['phone'],
-                    student_data.get('attendance_percent', 0.0),
-                    student_data.get('grade', 'N/A')
+                cursor.execute(STUDENT_INSERT_QUERY, (
+                    student.full_name,
+                    student.student_id,
+                    student.course,
+                    student.email,
+                    student.phone,
+                    student.attendance_percent,
+                    student.grade
                 ))
-                logger.info(f"Added student: {student_data['full_name']}")
-                return cursor.lastrowid
+                logger.info("Added student: %s", student.full_name)
+                row_id = cursor.lastrowid
         except sqlite3.IntegrityError as e:
-            logger.error(f"Failed to add student - duplicate entry: {str(e)}")
+            logger.error("Failed to add student - duplicate entry: %s", e)
             raise
+        self._invalidate_student(student.student_id, student.to_dict(), courses_changed=True)
+        return row_id
+
+    def allocate_student_id(self, year: Optional[int] = None) -> str:
+        """Allocate the next unused student ID for a year (default: current year)"""
+        return self.allocate_student_ids(1, year)[0]
+
+    def allocate_student_ids(self, count: int, year: Optional[int] = None) -> List[str]:
+        """
+        Reserve a block of consecutive student IDs for a year.
+
+        The per-year counter in id_sequences is advanced by count inside a
+        BEGIN IMMEDIATE transaction, so concurrent writers (threads or
+        processes) never receive the same ID. The first allocation for a
+        year starts after the highest existing ID of that year, and IDs
+        entered by hand later move the counter past themselves. A year that
+        runs out of 3-digit sequence numbers is widened to 6 digits; the
+        width is stored, so every manager keeps using it.
 
-    def update_student(self, student_id: str, update_data: Dict[str, Any]) -> bool:
-        """Update student information"""
-        update_query = """
-        UPDATE students
-        SET full_name = COALESCE(?, full_name),
-            course = COALESCE(?, course),
-            email = COALESCE(?, email),
-            phone = COALESCE(?, phone),
-            attendance_percent = COALESCE(?, attendance_percent),
-            grade = COALESCE(?, grade)
-        WHERE student_id = ?;
+        Raises:
+            ValueError: If the year has fewer than count 6-digit IDs left
         """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        if year is None:
+            year = datetime.now().year
+        student_ids = None
         with self.get_db_cursor() as cursor:
-            cursor.execute(update_query, (
+            cursor.execute("BEGIN IMMEDIATE;")
+            cursor.execute("SELECT next_value, digits FROM id_sequences WHERE year = ?;",
+                           (year,))
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute(ID_SEQUENCE_SEED_QUERY, (f"{year:04d}[0-9]*",))
+                row = cursor.fetchone()
+            first, stored_digits = row
+            last = first + count - 1
+            digits = max(stored_digits, self.student_id_digits)
+            if last >= 10 ** digits:
+                digits = WIDE_STUDENT_ID_SEQUENCE_DIGITS
+            if last < 10 ** digits:
+                cursor.execute(ID_SEQUENCE_UPSERT_QUERY, (year, last + 1, digits))
+                student_ids = [format_student_id(year, sequence, digits)
+                               for sequence in range(first, last + 1)]
+        # Raised outside the transaction: running out is not a database error
+        if student_ids is None:
+            raise ValueError(f"Student IDs for {year} are exhausted: {count} more would pass "
+                             f"{format_student_id(year, 10 ** digits - 1, digits)}")
+        if digits > stored_digits and stored_digits:
+            logger.info("Student IDs for %d widened to %d sequence digits", year, digits)
+        return student_ids
+
+    def add_students_bulk(self, students: Iterable[Dict[str, Any]],
+                          chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                          validate: bool = False) -> BulkImportResult:
+        """
+        Insert many students, one transaction per chunk of rows.
+
+        Each chunk is written with a single executemany. If the chunk hits a
+        constraint violation (duplicate student_id or email), it is rolled
+        back and replayed row by row so that only the offending rows fail.
+        The input is consumed lazily, so generators of any length are fine.
+        Rows without a student_id get one from a block reserved once per
+        chunk with allocate_student_ids. With validate=True each chunk is
+        first run through validation.validate_student_records; invalid rows
+        are reported as failures and valid rows are inserted normalized.
+        RejectedRow items are reported as failures too.
+
+        Raises:
+            ValueError: If chunk_size is less than 1
+            sqlite3.OperationalError: If the database is locked, fails or
+                the import is interrupted; chunks already written stay
+
+        Returns:
+            BulkImportResult with the inserted count and a list of
+            (row_index, student_id, error) tuples for rejected rows
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        result = BulkImportResult()
+        start = time.perf_counter()
+        rows = iter(students)
+        offset = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            if any(isinstance(row, RejectedRow) for row in chunk):
+                for index, row in enumerate(chunk, offset):
+                    if isinstance(row, RejectedRow):
+                        result.failed.append((index, None, row.reason))
+                chunk = [_SKIP_ROW if isinstance(row, RejectedRow) else row for row in chunk]
+            if validate:
+                checked = validate_student_records(chunk)
+                for index, error in enumerate(checked.errors, offset):
+                    if error is not None and chunk[index - offset] is not _SKIP_ROW:
+                        result.failed.append((index, self._safe_student_id(chunk[index - offset]),
+                                              f"invalid row: {error}"))
+                chunk = [record if record is not None else _SKIP_ROW
+                         for record in checked.records]
+            chunk = self._assign_missing_ids(chunk, offset, result)
+            params = []
+            for index, student_data in enumerate(chunk, offset):
+                if student_data is _SKIP_ROW:
+                    continue
+                try:
+                    params.append((index, self._insert_params(student_data)))
+                except (KeyError, TypeError, ValueError) as e:
+                    result.failed.append((index, self._safe_student_id(student_data),
+                                          f"invalid row: {e!r}"))
+            offset += len(chunk)
+            if params:
+                self._insert_chunk(params, result)
+
+        result.elapsed = time.perf_counter() - start
+        result.failed.sort(key=lambda failure: failure[0])
+        if self.cache is not None and result.inserted:
+            self.cache.clear()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Bulk import: %s", result.summary())
+        return result
+
+    def _assign_missing_ids(self, chunk: List[Any], offset: int,
+                            result: BulkImportResult) -> List[Any]:
+        """
+        Fill in student_id for rows that lack one, with one allocation per
+        chunk. If the year's IDs are exhausted those rows become failures.
+        """
+        missing = [i for i, row in enumerate(chunk)
+                   if isinstance(row, dict) and not row.get('student_id')]
+        if not missing:
+            return chunk
+        chunk = list(chunk)
+        try:
+            student_ids = self.allocate_student_ids(len(missing))
+        except ValueError as e:
+            for i in missing:
+                result.failed.append((offset + i, None, str(e)))
+                chunk[i] = _SKIP_ROW
+            return chunk
+        for i, student_id in zip(missing, student_ids):
+            chunk[i] = dict(chunk[i], student_id=student_id)
+        return chunk
+
+    def _insert_chunk(self, params: List[Tuple[int, tuple]], result: BulkImportResult):
+        """
+        Insert one chunk, falling back to per-row inserts when a row fails:
+        a constraint violation, or a value sqlite3 cannot bind (such as a
+        nested JSON object from a JSONL file). Other errors roll the chunk
+        back and propagate.
+        """
+        with self.get_db_cursor() as cursor:
+            try:
+                cursor.executemany(STUDENT_INSERT_QUERY, [p for _, p in params])
+                result.inserted += len(params)
+                return
+            except _ROW_ERRORS:
+                cursor.connection.rollback()
+
+            # A failed statement only undoes its own row, so the rest of the
+            # chunk still commits together.
+            for index, row in params:
+                try:
+                    cursor.execute(STUDENT_INSERT_QUERY, row)
+                    result.inserted += 1
+                except _ROW_ERRORS as e:
+                    result.failed.append((index, row[1], str(e)))
+
+    @staticmethod
+    def _insert_params(student_data: Dict[str, Any]) -> tuple:
+        """Build the INSERT parameter tuple for a student dict"""
+        attendance = student_data.get('attendance_percent')
+        return (
+            student_data['full_name'],
+            student_data['student_id'],
+            student_data['course'],
+            student_data['email'],
+            student_data.get('phone'),
+            float(attendance) if attendance not in (None, '') else 0.0,
+            student_data.get('grade') or 'N/A'
+        )
+
+    @staticmethod
+    def _safe_student_id(student_data: Any) -> Optional[str]:
+        try:
+            return student_data.get('student_id')
+        except AttributeError:
+            return None
+
+    UPDATE_QUERY = """
+    UPDATE students
+    SET full_name = COALESCE(?, full_name),
+        course = COALESCE(?, course),
+        email = COALESCE(?, email),
+        phone = COALESCE(?, phone),
+        attendance_percent = COALESCE(?, attendance_percent),
+        grade = COALESCE(?, grade)
+    WHERE student_id = ?;
+    """
+    DELETE_QUERY = "DELETE FROM students WHERE student_id = ?;"
+    GET_STUDENT_QUERY = "SELECT * FROM students WHERE student_id = ?;"
+    UNIQUE_COURSES_QUERY = "SELECT DISTINCT course FROM students ORDER BY course;"
+
+    def update_student(self, student_id: str, update_data: Mapping[str, Any]) -> bool:
+        """
+        Update student information.
+
+        Fields that are missing, None or '' keep their current value; the
+        rest are validated with Student.validate_changes, which raises
+        StudentValidationError.
+        """
+        update_data = Student.validate_changes(update_data)
+        with self.get_db_cursor() as cursor:
+            old = self._cache_keys_of(cursor, student_id)
+            cursor.execute(self.UPDATE_QUERY, (
                 update_data.get('full_name'),
                 update_data.get('course'),
                 update_data.get('email'),
@@ -91,91 +1445,706 @@ class DatabaseManager:
                 update_data.get('grade'),
                 student_id
             ))
-            if cursor.rowcount > 0:
-                logger.info(f"Updated student with ID: {student_id}")
-                return True
-            logger.warning(f"No student found with ID: {student_id}")
-            return False
+            updated = cursor.rowcount > 0
+        if updated:
+            logger.info("Updated student with ID: %s", student_id)
+            if old is not None:
+                new_course = update_data.get('course') or old['course']
+                self._invalidate_student(student_id, old, courses_changed=new_course != old['course'])
+                self._invalidate_student(student_id, {
+                    'course': new_course,
+                    'grade': update_data.get('grade') or old['grade'],
+                })
+            return True
+        logger.warning("No student found with ID: %s", student_id)
+        return False
 
     def delete_student(self, student_id: str) -> bool:
         """Delete a student record"""
-        delete_query = "DELETE FROM students WHERE student_id = ?;"
-        with self.get_db_cursor() as cursor:
-            cursor.execute(delete_query, (student_id,))
-            if cursor.rowcount > 0:
-                logger.info(f"Deleted student with ID: {student_id}")
-                return True
-            logger.warning(f"No student found with ID: {student_id}")
-            return False
-
-    def get_student(self, student_id: str) -> Optional[Dict[str, Any]]:
-        """Fetch a single student by their student ID"""
-        select_query = "SELECT * FROM students WHERE student_id = ?;"
-        with self.get_db_cursor() as cursor:
-            cursor.execute(select_query, (student_id,))
-            result = cursor.fetchone()
-            if result:
-                return self._row_to_dict(cursor, result)
+        with self.get_db_cursor() as cursor:
+            old = self._cache_keys_of(cursor, student_id)
+            cursor.execute(self.DELETE_QUERY, (student_id,))
+            deleted = cursor.rowcount > 0
+        if deleted:
+            logger.info("Deleted student with ID: %s", student_id)
+            if old is not None:
+                self._invalidate_student(student_id, old, courses_changed=True)
+            return True
+        logger.warning("No student found with ID: %s", student_id)
+        return False
+
+    def update_students(self, changes: Mapping[str, Any],
+                        student_ids: Optional[Iterable[str]] = None,
+                        attendance_delta: Optional[float] = None,
+                        dry_run: bool = False, **filters) -> BulkWriteResult:
+        """
+        Apply the same change to many students in one transaction.
+
+        The targets are the given student IDs, the students matching the
+        filters (course, grade, attendance_below, search and/or year, as in
+        get_students_sorted), or the given IDs that also match the filters.
+        changes are validated with Student.validate_changes. attendance_delta
+        is added to each student's attendance, clamped to 0-100.
+
+        With dry_run nothing is written; the result lists the students that
+        would change.
+        """
+        values = Student.validate_changes(changes)
+        assignments = [f"{column} = ?" for column in values]
+        params = list(values.values())
+        if attendance_delta is not None:
+            if 'attendance_percent' in values:
+                raise ValueError("Give attendance_percent or attendance_delta, not both")
+            assignments.append("attendance_percent = "
+                               "MIN(100.0, MAX(0.0, COALESCE(attendance_percent, 0.0) + ?))")
+            params.append(float(attendance_delta))
+        if not assignments:
+            raise ValueError("No changes given")
+        return self._bulk_write(f"UPDATE students SET {', '.join(assignments)}", tuple(params),
+                                student_ids, dry_run, filters)
+
+    def delete_students(self, student_ids: Optional[Iterable[str]] = None,
+                        dry_run: bool = False, **filters) -> BulkWriteResult:
+        """
+        Delete many students in one transaction, selected like update_students
+        (e.g. delete_students(year=2019) removes the 2019 cohort).
+        """
+        return self._bulk_write("DELETE FROM students", (), student_ids, dry_run, filters)
+
+    def _bulk_write(self, statement: str, params: tuple, student_ids: Optional[Iterable[str]],
+                    dry_run: bool, filters: Dict[str, Any]) -> BulkWriteResult:
+        """
+        Resolve the target rows, then run statement on them.
+
+        A filter alone becomes one set-based statement; an ID list is matched
+        in chunks and written with a single executemany. Both run inside one
+        BEGIN IMMEDIATE transaction, so the matched rows are the ones written.
+        """
+        where, filter_params = self._filter_condition(**filters)
+        if student_ids is None and not where:
+            raise ValueError("Give student_ids or at least one filter")
+        result = BulkWriteResult(dry_run=dry_run)
+        start = time.perf_counter()
+        with self.get_db_cursor() as cursor:
+            if not dry_run:
+                cursor.execute("BEGIN IMMEDIATE;")
+            if student_ids is None:
+                cursor.execute(compile_statement("student_id", where, (("student_id", False),)),
+                               filter_params)
+                result.student_ids = [row[0] for row in cursor.fetchall()]
+            else:
+                requested = list(dict.fromkeys(student_ids))
+                condition = f" AND ({where})" if where else ""
+                found = set()
+                for i in range(0, len(requested), BULK_ID_CHUNK_SIZE):
+                    chunk = requested[i:i + BULK_ID_CHUNK_SIZE]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    cursor.execute(f"SELECT student_id FROM students "
+                                   f"WHERE student_id IN ({placeholders}){condition};",
+                                   tuple(chunk) + filter_params)
+                    found.update(row[0] for row in cursor.fetchall())
+                result.student_ids = [sid for sid in requested if sid in found]
+                result.unmatched = [sid for sid in requested if sid not in found]
+
+            if dry_run:
+                result.affected = len(result.student_ids)
+            elif student_ids is None:
+                cursor.execute(f"{statement} WHERE {where};", params + filter_params)
+                result.affected = cursor.rowcount
+            elif result.student_ids:
+                cursor.executemany(f"{statement} WHERE student_id = ?;",
+                                   [params + (sid,) for sid in result.student_ids])
+                result.affected = cursor.rowcount
+
+        result.elapsed = time.perf_counter() - start
+        if not dry_run and result.affected and self.cache is not None:
+            self.cache.clear()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Bulk %s: %s", statement.split()[0].lower(), result.summary())
+        return result
+
+    def get_student(self, student_id: str) -> Optional[StudentRecord]:
+        """
+        Fetch a single student by their student ID. Records are read-only,
+        so a cached one is returned as is.
+        """
+        key = ("student", student_id)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not MISSING:
+                return cached
+
+        with self.get_db_cursor() as cursor:
+            cursor.execute(self.GET_STUDENT_QUERY, (student_id,))
+            student = cursor.fetchone()
+
+        if self.cache is not None:
+            self.cache.set(key, student, tags=(f"student:{student_id}",))
+        return student
+
+    # Result cache. Tags name the data a cached result depends on, so writes
+    # invalidate exactly the entries they can affect:
+    #   student:<id>   get_student(id)
+    #   courses        get_unique_courses()
+    #   course:<name>  filter_by_course(name)
+    #   grade:<grade>  filter_by_grade(grade)
+    #   attendance     filter_by_attendance(any threshold)
+
+    def _cache_keys_of(self, cursor: sqlite3.Cursor, student_id: str) -> Optional[Dict[str, Any]]:
+        """Read the cache-relevant columns of a row before it is modified"""
+        if self.cache is None:
             return None
+        cursor.execute("SELECT course, grade FROM students WHERE student_id = ?;", (student_id,))
+        row = cursor.fetchone()
+        return {'course': row[0], 'grade': row[1]} if row else None
+
+    def _invalidate_student(self, student_id: str, row: Dict[str, Any],
+                            courses_changed: bool = False):
+        """Drop cached results that include or depend on the given row"""
+        if self.cache is None:
+            return
+        tags = [f"student:{student_id}", f"course:{row.get('course')}", "attendance"]
+        if row.get('grade'):
+            tags.append(f"grade:{str(row['grade']).upper()}")
+        if courses_changed:
+            tags.append("courses")
+        self.cache.invalidate_tag(*tags)
+
+    def _cached_query(self, key: tuple, tags: Tuple[str, ...], query: str,
+                      params: tuple) -> List[Record]:
+        """Run a list query through the result cache (if enabled)"""
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not MISSING:
+                return list(cached)
+        with self.get_db_cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        if self.cache is not None:
+            self.cache.set(key, rows, tags)
+            return list(rows)
+        return rows
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss/eviction counters of the result cache, or None if disabled"""
+        return self.cache.stats() if self.cache is not None else None
+
+    def clear_cache(self):
+        """Drop every cached result"""
+        if self.cache is not None:
+            self.cache.clear()
 
-    def get_all_students(self) -> List[Dict[str, Any]]:
+    def metrics_snapshot(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Per-method query metrics (see QueryMetrics.snapshot), or None if not instrumented"""
+        return self.metrics.snapshot() if self.metrics is not None else None
+
+    def metrics_prometheus(self) -> str:
+        """Query metrics, startup timings and result cache counters in the Prometheus text format"""
+        text = self.metrics.to_prometheus() if self.metrics is not None else ""
+        text += "# TYPE student_db_startup_seconds gauge\n"
+        for name, value in self.startup_timings().items():
+            if value is not None:
+                text += f'student_db_startup_seconds{{phase="{name[:-3]}"}} {value / 1000!r}\n'
+        stats = self.cache_stats()
+        if stats is not None:
+            for name, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    text += (f"# TYPE student_db_result_cache_{name} gauge\n"
+                             f"student_db_result_cache_{name} {value}\n")
+        return text
+
+    # Read queries shared by the list and streaming (iter_*) variants
+    ALL_STUDENTS_QUERY = "SELECT * FROM students ORDER BY full_name;"
+    SEARCH_QUERY = """
+    SELECT * FROM students 
+    WHERE full_name LIKE ? OR email LIKE ? OR course LIKE ?
+    ORDER BY full_name;
+    """
+    FTS_SEARCH_QUERY = """
+    SELECT students.* FROM students_fts
+    JOIN students ON students.id = students_fts.rowid
+    WHERE students_fts MATCH ?
+    ORDER BY students_fts.rank, students.full_name;
+    """
+    COURSE_QUERY = "SELECT * FROM students WHERE course = ? ORDER BY full_name;"
+    ATTENDANCE_QUERY = "SELECT * FROM students WHERE attendance_percent < ? ORDER BY attendance_percent;"
+    GRADE_QUERY = "SELECT * FROM students WHERE grade = ? ORDER BY full_name;"
+
+    def get_all_students(self) -> List[StudentRecord]:
         """Fetch all students"""
-        select_query = "SELECT * FROM students ORDER BY full_name;"
         with self.get_db_cursor() as cursor:
-            cursor.execute(select_query)
-            return [self._row_to_dict(cursor, row) for row in cursor.fetchall()]
+            cursor.execute(self.ALL_STUDENTS_QUERY)
+            return cursor.fetchall()
 
-    def search_students(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search students by name or email"""
-        search_query = """
-        SELECT * FROM students 
-        WHERE full_name LIKE ? OR email LIKE ? OR course LIKE ?
-        ORDER BY full_name;
+    def search_students(self, search_term: str) -> List[StudentRecord]:
         """
-        search_term = f"%{search_term}%"
+        Search students by name, email or course.
+
+        Every word of the search term is matched as a prefix against the
+        full-text index, and results are ordered by relevance.
+        """
+        query, params = self._search_query(search_term)
         with self.get_db_cursor() as cursor:
-            cursor.execute(search_query, (search_term, search_term, search_term))
-            return [self._row_to_dict(cursor, row) for row in cursor.fetchall()]
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def _search_query(self, search_term: str) -> Tuple[str, tuple]:
+        """Pick the ranked FTS query, or the LIKE scan when FTS can't be used"""
+        match = fts_match_expression(search_term) if self.fts_enabled else None
+        if match:
+            return self.FTS_SEARCH_QUERY, (match,)
+        search_term = f"%{search_term}%"
+        return self.SEARCH_QUERY, (search_term, search_term, search_term)
+
+    def _search_condition(self, search_term: str) -> Tuple[str, tuple]:
+        """WHERE condition for search, for queries with their own ordering"""
+        match = fts_match_expression(search_term) if self.fts_enabled else None
+        if match:
+            return "id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)", (match,)
+        search_term = f"%{search_term}%"
+        return ("full_name LIKE ? OR email LIKE ? OR course LIKE ?",
+                (search_term, search_term, search_term))
 
-    def filter_by_course(self, course: str) -> List[Dict[str, Any]]:
+    def filter_by_course(self, course: str) -> List[StudentRecord]:
         """Filter students by exact course name"""
-        query = "SELECT * FROM students WHERE course = ? ORDER BY full_name;"
-        with self.get_db_cursor() as cursor:
-            cursor.execute(query, (course,))
-            return [self._row_to_dict(cursor, row) for row in cursor.fetchall()]
+        return self._cached_query(("filter_by_course", course), (f"course:{course}",),
+                                  self.COURSE_QUERY, (course,))
 
-    def filter_by_attendance(self, threshold: float) -> List[Dict[str, Any]]:
+    def filter_by_attendance(self, threshold: float) -> List[StudentRecord]:
         """Filter students by attendance below threshold"""
-        query = "SELECT * FROM students WHERE attendance_percent < ? ORDER BY attendance_percent;"
-        with self.get_db_cursor() as cursor:
-            cursor.execute(query, (threshold,))
-            return [self._row_to_dict(cursor, row) for row in cursor.fetchall()]
+        return self._cached_query(("filter_by_attendance", threshold), ("attendance",),
+                                  self.ATTENDANCE_QUERY, (threshold,))
 
-    def filter_by_grade(self, grade: str) -> List[Dict[str, Any]]:
+    def filter_by_grade(self, grade: str) -> List[StudentRecord]:
         """Filter students by exact grade"""
-        query = "SELECT * FROM students WHERE grade = ? ORDER BY full_name;"
+        grade = grade.upper()
+        return self._cached_query(("filter_by_grade", grade), (f"grade:{grade}",),
+                                  self.GRADE_QUERY, (grade,))
+
+    def iter_students(self, batch_size: int = DEFAULT_FETCH_BATCH_SIZE) -> Iterator[StudentRecord]:
+        """Stream all students ordered by name, batch_size rows at a time"""
+        return self._iter_query(self.ALL_STUDENTS_QUERY, (), batch_size)
+
+    def iter_search_students(self, search_term: str,
+                             batch_size: int = DEFAULT_FETCH_BATCH_SIZE) -> Iterator[StudentRecord]:
+        """Streaming variant of search_students"""
+        query, params = self._search_query(search_term)
+        return self._iter_query(query, params, batch_size)
+
+    def iter_filter_by_course(self, course: str,
+                              batch_size: int = DEFAULT_FETCH_BATCH_SIZE) -> Iterator[StudentRecord]:
+        """Streaming variant of filter_by_course"""
+        return self._iter_query(self.COURSE_QUERY, (course,), batch_size)
+
+    def iter_filter_by_attendance(self, threshold: float,
+                                  batch_size: int = DEFAULT_FETCH_BATCH_SIZE) -> Iterator[StudentRecord]:
+        """Streaming variant of filter_by_attendance"""
+        return self._iter_query(self.ATTENDANCE_QUERY, (threshold,), batch_size)
+
+    def iter_filter_by_grade(self, grade: str,
+                             batch_size: int = DEFAULT_FETCH_BATCH_SIZE) -> Iterator[StudentRecord]:
+        """Streaming variant of filter_by_grade"""
+        return self._iter_query(self.GRADE_QUERY, (grade.upper(),), batch_size)
+
+    def _iter_query(self, query: str, params: tuple,
+                    batch_size: int) -> Iterator[Record]:
+        """
+        Run a query and yield its rows using fetchmany.
+
+        At most batch_size rows are materialised at once. The cursor stays
+        open until the generator is exhausted or closed.
+        """
         with self.get_db_cursor() as cursor:
-            cursor.execute(query, (grade.upper(),))
-            return [self._row_to_dict(cursor, row) for row in cursor.fetchall()]
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    # Keyset pagination: each page seeks past the last row of the previous
+    # one with a row-value comparison, so page N costs the same as page 1.
+    NAME_SEEK_KEY = ("full_name", "student_id")
+    ATTENDANCE_SEEK_KEY = ("attendance_percent", "student_id")
+
+    def get_students_page(self, limit: int = DEFAULT_PAGE_SIZE,
+                          page_token: Optional[str] = None) -> Page:
+        """Fetch one page of all students ordered by name"""
+        return self._fetch_page("", (), self.NAME_SEEK_KEY, limit, page_token)
+
+    def search_students_page(self, search_term: str, limit: int = DEFAULT_PAGE_SIZE,
+                             page_token: Optional[str] = None) -> Page:
+        """Paginated variant of search_students (ordered by name, not relevance)"""
+        condition, params = self._search_condition(search_term)
+        return self._fetch_page(condition, params, self.NAME_SEEK_KEY, limit, page_token)
+
+    def filter_by_course_page(self, course: str, limit: int = DEFAULT_PAGE_SIZE,
+                              page_token: Optional[str] = None) -> Page:
+        """Paginated variant of filter_by_course"""
+        return self._fetch_page("course = ?", (course,), self.NAME_SEEK_KEY,
+                                limit, page_token)
+
+    def filter_by_attendance_page(self, threshold: float, limit: int = DEFAULT_PAGE_SIZE,
+                                  page_token: Optional[str] = None) -> Page:
+        """Paginated variant of filter_by_attendance (ordered by attendance)"""
+        return self._fetch_page("attendance_percent < ?", (threshold,),
+                                self.ATTENDANCE_SEEK_KEY, limit, page_token)
+
+    def filter_by_grade_page(self, grade: str, limit: int = DEFAULT_PAGE_SIZE,
+                             page_token: Optional[str] = None) -> Page:
+        """Paginated variant of filter_by_grade"""
+        return self._fetch_page("grade = ?", (grade.upper(),), self.NAME_SEEK_KEY,
+                                limit, page_token)
+
+    def _fetch_page(self, where: str, params: tuple, seek_key: Tuple[str, ...],
+                    limit: int, page_token: Optional[str]) -> Page:
+        """
+        Run a keyset-paginated SELECT.
+
+        Args:
+            where: Filter condition (without WHERE), or "" for no filter
+            params: Parameters for the filter condition
+            seek_key: Columns the page is ordered by; the last one must be unique
+            limit: Maximum rows in the page
+            page_token: Token from a previous Page, or None for the first page
+        """
+        query, params = self._page_query(where, params, seek_key, limit, page_token)
+        with self.get_db_cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_token = encode_page_token(tuple(rows[-1][col] for col in seek_key))
+        return Page(rows, next_token)
+
+    @staticmethod
+    def _page_query(where: str, params: tuple, seek_key: Tuple[str, ...],
+                    limit: int, page_token: Optional[str]) -> Tuple[str, list]:
+        """Build the SQL and parameters for one keyset page (limit + 1 rows)"""
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        conditions = [f"({where})"] if where else []
+        params = list(params)
+        if page_token is not None:
+            key_columns = ", ".join(seek_key)
+            placeholders = ", ".join("?" for _ in seek_key)
+            conditions.append(f"({key_columns}) > ({placeholders})")
+            params.extend(decode_page_token(page_token, len(seek_key)))
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = (f"SELECT * FROM students {where_clause} "
+                 f"ORDER BY {', '.join(seek_key)} LIMIT ?;")
+        params.append(limit + 1)
+        return query, params
+
+    def get_students_at(self, offset: int, limit: int = DEFAULT_PAGE_SIZE) -> List[StudentRecord]:
+        """
+        Fetch rows by position in (full_name, student_id) order.
+
+        OFFSET still walks the skipped index entries, so this is meant for
+        random jumps; read sequentially with get_students_page instead.
+        """
+        return self.get_students_sorted(DEFAULT_SORT, offset=offset, limit=limit)
+
+    # Sorting. Columns are sorted by their stored type, so attendance orders
+    # numerically. student_id is always the final tie-break so the order is
+    # total, which keyset seeks rely on. A sort that is a prefix of its first
+    # column's index key is completed with the rest of that key instead, so
+    # ORDER BY walks the index rather than building a temp B-tree.
+    SORTABLE_COLUMNS = frozenset(("student_id", "full_name", "course", "email", "phone",
+                                  "attendance_percent", "grade", "created_at"))
+    SORT_INDEX_KEYS = {
+        "full_name": ("full_name", "student_id"),
+        "course": ("course", "full_name", "student_id"),
+        "grade": ("grade", "full_name", "student_id"),
+        "attendance_percent": ("attendance_percent", "student_id"),
+        "phone": ("phone", "student_id"),
+        "created_at": ("created_at", "student_id"),
+    }
+
+    def get_students_sorted(self, sort: Sequence[Tuple[str, bool]] = DEFAULT_SORT,
+                            offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                            after: Optional[Sequence[Any]] = None,
+                            **filters) -> List[StudentRecord]:
+        """
+        Fetch a window of students in any column order, optionally filtered.
+
+        Args:
+            sort: (column, descending) pairs, most significant first
+            offset: Rows to skip (ignored when after is given)
+            limit: Maximum rows to return
+            after: Sort-key values of the row just before the window, as
+                returned by sort_key(); seeks past it instead of using OFFSET.
+                NULL values are fine: they sort first ascending, last
+                descending.
+            **filters: Any filters of StudentQuery.where (course, grade,
+                attendance_below, search, year, ...), combined with AND
+        """
+        order = self._normalize_sort(sort)
+        where, params = self._filter_condition(**filters)
+        params = list(params)
+        seek = nulls = None
+        if after is not None:
+            params.extend(seek_params(order, after))
+            seek, nulls, offset = order, key_nulls(after), 0
+        query = compile_statement("*", where, order, seek, True, nulls)
+        params.extend((limit, offset))
+        with self.get_db_cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def iter_students_sorted(self, sort: Sequence[Tuple[str, bool]] = DEFAULT_SORT,
+                             batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+                             **filters) -> Iterator[StudentRecord]:
+        """Streaming variant of get_students_sorted over all matching rows"""
+        order = self._normalize_sort(sort)
+        where, params = self._filter_condition(**filters)
+        return self._iter_query(compile_statement("*", where, order), params, batch_size)
+
+    def sort_key(self, student: Dict[str, Any], sort: Sequence[Tuple[str, bool]]) -> tuple:
+        """Values of a row's sort key, for the after argument of get_students_sorted"""
+        return tuple(student[col] for col, _ in self._normalize_sort(sort))
+
+    def student_position(self, student: Dict[str, Any],
+                         sort: Sequence[Tuple[str, bool]] = DEFAULT_SORT, **filters) -> int:
+        """
+        Index the student has (or would have) in get_students_sorted order.
+
+        Counts the matching rows that sort before it, with the seek
+        condition reversed, so it is an index range count rather than a
+        scan of the result. NULL sort-key values are allowed.
+        """
+        order = self._normalize_sort(sort)
+        reverse = tuple((col, not desc) for col, desc in order)
+        where, params = self._filter_condition(**filters)
+        key = self.sort_key(student, sort)
+        params = list(params) + seek_params(reverse, key)
+        with self.get_db_cursor() as cursor:
+            cursor.execute(compile_statement("COUNT(*)", where, (), reverse, False,
+                                             key_nulls(key)), params)
+            return cursor.fetchone()[0]
+
+    def data_version(self) -> int:
+        """
+        SQLite's data_version for this thread's connection.
+
+        The value changes whenever another connection commits to the
+        database, so polling it is a cheap way to notice external changes.
+        Only meaningful with pooled connections.
+        """
+        with self.get_db_cursor() as cursor:
+            cursor.execute("PRAGMA data_version;")
+            return cursor.fetchone()[0]
+
+    def _normalize_sort(self, sort: Sequence[Tuple[str, bool]]) -> Order:
+        """
+        Validate sort columns and append the tie-breaks: the rest of the
+        index key the sort is a prefix of, or else student_id
+        """
+        order = []
+        for col, desc in sort:
+            if col not in self.SORTABLE_COLUMNS:
+                raise ValueError(f"Cannot sort by {col!r}")
+            if col not in (c for c, _ in order):
+                order.append((col, bool(desc)))
+        if not order:
+            return (("student_id", False),)
+        columns = tuple(c for c, _ in order)
+        index_key = self.SORT_INDEX_KEYS.get(columns[0], ())
+        if index_key[:len(columns)] == columns:
+            tie_breaks = index_key[len(columns):]
+        elif "student_id" not in columns:
+            tie_breaks = ("student_id",)
+        else:
+            tie_breaks = ()
+        return tuple(order) + tuple((col, order[-1][1]) for col in tie_breaks)
+
+    def _filter_condition(self, **filters) -> Tuple[str, tuple]:
+        """AND-combined WHERE condition for the filters of StudentQuery.where"""
+        return compile_filters(filters, self.fts_enabled)
+
+    def count_students(self, **filters) -> int:
+        """Return the number of students, optionally filtered like get_students_sorted"""
+        where, params = self._filter_condition(**filters)
+        with self.get_db_cursor() as cursor:
+            cursor.execute(compile_statement("COUNT(*)", where, ()), params)
+            return cursor.fetchone()[0]
+
+    # Composable queries (see query.StudentQuery). Each shape compiles to
+    # one cached SQL text, so repeated queries reuse the prepared statement.
+
+    def query_students(self, query: StudentQuery) -> List[StudentRecord]:
+        """Run a StudentQuery (default order: name) as a single SELECT"""
+        sql, params = self._query_statement(query)
+        with self.get_db_cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def iter_query_students(self, query: StudentQuery,
+                            batch_size: int = DEFAULT_FETCH_BATCH_SIZE) -> Iterator[StudentRecord]:
+        """Streaming variant of query_students"""
+        sql, params = self._query_statement(query)
+        return self._iter_query(sql, params, batch_size)
+
+    def count_query_students(self, query: StudentQuery) -> int:
+        """Number of students matching a query's filters (its window is ignored)"""
+        return self.count_students(**query.filter_dict())
+
+    def query_students_page(self, query: StudentQuery, limit: int = DEFAULT_PAGE_SIZE,
+                            page_token: Optional[str] = None) -> Page:
+        """
+        Paginated variant of query_students (the query's own window is ignored).
+
+        Pages seek past the previous page's last row, whose sort key (NULLs
+        included) is the token.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        order = self._normalize_sort(query.sort or DEFAULT_SORT)
+        after = None
+        if page_token is not None:
+            after = decode_page_token(page_token, len(order))
+        rows = self.get_students_sorted(order, limit=limit + 1, after=after,
+                                        **query.filter_dict())
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_token = encode_page_token(self.sort_key(rows[-1], order))
+        return Page(rows, next_token)
+
+    def _query_statement(self, query: StudentQuery) -> Tuple[str, list]:
+        """SQL and parameters of a StudentQuery"""
+        order = self._normalize_sort(query.sort or DEFAULT_SORT)
+        where, params = self._filter_condition(**query.filter_dict())
+        limit = query.limit if query.limit is not None else -1
+        return compile_statement("*", where, order, None, True), list(params) + [limit, query.offset]
 
     def get_unique_courses(self) -> List[str]:
         """Get list of all unique courses"""
-        query = "SELECT DISTINCT course FROM students ORDER BY course;"
+        if self.cache is not None:
+            cached = self.cache.get(("courses",))
+            if cached is not MISSING:
+                return list(cached)
         with self.get_db_cursor() as cursor:
-            cursor.execute(query)
-            return [row[0] for row in cursor.fetchall()]
+            cursor.execute(self.UNIQUE_COURSES_QUERY)
+            courses = [row[0] for row in cursor.fetchall()]
+        if self.cache is not None:
+            self.cache.set(("courses",), courses, ("courses",))
+            return list(courses)
+        return courses
 
-    @staticmethod
-    def _row_to_dict(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
-        """Convert a database row to a dictionary"""
-        columns = [col[0] for col in cursor.description]
-        return dict(zip(columns, row))
+    def get_course_statistics(self, course: Optional[str] = None,
+                              percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+                              at_risk_below: float = AT_RISK_THRESHOLD) -> List[CourseStatistics]:
+        """
+        Per-course grade counts and attendance mean, median, percentiles and
+        at-risk count (attendance below at_risk_below), ordered by course.
+
+        Reads the trigger-maintained summary tables, so the cost grows with
+        the number of courses and distinct attendance values, not students.
+        """
+        if course is None:
+            return self._statistics("course", "", (), percentiles, at_risk_below)
+        return self._statistics("course", "WHERE course = ?", (course,), percentiles,
+                                at_risk_below)
+
+    def get_overall_statistics(self, percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+                               at_risk_below: float = AT_RISK_THRESHOLD) -> CourseStatistics:
+        """The same figures as get_course_statistics across all courses"""
+        stats = self._statistics("NULL", "", (), percentiles, at_risk_below)
+        return stats[0] if stats else CourseStatistics(None)
+
+    def _statistics(self, group: str, where: str, params: tuple, percentiles: Sequence[int],
+                    at_risk_below: float) -> List[CourseStatistics]:
+        """Statistics grouped by the group expression ("course" or "NULL")"""
+        with self.get_db_cursor() as cursor:
+            cursor.execute("BEGIN;")  # one snapshot for all three reads
+            cursor.execute(f"SELECT {group}, grade, SUM(students) FROM course_grade_counts "
+                           f"{where} GROUP BY 1, 2 ORDER BY 1, 2;", params)
+            grade_rows = cursor.fetchall()
+            cursor.execute(f"""
+                SELECT {group}, SUM(attendance_percent * students) / SUM(students),
+                       SUM(CASE WHEN attendance_percent < ? THEN students ELSE 0 END)
+                FROM course_attendance_counts {where} GROUP BY 1;
+            """, (at_risk_below,) + params)
+            summary_rows = cursor.fetchall()
+            cursor.execute(f"SELECT {group}, attendance_percent, SUM(students) "
+                           f"FROM course_attendance_counts {where} GROUP BY 1, 2 ORDER BY 1, 2;",
+                           params)
+            histogram_rows = cursor.fetchall()
+
+        stats: Dict[Optional[str], CourseStatistics] = {}
+        for course, grade, count in grade_rows:
+            entry = stats.setdefault(course, CourseStatistics(course))
+            entry.grades[grade] = count
+            entry.students += count
+        for course, mean, at_risk in summary_rows:
+            entry = stats.setdefault(course, CourseStatistics(course))
+            entry.attendance_mean = mean
+            entry.at_risk = at_risk
+
+        histograms: Dict[Optional[str], Tuple[List[float], List[int]]] = {}
+        for course, value, count in histogram_rows:
+            values, cumulative = histograms.setdefault(course, ([], []))
+            values.append(value)
+            cumulative.append(count + (cumulative[-1] if cumulative else 0))
+        for course, (values, cumulative) in histograms.items():
+            entry = stats[course]
+            entry.attendance_median = histogram_percentile(values, cumulative, 50)
+            entry.attendance_percentiles = {
+                p: histogram_percentile(values, cumulative, p) for p in percentiles}
+        return list(stats.values())
+
+    def explain_queries(self) -> Dict[str, List[str]]:
+        """
+        Return the EXPLAIN QUERY PLAN of every public query, keyed by method.
+
+        Sample parameters are used; the plan does not depend on their values.
+        Paginated methods are explained with a continuation token, since that
+        is the seek query that must hit an index.
+        """
+        token = encode_page_token(("", ""))
+        search_query, search_params = self._search_query("sample")
+        search_condition, search_condition_params = self._search_condition("sample")
+        queries = {
+            "get_student": (self.GET_STUDENT_QUERY, ("2024001",)),
+            "update_student": (self.UPDATE_QUERY, (None,) * 6 + ("2024001",)),
+            "delete_student": (self.DELETE_QUERY, ("2024001",)),
+            "get_all_students": (self.ALL_STUDENTS_QUERY, ()),
+            "search_students": (search_query, search_params),
+            "filter_by_course": (self.COURSE_QUERY, ("Computer Science",)),
+            "filter_by_attendance": (self.ATTENDANCE_QUERY, (75.0,)),
+            "filter_by_grade": (self.GRADE_QUERY, ("A",)),
+            "get_unique_courses": (self.UNIQUE_COURSES_QUERY, ()),
+            "get_students_page": self._page_query(
+                "", (), self.NAME_SEEK_KEY, DEFAULT_PAGE_SIZE, token),
+            "search_students_page": self._page_query(
+                search_condition, search_condition_params, self.NAME_SEEK_KEY,
+                DEFAULT_PAGE_SIZE, token),
+            "filter_by_course_page": self._page_query(
+                "course = ?", ("Computer Science",), self.NAME_SEEK_KEY,
+                DEFAULT_PAGE_SIZE, token),
+            "filter_by_attendance_page": self._page_query(
+                "attendance_percent < ?", (75.0,), self.ATTENDANCE_SEEK_KEY,
+                DEFAULT_PAGE_SIZE, encode_page_token((0.0, ""))),
+            "filter_by_grade_page": self._page_query(
+                "grade = ?", ("A",), self.NAME_SEEK_KEY, DEFAULT_PAGE_SIZE, token),
+            "query_students": self._query_statement(
+                StudentQuery().where(course="Computer Science", grade=("D", "F"),
+                                     attendance_below=60.0).take(DEFAULT_PAGE_SIZE)),
+        }
+        plans = {}
+        with self.get_db_cursor() as cursor:
+            for name, (query, params) in queries.items():
+                cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+                plans[name] = [row[3] for row in cursor.fetchall()]
+        return plans
+
+def run_demo(db_name: str):
+    """Example usage: add, fetch and update a test student"""
+    db = DatabaseManager(db_name)
 
-# Example usage:
-if __name__ == "__main__":
-    # Initialize database manager
-    db = DatabaseManager()
-    
     # Example student data
     test_student = {
         "full_name": "John Doe",
@@ -186,24 +2155,83 @@ if __name__ == "__main__":
         "attendance_percent": 95.5,
         "grade": "A"
     }
-    
+
     # Test database operations
     try:
         # Add student
         student_id = db.add_student(test_student)
         print(f"Added student with ID: {student_id}")
-        
+
         # Get student
         student = db.get_student("2024001")
         print(f"Retrieved student: {student}")
-        
+
         # Update student
-        update_result = db.update_student("2024001", {"grade": "A+"})
+        update_result = db.update_student("2024001", {"grade": "B"})
         print(f"Update successful: {update_result}")
-        
+
         # Get all students
         all_students = db.get_all_students()
         print(f"Total students: {len(all_students)}")
-        
+
     except Exception as e:
-        print(f"Error during testing: {str(e)}") 
\ No newline at end of file
+        print(f"Error during testing: {str(e)}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Student database maintenance")
+    parser.add_argument("--db", default="student_management.db", help="Database file")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("demo", help="Run the example operations (default)")
+    subparsers.add_parser("rebuild-search-index",
+                          help="Rebuild the full-text search index from the students table")
+    subparsers.add_parser("rebuild-statistics",
+                          help="Recompute the course statistics summary tables")
+    attendance_parser = subparsers.add_parser(
+        "rebuild-attendance",
+        help="Recompute attendance counters and percentages from the attendance log")
+    attendance_parser.add_argument("--verify", action="store_true",
+                                   help="Only list students whose figures disagree with the log")
+    regrade_parser = subparsers.add_parser(
+        "regrade", help="Recompute a course's letter grades from its gradebook scores")
+    regrade_parser.add_argument("course", help="Course name")
+    regrade_parser.add_argument("--dry-run", action="store_true",
+                                help="Report the grades that would change without writing")
+    subparsers.add_parser("migrate", help="Apply pending schema migrations")
+    subparsers.add_parser("explain", help="Show the query plan of every public query")
+    args = parser.parse_args()
+
+    if args.command == "rebuild-search-index":
+        DatabaseManager(args.db).rebuild_search_index()
+    elif args.command == "rebuild-statistics":
+        DatabaseManager(args.db).rebuild_statistics()
+    elif args.command == "rebuild-attendance":
+        db = DatabaseManager(args.db)
+        if args.verify:
+            mismatched = db.verify_attendance()
+            print(f"{len(mismatched)} students disagree with the attendance log")
+            for student_id in mismatched[:20]:
+                print(f"  {student_id}")
+            sys.exit(1 if mismatched else 0)
+        print(f"Attendance rebuilt; {db.rebuild_attendance()} students changed")
+    elif args.command == "regrade":
+        grading = DatabaseManager(args.db).regrade_course(args.course, dry_run=args.dry_run)
+        print(grading.summary())
+        for student_id, old, new in grading.changed[:20]:
+            print(f"  {student_id}: {old} -> {new}")
+        if len(grading.changed) > 20:
+            print(f"  ... and {len(grading.changed) - 20} more")
+    elif args.command == "migrate":
+        # Construction applies pending migrations
+        print(f"Schema version: {DatabaseManager(args.db).schema_version()}")
+    elif args.command == "explain":
+        for method, plan in DatabaseManager(args.db).explain_queries().items():
+            print(f"{method}:")
+            for step in plan:
+                print(f"    {step}")
+    else:
+        run_demo(args.db)
@@ -0,0 +1,100 @@
+import csv
+import json
+import sys
+import logging
+from contextlib import contextmanager
+from typing import Iterable, Dict, Any, Optional, TextIO
+
+from database import DatabaseManager, STUDENT_COLUMNS, DEFAULT_FETCH_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+
+
+@contextmanager
+def open_output(path: Optional[str]):
+    """Open path for writing, or use stdout when path is None or '-'"""
+    if path in (None, "-"):
+        yield sys.stdout
+        sys.stdout.flush()
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            yield f
+
+
+def write_csv(records: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    """Write records as CSV with a header row; returns the row count"""
+    writer = csv.DictWriter(out, fieldnames=STUDENT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    """Write records as JSON Lines; returns the row count"""
+    count = 0
+    for record in records:
+        # dict(): database rows are tuple-based records, which json would
+        # otherwise write as arrays
+        out.write(json.dumps(dict(record), ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def export_students(records: Iterable[Dict[str, Any]], path: Optional[str] = None,
+                    file_format: str = "csv") -> int:
+    """
+    Stream records to a CSV/JSONL file or stdout.
+
+    Pass one of the DatabaseManager.iter_* generators as records to export
+    with constant memory regardless of roster size.
+    """
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format {file_format!r}; use one of {SUPPORTED_FORMATS}")
+    writer = write_csv if file_format == "csv" else write_jsonl
+    with open_output(path) as out:
+        count = writer(records, out)
+    logger.info("Exported %d students to %s", count, path or "stdout")
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export students to CSV or JSONL")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, default="csv")
+    parser.add_argument("--db", default="student_management.db", help="Database file")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_FETCH_BATCH_SIZE,
+                        help="Rows fetched per round-trip")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--search", help="Only students matching name/email/course")
+    group.add_argument("--course", help="Only students in this course")
+    group.add_argument("--grade", help="Only students with this grade")
+    group.add_argument("--attendance-below", type=float,
+                       help="Only students with attendance below this percentage")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    if args.search is not None:
+        records = db.iter_search_students(args.search, args.batch_size)
+    elif args.course is not None:
+        records = db.iter_filter_by_course(args.course, args.batch_size)
+    elif args.grade is not None:
+        records = db.iter_filter_by_grade(args.grade, args.batch_size)
+    elif args.attendance_below is not None:
+        records = db.iter_filter_by_attendance(args.attendance_below, args.batch_size)
+    else:
+        records = db.iter_students(args.batch_size)
+
+    try:
+        export_students(records, args.output, args.format)
+    except BrokenPipeError:
+        # Downstream reader (e.g. `head`) closed the pipe early
+        sys.stderr.close()
+        sys.exit(0)
@@ -1,38 +1,108 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from database import DatabaseManager
-from utils import validate_email, validate_phone, validate_attendance, sanitize_input, generate_student_id
+from concurrent.futures import ThreadPoolExecutor
+from database import DatabaseManager, DEFAULT_SORT, AT_RISK_THRESHOLD
+from models import Student, StudentValidationError
+from table_model import StudentTableModel
+from utils import sanitize_input
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import logging
+import queue
+import time
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Background table loading: rows fetched per batch by the worker thread, and
+# how often (ms) the Tk main loop checks for new batches
+LOAD_BATCH_SIZE = 500
+LOAD_POLL_MS = 15
+
+# How often (ms) to check whether another connection has changed the data
+WATCH_POLL_MS = 2000
+
+# Virtual table mode: roster size above which it is used by default, rows
+# per Treeview line, extra rows fetched on either side of the visible window,
+# and rows moved per mouse-wheel notch. Full-table mode reloads every row on
+# each sort, which is only quick for rosters up to about this size.
+VIRTUAL_TABLE_THRESHOLD = 20_000
+ROW_HEIGHT = 25
+PREFETCH_ROWS = 50
+WHEEL_ROWS = 3
+
+# Table headings and the student columns they sort by. Clicking a heading
+# makes it the primary sort key (or flips its direction if it already is);
+# the previous keys are kept as tie-breaks, up to MAX_SORT_KEYS in total.
+COLUMN_KEYS = {
+    "ID": "student_id",
+    "Name": "full_name",
+    "Course": "course",
+    "Email": "email",
+    "Phone": "phone",
+    "Attendance": "attendance_percent",
+    "Grade": "grade",
+}
+MAX_SORT_KEYS = 3
+
 class StudentManagementGUI:
-    def __init__(self):
-        self.db = DatabaseManager()
+    def __init__(self, virtual_table: Optional[bool] = None):
+        """
+        Args:
+            virtual_table: Keep only the visible rows in the Treeview and
+                fetch pages from the database while scrolling, instead of
+                loading every student into the widget. None (the default)
+                uses it for rosters over VIRTUAL_TABLE_THRESHOLD students.
+        """
+        # Shared: launched from the CLI menu, it reuses the menu's connections
+        self.db = DatabaseManager(shared=True)
+        if virtual_table is None:
+            virtual_table = self.db.count_students() > VIRTUAL_TABLE_THRESHOLD
+        self.virtual_table = virtual_table
+        self.model = StudentTableModel(self.db) if virtual_table else None
+        self._top = 0
+        self._visible_rows = 0
+        self._selected_id = None
+        # Full-table mode: values shown per student_id (the Treeview iid), so
+        # refreshes can diff against them without reading the widget back
+        self._row_values: Dict[str, tuple] = {}
+        self._loading = False
+        self._refreshing = False
+        # Virtual mode: values last written to each pooled Treeview item
+        self._rendered: Dict[str, tuple] = {}
+        # data_version when the shown rows were read (see _watch_database)
+        self._data_version = None
+        self._sort = tuple(DEFAULT_SORT)
+        # Filters of the shown rows, as keyword arguments of StudentQuery.where
+        self._filters: Dict[str, Any] = {}
+        # A single long-lived worker keeps one pooled connection for loads
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gui-loader")
+        self._load_generation = 0
         self.root = tk.Tk()
         self.root.title("Student Management System")
         self.root.geometry("1200x700")
         
         # Configure style
         style = ttk.Style()
-        style.configure("Treeview", rowheight=25, font=('Arial', 10))
+        style.configure("Treeview", rowheight=ROW_HEIGHT, font=('Arial', 10))
         style.configure("Treeview.Heading", font=('Arial', 10, 'bold'))
         
         self.setup_gui()
         self.load_students()
+        self.root.after(WATCH_POLL_MS, self._watch_database)
 
     def setup_gui(self):
         """Set up the main GUI layout"""
         # Create main frames
         self.form_frame = ttk.LabelFrame(self.root, text="Student Information", padding="10")
         self.form_frame.pack(fill="x", padx=10, pady=5)
+
+        self.filter_frame = ttk.LabelFrame(self.root, text="Filter", padding="10")
+        self.filter_frame.pack(fill="x", padx=10, pady=5)
         
         self.table_frame = ttk.LabelFrame(self.root, text="Student List", padding="10")
         self.table_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
         self.setup_form()
+        self.setup_filters()
         self.setup_table()
 
     def setup_form(self):
@@ -65,10 +135,76 @@ class StudentManagementGUI:
         ttk.Button(btn_frame, text="Add Student", command=self.add_student).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Clear Form", command=self.clear_form).pack(side="left", padx=5)
 
+    def setup_filters(self):
+        """Set up the filter bar; all filters are combined into one database query"""
+        frame = self.filter_frame
+        ttk.Label(frame, text="Search:").pack(side="left", padx=(0, 5))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(frame, textvariable=self.search_var, width=25)
+        search_entry.pack(side="left", padx=5)
+        search_entry.bind("<Return>", lambda e: self.apply_filters())
+
+        ttk.Label(frame, text="Course:").pack(side="left", padx=(10, 5))
+        self.course_var = tk.StringVar()
+        self.course_box = ttk.Combobox(frame, textvariable=self.course_var, width=25,
+                                       state="readonly", postcommand=self._load_filter_courses)
+        self.course_box.pack(side="left", padx=5)
+
+        ttk.Label(frame, text="Grades:").pack(side="left", padx=(10, 5))
+        self.grade_vars = {grade: tk.BooleanVar() for grade in ("A", "B", "C", "D", "F", "N/A")}
+        for grade, var in self.grade_vars.items():
+            ttk.Checkbutton(frame, text=grade, variable=var).pack(side="left")
+
+        ttk.Label(frame, text="Attendance below (%):").pack(side="left", padx=(10, 5))
+        self.attendance_var = tk.StringVar()
+        attendance_entry = ttk.Entry(frame, textvariable=self.attendance_var, width=6)
+        attendance_entry.pack(side="left", padx=5)
+        attendance_entry.bind("<Return>", lambda e: self.apply_filters())
+
+        ttk.Button(frame, text="Apply", command=self.apply_filters).pack(side="left", padx=5)
+        ttk.Button(frame, text="Clear", command=self.clear_filters).pack(side="left", padx=5)
+
+    def _load_filter_courses(self):
+        """Fill the course list when it is opened, so new courses appear"""
+        self.course_box.configure(values=[""] + self.db.get_unique_courses())
+
+    def apply_filters(self):
+        """Show only the students matching every filter in the filter bar"""
+        filters = {}
+        search = sanitize_input(self.search_var.get())
+        if search:
+            filters["search"] = search
+        if self.course_var.get():
+            filters["course"] = self.course_var.get()
+        grades = tuple(grade for grade, var in self.grade_vars.items() if var.get())
+        if grades:
+            filters["grade"] = grades
+        below = self.attendance_var.get().strip()
+        if below:
+            try:
+                filters["attendance_below"] = float(below)
+            except ValueError:
+                messagebox.showerror("Error", "Attendance must be a number")
+                return
+        self._filters = filters
+        if self.virtual_table:
+            self.model.set_filters(**filters)
+            self._top = 0
+        self.load_students()
+
+    def clear_filters(self):
+        """Reset the filter bar and show every student"""
+        self.search_var.set("")
+        self.course_var.set("")
+        for var in self.grade_vars.values():
+            var.set(False)
+        self.attendance_var.set("")
+        self.apply_filters()
+
     def setup_table(self):
         """Set up the student table"""
         # Create Treeview
-        columns = ("ID", "Name", "Course", "Email", "Phone", "Attendance", "Grade")
+        columns = tuple(COLUMN_KEYS)
         self.tree = ttk.Treeview(self.table_frame, columns=columns, show="headings")
         
         # Configure columns
@@ -76,11 +212,19 @@ class StudentManagementGUI:
             self.tree.heading(col, text=col, command=lambda c=col: self.sort_treeview(c))
             width = 150 if col in ("Name", "Course", "Email") else 100
             self.tree.column(col, width=width, anchor="w")
+        self._update_headings()
         
         # Add scrollbars
-        y_scroll = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.tree.yview)
+        if self.virtual_table:
+            # The scrollbar tracks the position in the whole table, not the widget
+            y_scroll = ttk.Scrollbar(self.table_frame, orient="vertical", command=self._on_virtual_scroll)
+            self._bind_virtual_table()
+        else:
+            y_scroll = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.tree.yview)
+            self.tree.configure(yscrollcommand=y_scroll.set)
         x_scroll = ttk.Scrollbar(self.table_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        self.tree.configure(xscrollcommand=x_scroll.set)
+        self.y_scroll = y_scroll
         
         # Pack everything
         y_scroll.pack(side="right", fill="y")
@@ -93,65 +237,47 @@ class StudentManagementGUI:
         
         ttk.Button(btn_frame, text="Edit Selected", command=self.edit_selected).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Delete Selected", command=self.delete_selected).pack(side="left", padx=5)
-        ttk.Button(btn_frame, text="Refresh", command=self.load_students).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Refresh", command=self.refresh_changes).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Statistics", command=self.show_statistics).pack(side="left", padx=5)
+        
+        # Load progress
+        self.status_var = tk.StringVar()
+        ttk.Label(btn_frame, textvariable=self.status_var).pack(side="right", padx=5)
+        self.progress = ttk.Progressbar(btn_frame, length=200, mode="determinate")
+        self.progress.pack(side="right", padx=5)
 
     def add_student(self):
         """Add a new student from form data"""
         try:
-            # Gather and validate form data
+            # Gather form data
             first_name = sanitize_input(self.entries["first_name"].get())
             last_name = sanitize_input(self.entries["last_name"].get())
-            full_name = f"{first_name} {last_name}"
-            email = self.entries["email"].get().strip()
-            phone = self.entries["phone"].get().strip()
-            course = sanitize_input(self.entries["course"].get())
-            attendance = self.entries["attendance"].get().strip()
-            grade = self.entries["grade"].get().upper().strip()
-            
-            # Validate inputs
-            if not all([first_name, last_name, email, course]):
+            if not all([first_name, last_name]):
                 messagebox.showerror("Error", "Please fill in all required fields")
                 return
-                
-            if not validate_email(email):
-                messagebox.showerror("Error", "Invalid email format")
-                return
-                
-            if phone and not validate_phone(phone):
-                messagebox.showerror("Error", "Invalid phone format")
-                return
-                
+
+            # Validate and normalize every field at once
             try:
-                attendance = float(attendance)
-                if not validate_attendance(attendance):
-                    raise ValueError
-            except ValueError:
-                messagebox.showerror("Error", "Attendance must be a number between 0 and 100")
+                student = Student.validate({
+                    "full_name": f"{first_name} {last_name}",
+                    "course": self.entries["course"].get(),
+                    "email": self.entries["email"].get(),
+                    "phone": self.entries["phone"].get(),
+                    "attendance_percent": self.entries["attendance"].get(),
+                    "grade": self.entries["grade"].get()
+                })
+            except StudentValidationError as e:
+                messagebox.showerror("Error", f"Invalid input - {e}")
                 return
-                
-            if grade and grade not in ['A', 'B', 'C', 'D', 'F']:
-                messagebox.showerror("Error", "Invalid grade")
-                return
-            
-            # Create student data
-            student_data = {
-                "full_name": full_name,
-                "student_id": generate_student_id(),
-                "course": course,
-                "email": email,
-                "phone": phone,
-                "attendance_percent": attendance,
-                "grade": grade or 'N/A'
-            }
-            
-            # Add to database
-            self.db.add_student(student_data)
+
+            # Add to database (allocates the student ID)
+            self.db.add_student(student)
             messagebox.showinfo("Success", "Student added successfully!")
             self.clear_form()
-            self.load_students()
+            self.refresh_student(student.student_id)
             
         except Exception as e:
-            logger.error(f"Error adding student: {str(e)}")
+            logger.error("Error adding student: %s", e)
             messagebox.showerror("Error", f"Failed to add student: {str(e)}")
 
     def edit_selected(self):
@@ -162,7 +288,7 @@ class StudentManagementGUI:
             return
             
         # Get student data
-        student_id = self.tree.item(selected[0])["values"][0]
+        student_id = str(self.tree.set(selected[0], "ID"))
         student = self.db.get_student(student_id)
         
         if student:
@@ -191,43 +317,23 @@ class StudentManagementGUI:
             
             def save_changes():
                 try:
-                    # Gather and validate data
-                    update_data = {
-                        "full_name": sanitize_input(entries["full_name"].get()),
-                        "course": sanitize_input(entries["course"].get()),
-                        "email": entries["email"].get().strip(),
-                        "phone": entries["phone"].get().strip(),
-                        "attendance_percent": float(entries["attendance_percent"].get()),
-                        "grade": entries["grade"].get().upper().strip()
-                    }
-                    
-                    # Validate inputs
-                    if not validate_email(update_data["email"]):
-                        messagebox.showerror("Error", "Invalid email format")
-                        return
-                        
-                    if update_data["phone"] and not validate_phone(update_data["phone"]):
-                        messagebox.showerror("Error", "Invalid phone format")
-                        return
-                        
-                    if not validate_attendance(update_data["attendance_percent"]):
-                        messagebox.showerror("Error", "Attendance must be between 0 and 100")
-                        return
-                        
-                    if update_data["grade"] not in ['A', 'B', 'C', 'D', 'F', 'N/A']:
-                        messagebox.showerror("Error", "Invalid grade")
+                    # update_student validates and normalizes the fields
+                    update_data = {field: entry.get() for field, entry in entries.items()}
+                    try:
+                        updated = self.db.update_student(student_id, update_data)
+                    except StudentValidationError as e:
+                        messagebox.showerror("Error", f"Invalid input - {e}")
                         return
-                    
-                    # Update database
-                    if self.db.update_student(student_id, update_data):
+
+                    if updated:
                         messagebox.showinfo("Success", "Student updated successfully!")
                         edit_window.destroy()
-                        self.load_students()
+                        self.refresh_student(student_id)
                     else:
                         messagebox.showerror("Error", "Failed to update student")
                         
                 except Exception as e:
-                    logger.error(f"Error updating student: {str(e)}")
+                    logger.error("Error updating student: %s", e)
                     messagebox.showerror("Error", f"Failed to update student: {str(e)}")
             
             # Add save button
@@ -241,31 +347,376 @@ class StudentManagementGUI:
             return
             
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this student?"):
-            student_id = self.tree.item(selected[0])["values"][0]
+            student_id = str(self.tree.set(selected[0], "ID"))
             if self.db.delete_student(student_id):
                 messagebox.showinfo("Success", "Student deleted successfully!")
-                self.load_students()
+                self.refresh_student(student_id)
             else:
                 messagebox.showerror("Error", "Failed to delete student")
 
     def load_students(self):
-        """Load all students into the table"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        # Load students
-        students = self.db.get_all_students()
-        for student in students:
-            self.tree.insert("", "end", values=(
-                student["student_id"],
-                student["full_name"],
-                student["course"],
-                student["email"],
-                student["phone"],
-                f"{student['attendance_percent']}%",
-                student["grade"]
-            ))
+        """
+        Reload the table without blocking the window.
+
+        In virtual mode this only drops the cached pages and redraws the
+        visible rows. Otherwise:
+        The query runs on a worker thread that streams rows into a queue;
+        the Tk main loop inserts them one batch per tick. Starting a new
+        load cancels any load still in progress.
+        """
+        self._data_version = self.db.data_version()
+        if self.virtual_table:
+            self.model.invalidate()
+            self._render_virtual()
+            self.status_var.set(f"{len(self.model):,} students")
+            return
+
+        self._load_generation += 1
+        generation = self._load_generation
+        self.tree.delete(*self.tree.get_children())
+        self._row_values.clear()
+        self._loading = True
+        self.progress.configure(value=0, maximum=1)
+        self.status_var.set("Loading students...")
+
+        batches = queue.Queue()
+        started = time.perf_counter()
+        self._loader.submit(self._fetch_students, generation, batches, self._filters)
+        self.root.after(LOAD_POLL_MS, self._insert_batches, generation, batches, started, 0)
+
+    def _fetch_students(self, generation: int, batches: queue.Queue, filters: Dict[str, Any]):
+        """Worker thread: stream student rows into the queue (never touches Tk)"""
+        try:
+            batches.put(("total", self.db.count_students(**filters)))
+            students = self.db.iter_students_sorted(self._sort, LOAD_BATCH_SIZE, **filters)
+            try:
+                batch = []
+                for student in students:
+                    if generation != self._load_generation:
+                        return
+                    batch.append((student["student_id"], self._student_values(student)))
+                    if len(batch) >= LOAD_BATCH_SIZE:
+                        batches.put(("rows", batch))
+                        batch = []
+                if batch:
+                    batches.put(("rows", batch))
+            finally:
+                students.close()
+            batches.put(("done", None))
+        except Exception as e:
+            batches.put(("error", e))
+
+    def _insert_batches(self, generation: int, batches: queue.Queue, started: float, loaded: int):
+        """Main thread: insert the next queued batch and reschedule until done"""
+        if generation != self._load_generation:
+            return  # superseded by a newer load
+        try:
+            kind, payload = batches.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, self._insert_batches, generation, batches, started, loaded)
+            return
+
+        if kind == "total":
+            self.progress.configure(maximum=max(payload, 1))
+        elif kind == "rows":
+            for iid, values in payload:
+                self.tree.insert("", "end", iid=iid, values=values)
+                self._row_values[iid] = values
+            loaded += len(payload)
+            self.progress.configure(value=loaded)
+            self.status_var.set(f"Loading... {loaded:,} students")
+        elif kind == "done":
+            self._loading = False
+            elapsed = time.perf_counter() - started
+            self.status_var.set(f"{loaded:,} students")
+            logger.info("Loaded %d students in %.3fs", loaded, elapsed)
+            return
+        elif kind == "error":
+            self._loading = False
+            self.status_var.set("Failed to load students")
+            logger.error("Error loading students: %s", payload)
+            messagebox.showerror("Error", f"Failed to load students: {str(payload)}")
+            return
+        self.root.after(1, self._insert_batches, generation, batches, started, loaded)
+
+    def refresh_student(self, student_id: str):
+        """
+        Bring one student's row up to date after a change made in this window.
+
+        The row is updated in place, moved to its sorted position, inserted
+        or removed, so an edit costs a few widget operations however large
+        the table is. Selection and scroll position are left alone.
+        """
+        if self.virtual_table:
+            self.model.invalidate()
+            self._render_virtual()
+            self.status_var.set(f"{len(self.model):,} students")
+            return
+        if self._loading:
+            self.load_students()  # the running load may or may not include the change
+            return
+
+        student = self.db.get_student(student_id)
+        if student is not None and self._filters \
+                and not self.db.count_students(student_id=student_id, **self._filters):
+            student = None  # no longer matches the filters, so it leaves the table
+        if student is None:
+            if student_id in self._row_values:
+                self.tree.delete(student_id)
+                del self._row_values[student_id]
+        else:
+            position = self.db.student_position(student, self._sort, **self._filters)
+            self._apply_rows([(position, student_id, self._student_values(student))], ())
+        self.status_var.set(f"{len(self._row_values):,} students")
+
+    def refresh_changes(self):
+        """
+        Pick up changes made by other connections without rebuilding the table.
+
+        The current rows are read on the worker thread and compared with what
+        is shown; only added, changed and removed rows touch the widget.
+        """
+        if self._loading or self._refreshing:
+            return  # _watch_database checks again once the running read is done
+        self._data_version = self.db.data_version()
+        if self.virtual_table:
+            self.model.invalidate()
+            self._render_virtual()
+            self.status_var.set(f"{len(self.model):,} students")
+            return
+        self._refreshing = True
+        generation = self._load_generation
+        future = self._loader.submit(self._fetch_snapshot, self._filters)
+        self.root.after(LOAD_POLL_MS, self._apply_snapshot, generation, future)
+
+    def _fetch_snapshot(self, filters: Dict[str, Any]) -> List[Tuple[str, tuple]]:
+        """Worker thread: (student_id, values) for every shown row, in display order"""
+        return [(student["student_id"], self._student_values(student))
+                for student in self.db.iter_students_sorted(self._sort, LOAD_BATCH_SIZE,
+                                                             **filters)]
+
+    def _apply_snapshot(self, generation: int, future):
+        """Main thread: apply the difference between a snapshot and the table"""
+        if generation != self._load_generation or self._loading:
+            self._refreshing = False
+            return  # a full load started meanwhile
+        if not future.done():
+            self.root.after(LOAD_POLL_MS, self._apply_snapshot, generation, future)
+            return
+        self._refreshing = False
+        try:
+            snapshot = future.result()
+        except Exception as e:
+            logger.error("Error refreshing students: %s", e)
+            return
+
+        current = {iid for iid, _ in snapshot}
+        removed = [iid for iid in self._row_values if iid not in current]
+        changed = [(position, iid, values) for position, (iid, values) in enumerate(snapshot)
+                   if self._row_values.get(iid) != values]
+        if removed or changed:
+            self._apply_rows(changed, removed)
+            logger.info("Refreshed %d changed and %d removed students", len(changed), len(removed))
+        self.status_var.set(f"{len(self._row_values):,} students")
+
+    def _apply_rows(self, rows: List[Tuple[int, str, tuple]], removed: Iterable[str]):
+        """
+        Place (position, student_id, values) rows and delete removed ids.
+
+        Changed rows are detached first. Rows that did not change keep their
+        relative order, so placing the changed and new rows in ascending
+        position puts each one at exactly its final index.
+        """
+        selection = self.tree.selection()
+        removed = [iid for iid in removed if iid in self._row_values]
+        if removed:
+            self.tree.delete(*removed)
+            for iid in removed:
+                del self._row_values[iid]
+        moved = [iid for _, iid, _ in rows if iid in self._row_values]
+        if moved:
+            self.tree.detach(*moved)
+        for position, iid, values in sorted(rows):
+            if iid in self._row_values:
+                self.tree.item(iid, values=values)
+                self.tree.move(iid, "", position)
+            else:
+                self.tree.insert("", position, iid=iid, values=values)
+            self._row_values[iid] = values
+        kept = tuple(iid for iid in selection if iid in self._row_values)
+        if moved and kept:
+            self.tree.selection_set(kept)
+
+    def _watch_database(self):
+        """
+        Poll SQLite's data_version and refresh when another connection commits.
+
+        Loads and refreshes record the version when they start reading, and
+        it is only compared while none is running, so a commit made during
+        a read is still picked up once that read has finished.
+        """
+        try:
+            if not (self._loading or self._refreshing) \
+                    and self.db.data_version() != self._data_version:
+                self.refresh_changes()
+        except Exception as e:
+            logger.error("Error checking for changes: %s", e)
+        self.root.after(WATCH_POLL_MS, self._watch_database)
+
+    @staticmethod
+    def _student_values(student: Dict[str, Any]) -> tuple:
+        """Treeview values for a student row"""
+        return (
+            student["student_id"],
+            student["full_name"],
+            student["course"],
+            student["email"],
+            student["phone"],
+            f"{student['attendance_percent']}%",
+            student["grade"]
+        )
+
+    def _bind_virtual_table(self):
+        """Route scrolling and keyboard navigation through the paged model"""
+        self.tree.bind("<Configure>", self._on_virtual_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_virtual_select)
+        self.tree.bind("<MouseWheel>", self._on_virtual_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_virtual(-WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_virtual(WHEEL_ROWS))
+        self.tree.bind("<Up>", lambda e: self._move_virtual_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_virtual_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_virtual_selection(-self._visible_rows))
+        self.tree.bind("<Next>", lambda e: self._move_virtual_selection(self._visible_rows))
+        self.tree.bind("<Home>", lambda e: self._scroll_virtual(-len(self.model)))
+        self.tree.bind("<End>", lambda e: self._scroll_virtual(len(self.model)))
+
+    def _render_virtual(self):
+        """
+        Show rows [top, top + visible) of the model.
+
+        The widget holds a fixed pool of items, one per visible line, and
+        scrolling rewrites their values, so widget memory does not grow
+        with the table.
+        """
+        total = len(self.model)
+        self._top = max(0, min(self._top, total - self._visible_rows))
+        rows = self.model.rows(self._top, self._top + self._visible_rows)
+
+        items = list(self.tree.get_children())
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+            for item in items[len(rows):]:
+                self._rendered.pop(item, None)
+            items = items[:len(rows)]
+        while len(items) < len(rows):
+            items.append(self.tree.insert("", "end"))
+
+        selected = None
+        for item, student in zip(items, rows):
+            values = self._student_values(student)
+            if self._rendered.get(item) != values:  # only rewrite lines that changed
+                self.tree.item(item, values=values)
+                self._rendered[item] = values
+            if student["student_id"] == self._selected_id:
+                selected = item
+        self.tree.selection_set((selected,) if selected else ())
+
+        if total:
+            self.y_scroll.set(self._top / total, (self._top + len(rows)) / total)
+        else:
+            self.y_scroll.set(0, 1)
+
+        # Warm the pages just outside the window so the next scroll is a cache hit
+        self.model.prefetch(self._top - PREFETCH_ROWS, self._top)
+        self.model.prefetch(self._top + len(rows), self._top + len(rows) + PREFETCH_ROWS)
+
+    def _scroll_virtual(self, rows: int):
+        self._top += rows
+        self._render_virtual()
+        return "break"
+
+    def _on_virtual_scroll(self, action: str, amount: str, unit: str = None):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, units|pages)"""
+        if action == "moveto":
+            self._top = int(float(amount) * len(self.model))
+            self._render_virtual()
+        elif action == "scroll":
+            step = self._visible_rows if unit == "pages" else 1
+            self._scroll_virtual(int(amount) * step)
+
+    def _on_virtual_wheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        notches = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_virtual(-notches * WHEEL_ROWS)
+
+    def _on_virtual_resize(self, event):
+        visible = max(1, event.height // ROW_HEIGHT - 1)  # minus the heading
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            self._render_virtual()
+
+    def _on_virtual_select(self, event):
+        """Remember the selected student so the selection follows the data"""
+        selected = self.tree.selection()
+        if selected:
+            self._selected_id = str(self.tree.set(selected[0], "ID"))
+
+    def _move_virtual_selection(self, rows: int):
+        """Move the selection by rows, scrolling when it leaves the window"""
+        items = self.tree.get_children()
+        selected = self.tree.selection()
+        position = items.index(selected[0]) if selected else 0
+        target = self._top + position + rows
+        target = max(0, min(target, len(self.model) - 1))
+        if target < self._top:
+            self._top = target
+        elif target >= self._top + self._visible_rows:
+            self._top = target - self._visible_rows + 1
+        row = self.model.rows(target, target + 1)
+        if row:
+            self._selected_id = row[0]["student_id"]
+        self._render_virtual()
+        return "break"
+
+    def show_statistics(self):
+        """Open a window with per-course grade and attendance statistics"""
+        try:
+            courses = self.db.get_course_statistics()
+            overall = self.db.get_overall_statistics()
+        except Exception as e:
+            logger.error("Error computing statistics: %s", e)
+            messagebox.showerror("Error", f"Failed to compute statistics: {str(e)}")
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Course Statistics")
+        window.geometry("900x400")
+
+        grades = ("A", "B", "C", "D", "F", "N/A")
+        columns = ("Course", "Students", "Mean", "Median", "P25", "P75", "P90", "At risk") + grades
+        tree = ttk.Treeview(window, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=160 if col == "Course" else 60,
+                        anchor="w" if col == "Course" else "e")
+
+        def figure(value):
+            return f"{value:.1f}" if value is not None else "-"
+
+        for stats in courses + [overall]:
+            tree.insert("", "end", values=(
+                stats.course if stats.course is not None else "All courses",
+                stats.students,
+                figure(stats.attendance_mean),
+                figure(stats.attendance_median),
+                figure(stats.attendance_percentiles.get(25)),
+                figure(stats.attendance_percentiles.get(75)),
+                figure(stats.attendance_percentiles.get(90)),
+                stats.at_risk,
+            ) + tuple(stats.grades.get(g, 0) for g in grades))
+        tree.pack(fill="both", expand=True, padx=10, pady=5)
+        ttk.Label(window, text=f"Attendance in %; at risk means attendance below "
+                               f"{AT_RISK_THRESHOLD:g}%.").pack(pady=5)
 
     def clear_form(self):
         """Clear all form fields"""
@@ -273,17 +724,53 @@ class StudentManagementGUI:
             entry.delete(0, tk.END)
 
     def sort_treeview(self, col):
-        """Sort treeview by column"""
-        items = [(self.tree.set(item, col), item) for item in self.tree.get_children("")]
-        items.sort()
-        
-        for index, (_, item) in enumerate(items):
-            self.tree.move(item, "", index)
+        """
+        Sort the table by a column heading.
+
+        The ordering is done by the database (typed, so attendance sorts
+        numerically) using the column indexes. In virtual mode only the
+        visible rows are redrawn. In full-table mode every row is reloaded
+        in the new order, which grows with the roster; that is why large
+        rosters open in virtual mode.
+        """
+        key = COLUMN_KEYS[col]
+        primary, descending = self._sort[0]
+        if key == primary:
+            self._sort = ((key, not descending),) + self._sort[1:]
+        else:
+            tie_breaks = tuple((c, d) for c, d in self._sort if c != key)
+            self._sort = ((key, False),) + tie_breaks[:MAX_SORT_KEYS - 1]
+        self._update_headings()
+
+        if self.virtual_table:
+            self.model.set_sort(self._sort)
+            self._top = 0
+        self.load_students()
+
+    def _update_headings(self):
+        """Mark the primary sort column with an arrow"""
+        primary, descending = self._sort[0]
+        for col, key in COLUMN_KEYS.items():
+            arrow = (" \u25bc" if descending else " \u25b2") if key == primary else ""
+            self.tree.heading(col, text=col + arrow)
 
     def run(self):
-        """Start the GUI application"""
-        self.root.mainloop()
+        """Start the GUI application; the database is closed when the window is"""
+        try:
+            self.root.mainloop()
+        finally:
+            # Stop any running load and close the worker thread's pooled
+            # connection from that thread (the pool may be shared, so
+            # db.close() alone would leave it open), then release this
+            # window's share of the pool
+            self._load_generation += 1
+            if self.db.pool is not None:
+                self._loader.submit(self.db.pool.close_thread_connection)
+            self._loader.shutdown(wait=True)
+            self.db.close()
 
 if __name__ == "__main__":
-    app = StudentManagementGUI()
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    app = StudentManagementGUI(virtual_table=True if "--virtual" in sys.argv[1:] else None)
     app.run() 
\ No newline at end of file
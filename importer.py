@@ -0,0 +1,141 @@
+import csv
+import json
+import os
+import sys
+import logging
+from typing import Iterable, Iterator, Dict, Any, Optional, Tuple
+
+from database import (
+    DatabaseManager, AttendanceResult, BulkImportResult, RejectedRow, DEFAULT_BULK_CHUNK_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+# Spellings of the "present" column read as present; anything else is absent
+PRESENT_VALUES = frozenset(("1", "true", "yes", "y", "present", "p"))
+
+
+def detect_format(path: str) -> str:
+    """Guess the file format from its extension"""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson"):
+        return "jsonl"
+    if ext == "csv":
+        return "csv"
+    raise ValueError(f"Cannot detect format of {path!r}; use one of {SUPPORTED_FORMATS}")
+
+
+def iter_csv_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream student records from a CSV file with a header row.
+
+    Column names must match the students table (full_name, student_id,
+    course, email, phone, attendance_percent, grade). Rows are yielded one
+    at a time, so the file is never held in memory.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield {key.strip(): value.strip() if isinstance(value, str) else value
+                   for key, value in row.items() if key}
+
+
+def iter_jsonl_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream student records from a JSON Lines file (one object per line).
+    A malformed line is yielded as a RejectedRow naming the line, so it is
+    reported as a failed row rather than dropped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield RejectedRow(f"line {line_number}: malformed JSON: {e}")
+
+
+def iter_records(path: str, file_format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream records from a CSV or JSONL file"""
+    file_format = file_format or detect_format(path)
+    if file_format == "csv":
+        return iter_csv_records(path)
+    if file_format == "jsonl":
+        return iter_jsonl_records(path)
+    raise ValueError(f"Unsupported format {file_format!r}; use one of {SUPPORTED_FORMATS}")
+
+
+def import_file(db: DatabaseManager, path: str, file_format: Optional[str] = None,
+                chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                validate: bool = False) -> BulkImportResult:
+    """
+    Stream a CSV/JSONL file into the database via add_students_bulk.
+
+    With validate=True rows are checked and normalized (email, phone,
+    attendance, grade, sanitized text) before insertion.
+    """
+    return db.add_students_bulk(iter_records(path, file_format), chunk_size=chunk_size,
+                                validate=validate)
+
+
+def iter_attendance_marks(records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, str, bool]]:
+    """
+    Turn records with student_id, session and present fields into marks
+    for record_attendance. Records missing a student_id or session are
+    logged and skipped.
+    """
+    for index, record in enumerate(records, 1):
+        if isinstance(record, RejectedRow):
+            logger.error("Skipping attendance record %d: %s", index, record.reason)
+            continue
+        student_id = str(record.get("student_id") or "").strip()
+        session = str(record.get("session") or "").strip()
+        if not student_id or not session:
+            logger.error("Skipping attendance record %d: student_id and session are required",
+                         index)
+            continue
+        present = record.get("present")
+        if not isinstance(present, bool):
+            present = str(present).strip().lower() in PRESENT_VALUES
+        yield student_id, session, present
+
+
+def import_attendance(db: DatabaseManager, path: str, file_format: Optional[str] = None,
+                      chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> AttendanceResult:
+    """Stream a CSV/JSONL file of attendance marks into the log via record_attendance"""
+    return db.record_attendance(iter_attendance_marks(iter_records(path, file_format)),
+                                chunk_size=chunk_size)
+
+
+if __name__ == "__main__":
+    import argparse
+    from cli import positive_int
+
+    parser = argparse.ArgumentParser(description="Bulk import students from CSV or JSONL")
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, help="Override format detection")
+    parser.add_argument("--db", default="student_management.db", help="Database file")
+    parser.add_argument("--chunk-size", type=positive_int, default=DEFAULT_BULK_CHUNK_SIZE,
+                        help="Rows per transaction")
+    parser.add_argument("--validate", action="store_true",
+                        help="Validate and normalize rows before inserting")
+    parser.add_argument("--attendance", action="store_true",
+                        help="Import attendance marks (student_id, session, present) instead")
+    args = parser.parse_args()
+
+    if args.attendance:
+        attendance = import_attendance(DatabaseManager(args.db), args.path, args.format,
+                                       args.chunk_size)
+        print(attendance.summary())
+        sys.exit(0)
+
+    result = import_file(DatabaseManager(args.db), args.path, args.format, args.chunk_size,
+                         validate=args.validate)
+    print(result.summary())
+    for index, student_id, error in result.failed[:20]:
+        print(f"  row {index} ({student_id}): {error}")
+    if len(result.failed) > 20:
+        print(f"  ... and {len(result.failed) - 20} more")
+    sys.exit(1 if result.failed else 0)
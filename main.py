@@ -1,23 +1,31 @@
-from database import DatabaseManager
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Subcommands (python main.py get ..., list, export, ...) run
+    # non-interactively, so hand over before importing the menu's modules
+    from cli import main
+    sys.exit(main())
+
+from database import DatabaseManager, Page, AT_RISK_THRESHOLD
+from models import Student, StudentValidationError
+from query import StudentQuery
 from utils import (
-    validate_email, validate_phone, validate_student_id,
-    format_phone_number, sanitize_input, generate_student_id,
+    validate_student_id, sanitize_input,
     format_name, log_error, log_info
 )
-import sys
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Rows shown per page in CLI listings
+CLI_PAGE_SIZE = 20
+
 class StudentManagementSystem:
     def __init__(self):
-        self.db = DatabaseManager()
+        # Instrumented so the session's query metrics can be shown (option 9);
+        # shared so the GUI (option 8) reuses its connections and schema check
+        self.db = DatabaseManager(instrument=True, shared=True)
 
     def add_student(self):
         """Add a new student"""
@@ -27,52 +35,44 @@ class StudentManagementSystem:
             last_name = sanitize_input(input("Enter last name: "))
             full_name = format_name(first_name, last_name)
             
-            student_id = generate_student_id()
             course = sanitize_input(input("Enter course: "))
             
-            while True:
-                email = input("Enter email: ")
-                if validate_email(email):
-                    break
-                print("Invalid email format. Please try again.")
-            
-            while True:
-                phone = input("Enter phone number: ")
-                if validate_phone(phone):
-                    phone = format_phone_number(phone)
-                    break
-                print("Invalid phone format. Please try again.")
-            
-            while True:
-                try:
-                    attendance = float(input("Enter attendance percentage (0-100): "))
-                    if 0 <= attendance <= 100:
-                        break
-                    print("Attendance must be between 0 and 100.")
-                except ValueError:
-                    print("Please enter a valid number.")
-            
-            grade = input("Enter grade (A/B/C/D/F): ").upper()
-            if grade not in ['A', 'B', 'C', 'D', 'F']:
+            email = self._prompt_field("email", "Enter email: ")
+            phone = self._prompt_field("phone", "Enter phone number: ")
+            attendance = self._prompt_field("attendance_percent",
+                                            "Enter attendance percentage (0-100): ")
+
+            try:
+                grade = Student.validate_field("grade", input("Enter grade (A/B/C/D/F): "))
+            except StudentValidationError:
                 grade = 'N/A'
 
-            student_data = {
+            student = Student.validate({
                 "full_name": full_name,
-                "student_id": student_id,
                 "course": course,
                 "email": email,
                 "phone": phone,
                 "attendance_percent": attendance,
                 "grade": grade
-            }
+            })
+            self.db.add_student(student)
+            print(f"\nStudent added successfully! Student ID: {student.student_id}")
 
-            self.db.add_student(student_data)
-            print(f"\nStudent added successfully! Student ID: {student_id}")
-            
+        except StudentValidationError as e:
+            print(f"\nInvalid input - {e}")
         except Exception as e:
             log_error(f"Error adding student: {str(e)}")
             print("\nFailed to add student. Please try again.")
 
+    @staticmethod
+    def _prompt_field(field: str, prompt: str) -> Any:
+        """Prompt until the value passes the student model's validation"""
+        while True:
+            try:
+                return Student.validate_field(field, input(prompt))
+            except StudentValidationError as e:
+                print(f"Invalid input - {e}. Please try again.")
+
     def view_student(self):
         """View a student's details"""
         try:
@@ -99,24 +99,9 @@ class StudentManagementSystem:
             print("\nFailed to retrieve student details.")
 
     def list_all_students(self):
-        """List all students"""
+        """List all students, one page at a time"""
         try:
-            students = self.db.get_all_students()
-            if not students:
-                print("\nNo students found in the database.")
-                return
-
-            print("\n=== All Students ===")
-            print(f"{'Name':<30} {'ID':<10} {'Course':<20} {'Grade':<5}")
-            print("-" * 65)
-            for student in students:
-                print(
-                    f"{student['full_name']:<30} "
-                    f"{student['student_id']:<10} "
-                    f"{student['course']:<20} "
-                    f"{student['grade']:<5}"
-                )
-                
+            self._page_through(self.db.get_students_page, "All Students")
         except Exception as e:
             log_error(f"Error listing students: {str(e)}")
             print("\nFailed to retrieve student list.")
@@ -137,27 +122,18 @@ class StudentManagementSystem:
             print("\n=== Update Student ===")
             print("Press Enter to keep current values")
             
-            update_data = {}
-            
-            new_name = input(f"Current name: {student['full_name']}\nNew name (Enter to skip): ")
-            if new_name:
-                update_data['full_name'] = sanitize_input(new_name)
-
-            new_course = input(f"Current course: {student['course']}\nNew course (Enter to skip): ")
-            if new_course:
-                update_data['course'] = sanitize_input(new_course)
-
-            new_email = input(f"Current email: {student['email']}\nNew email (Enter to skip): ")
-            if new_email and validate_email(new_email):
-                update_data['email'] = new_email
-
-            new_phone = input(f"Current phone: {student['phone']}\nNew phone (Enter to skip): ")
-            if new_phone and validate_phone(new_phone):
-                update_data['phone'] = format_phone_number(new_phone)
-
-            new_grade = input(f"Current grade: {student['grade']}\nNew grade (Enter to skip): ").upper()
-            if new_grade in ['A', 'B', 'C', 'D', 'F']:
-                update_data['grade'] = new_grade
+            update_data = {
+                'full_name': input(f"Current name: {student['full_name']}\nNew name (Enter to skip): "),
+                'course': input(f"Current course: {student['course']}\nNew course (Enter to skip): "),
+                'email': input(f"Current email: {student['email']}\nNew email (Enter to skip): "),
+                'phone': input(f"Current phone: {student['phone']}\nNew phone (Enter to skip): "),
+                'grade': input(f"Current grade: {student['grade']}\nNew grade (Enter to skip): "),
+            }
+            try:
+                update_data = Student.validate_changes(update_data)
+            except StudentValidationError as e:
+                print(f"\nInvalid input - {e}")
+                return
 
             if update_data:
                 if self.db.update_student(student_id, update_data):
@@ -200,9 +176,10 @@ class StudentManagementSystem:
             print("2. Filter by course")
             print("3. Filter by attendance < 75%")
             print("4. Filter by grade")
-            print("5. Back to main menu")
+            print("5. Combined filter (course, grades, attendance, search)")
+            print("6. Back to main menu")
             
-            choice = input("\nEnter your choice (1-5): ")
+            choice = input("\nEnter your choice (1-6): ")
             
             if choice == '1':
                 self._search_by_term()
@@ -213,6 +190,8 @@ class StudentManagementSystem:
             elif choice == '4':
                 self._filter_by_grade()
             elif choice == '5':
+                self._combined_filter()
+            elif choice == '6':
                 return
             else:
                 print("\nInvalid choice. Please try again.")
@@ -224,8 +203,10 @@ class StudentManagementSystem:
     def _search_by_term(self):
         """Search students by name, email, or course"""
         search_term = input("\nEnter search term (name, email, or course): ")
-        students = self.db.search_students(search_term)
-        self._display_student_list(students, "Search Results")
+        self._page_through(
+            lambda **kw: self.db.search_students_page(search_term, **kw),
+            "Search Results"
+        )
 
     def _filter_by_course(self):
         """Filter students by course"""
@@ -241,8 +222,11 @@ class StudentManagementSystem:
         try:
             choice = int(input("\nSelect course number: "))
             if 1 <= choice <= len(courses):
-                students = self.db.filter_by_course(courses[choice - 1])
-                self._display_student_list(students, f"Students in {courses[choice - 1]}")
+                course = courses[choice - 1]
+                self._page_through(
+                    lambda **kw: self.db.filter_by_course_page(course, **kw),
+                    f"Students in {course}"
+                )
             else:
                 print("\nInvalid course number.")
         except ValueError:
@@ -250,19 +234,149 @@ class StudentManagementSystem:
 
     def _filter_by_attendance(self):
         """Filter students with attendance below 75%"""
-        students = self.db.filter_by_attendance(75.0)
-        self._display_student_list(students, "Students with Attendance < 75%")
+        self._page_through(
+            lambda **kw: self.db.filter_by_attendance_page(AT_RISK_THRESHOLD, **kw),
+            "Students with Attendance < 75%"
+        )
 
     def _filter_by_grade(self):
         """Filter students by grade"""
         print("\nAvailable grades: A, B, C, D, F")
         grade = input("Enter grade to filter by: ").upper()
         if grade in ['A', 'B', 'C', 'D', 'F']:
-            students = self.db.filter_by_grade(grade)
-            self._display_student_list(students, f"Students with Grade {grade}")
+            self._page_through(
+                lambda **kw: self.db.filter_by_grade_page(grade, **kw),
+                f"Students with Grade {grade}"
+            )
         else:
             print("\nInvalid grade.")
 
+    def _combined_filter(self):
+        """Filter by any combination of courses, grades, attendance range and search words"""
+        print("\nLeave a field empty to skip it.")
+        courses = self.db.get_unique_courses()
+        for i, course in enumerate(courses, 1):
+            print(f"{i}. {course}")
+        try:
+            numbers = [int(n) for n in input("\nCourse number(s), comma-separated: ").split(",")
+                       if n.strip()]
+            if any(not 1 <= n <= len(courses) for n in numbers):
+                print("\nInvalid course number.")
+                return
+            grades = [g.strip().upper() for g in input("Grade(s), e.g. D,F: ").split(",")
+                      if g.strip()]
+            if any(g not in ('A', 'B', 'C', 'D', 'F', 'N/A') for g in grades):
+                print("\nInvalid grade.")
+                return
+            below = input("Attendance below (%): ").strip()
+            at_least = input("Attendance at least (%): ").strip()
+            query = StudentQuery().where(
+                course=[courses[n - 1] for n in numbers],
+                grade=grades,
+                attendance_below=float(below) if below else None,
+                attendance_at_least=float(at_least) if at_least else None,
+                search=sanitize_input(input("Search words: ")),
+            )
+        except ValueError:
+            print("\nPlease enter valid numbers.")
+            return
+        self._page_through(lambda **kw: self.db.query_students_page(query, **kw),
+                           "Filtered Students")
+
+    def _page_through(self, fetch_page: Callable[..., Page], title: str):
+        """
+        Interactive pager over a keyset-paginated query.
+
+        Only one page is fetched at a time; continuation tokens of the pages
+        already seen are kept so the user can step back.
+        """
+        tokens: List[Optional[str]] = [None]
+        page_number = 1
+        while True:
+            page = fetch_page(limit=CLI_PAGE_SIZE, page_token=tokens[-1])
+            if not page.rows:
+                if page_number == 1:
+                    print(f"\nNo students found for: {title}")
+                return
+            self._display_student_list(page.rows, f"{title} (page {page_number})")
+
+            options = []
+            if page.has_more:
+                options.append("[n]ext")
+            if page_number > 1:
+                options.append("[p]revious")
+            options.append("[q]uit")
+            if len(options) == 1:
+                return
+
+            choice = input(f"\n{' / '.join(options)}: ").strip().lower()
+            if choice == 'n' and page.has_more:
+                tokens.append(page.next_token)
+                page_number += 1
+            elif choice == 'p' and page_number > 1:
+                tokens.pop()
+                page_number -= 1
+            elif choice == 'q':
+                return
+
+    def show_statistics(self):
+        """Show grade distribution and attendance figures per course"""
+        try:
+            courses = self.db.get_course_statistics()
+            if not courses:
+                print("\nNo students in the database.")
+                return
+            overall = self.db.get_overall_statistics()
+            grades = ('A', 'B', 'C', 'D', 'F', 'N/A')
+
+            print("\n=== Course Statistics ===")
+            print(f"{'Course':<20} {'Students':>8} {'Mean':>6} {'Median':>6} {'P90':>6} "
+                  f"{'At risk':>7}  " + " ".join(f"{g:>4}" for g in grades))
+            print("-" * 95)
+            for stats in courses + [overall]:
+                name = stats.course if stats.course is not None else "All courses"
+                mean = f"{stats.attendance_mean:.1f}" if stats.attendance_mean is not None else "-"
+                median = f"{stats.attendance_median:.1f}" if stats.attendance_median is not None else "-"
+                p90 = stats.attendance_percentiles.get(90)
+                p90 = f"{p90:.1f}" if p90 is not None else "-"
+                print(f"{name[:20]:<20} {stats.students:>8} {mean:>6} {median:>6} {p90:>6} "
+                      f"{stats.at_risk:>7}  "
+                      + " ".join(f"{stats.grades.get(g, 0):>4}" for g in grades))
+            print(f"\nAttendance in %; at risk means attendance below {AT_RISK_THRESHOLD:g}%.")
+        except Exception as e:
+            log_error(f"Error computing statistics: {str(e)}")
+            print("\nFailed to compute statistics.")
+
+    def show_metrics(self):
+        """Show per-method query metrics for this session, optionally saving them"""
+        snapshot = self.db.metrics_snapshot()
+        if not snapshot:
+            print("\nNo queries recorded yet.")
+            return
+
+        print("\n=== Query Metrics (this session) ===")
+        print(f"{'Method':<28} {'Calls':>6} {'Queries':>7} {'Errors':>6} {'Rows':>8} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'Max ms':>8} {'Wait ms':>8}")
+        print("-" * 95)
+        for method, stats in sorted(snapshot.items(), key=lambda item: -item[1]["query_ms"]):
+            p50 = f"{stats['p50_ms']:.3f}" if stats["p50_ms"] is not None else "-"
+            p95 = f"{stats['p95_ms']:.3f}" if stats["p95_ms"] is not None else "-"
+            print(f"{method[:28]:<28} {stats['calls']:>6} {stats['queries']:>7} "
+                  f"{stats['errors']:>6} {stats['rows']:>8} {p50:>8} {p95:>8} "
+                  f"{stats['max_ms']:>8.3f} {stats['connection_wait_ms']:>8.3f}")
+        print(f"\nPercentiles are estimated from a histogram; "
+              f"{self.db.metrics.slow_queries} slow queries logged.")
+
+        path = input("\nSave as Prometheus text to file (Enter to skip): ").strip()
+        if path:
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(self.db.metrics_prometheus())
+                print(f"Metrics written to {path}")
+            except OSError as e:
+                log_error(f"Error writing metrics: {str(e)}")
+                print("\nFailed to write metrics file.")
+
     def _display_student_list(self, students: List[Dict[str, Any]], title: str):
         """Display a list of students with consistent formatting"""
         if not students:
@@ -273,12 +387,14 @@ class StudentManagementSystem:
         print(f"{'Name':<30} {'ID':<10} {'Course':<20} {'Attendance':<10} {'Grade':<5}")
         print("-" * 75)
         for student in students:
+            # attendance_percent and grade may be NULL; show them as '-'
+            attendance = student['attendance_percent']
             print(
                 f"{student['full_name']:<30} "
                 f"{student['student_id']:<10} "
                 f"{student['course']:<20} "
-                f"{student['attendance_percent']:<10.1f} "
-                f"{student['grade']:<5}"
+                f"{'-' if attendance is None else format(attendance, '.1f'):<10} "
+                f"{student['grade'] or '-':<5}"
             )
 
     def display_menu(self):
@@ -290,14 +406,16 @@ class StudentManagementSystem:
         print("4. Update Student")
         print("5. Delete Student")
         print("6. Search/Filter Students")
-        print("7. Launch GUI Version")
-        print("8. Exit")
+        print("7. Course Statistics")
+        print("8. Launch GUI Version")
+        print("9. Query Metrics")
+        print("10. Exit")
 
     def run(self):
         """Run the main application loop"""
         while True:
             self.display_menu()
-            choice = input("\nEnter your choice (1-8): ")
+            choice = input("\nEnter your choice (1-10): ")
             
             if choice == '1':
                 self.add_student()
@@ -312,6 +430,8 @@ class StudentManagementSystem:
             elif choice == '6':
                 self.search_students()
             elif choice == '7':
+                self.show_statistics()
+            elif choice == '8':
                 print("\nLaunching GUI version...")
                 try:
                     from gui import StudentManagementGUI
@@ -322,13 +442,19 @@ class StudentManagementSystem:
                 except Exception as e:
                     log_error(f"Failed to launch GUI: {str(e)}")
                     print("\nFailed to launch GUI. Make sure tkinter is installed.")
-            elif choice == '8':
+            elif choice == '9':
+                self.show_metrics()
+            elif choice == '10':
                 print("\nThank you for using the Student Management System!")
                 sys.exit(0)
             else:
                 print("\nInvalid choice. Please try again.")
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     try:
         sms = StudentManagementSystem()
         sms.run()
@@ -0,0 +1,349 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Slow queries are logged here, so they can be routed or silenced on their own
+slow_query_logger = logging.getLogger(__name__ + ".slow_queries")
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+# Upper bounds (seconds) of the query latency histogram buckets
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Label for queries run outside an instrumented method
+UNATTRIBUTED = "other"
+
+_END = object()
+
+
+class MethodMetrics:
+    """Counters and latency histogram of the queries run by one method"""
+    __slots__ = ("calls", "queries", "errors", "rows", "query_seconds", "max_seconds",
+                 "wait_seconds", "bucket_counts")
+
+    def __init__(self, buckets: int):
+        self.calls = 0
+        self.queries = 0
+        self.errors = 0
+        self.rows = 0
+        self.query_seconds = 0.0
+        self.max_seconds = 0.0
+        self.wait_seconds = 0.0
+        # One count per bucket plus the +Inf bucket; not cumulative
+        self.bucket_counts = [0] * (buckets + 1)
+
+
+def histogram_quantile(q: float, bounds: Sequence[float], counts: Sequence[int]) -> Optional[float]:
+    """
+    Estimate the q-quantile (0-1) from per-bucket counts, interpolating
+    linearly inside the bucket like Prometheus' histogram_quantile.
+    Observations in the +Inf bucket are reported as the largest bound.
+    """
+    total = sum(counts)
+    if total == 0:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if seen + count >= rank and count:
+            if i == len(bounds):
+                return bounds[-1]
+            lower = bounds[i - 1] if i else 0.0
+            return lower + (bounds[i] - lower) * (rank - seen) / count
+        seen += count
+    return bounds[-1]
+
+
+def redact_params(params: Any) -> str:
+    """Describe bound parameters by type only, so logs never contain student data"""
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>"
+                               for key, value in params.items()) + "}"
+    try:
+        return "[" + ", ".join(f"<{type(value).__name__}>" for value in params) + "]"
+    except TypeError:
+        return f"<{type(params).__name__}>"
+
+
+class QueryMetrics:
+    """
+    Thread-safe, in-process query metrics grouped by DatabaseManager method.
+
+    Each query records its latency (execute through the last fetch), the
+    rows it returned or changed, and whether it failed; each cursor records
+    how long it waited for a connection. Queries slower than slow_query_ms
+    are logged with their parameters redacted.
+    """
+
+    def __init__(self, slow_query_ms: Optional[float] = DEFAULT_SLOW_QUERY_MS,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            slow_query_ms: Log queries taking at least this long; None disables the log
+            buckets: Ascending upper bounds (seconds) of the latency histogram
+        """
+        self.slow_query_seconds = slow_query_ms / 1000 if slow_query_ms is not None else None
+        self.buckets = tuple(buckets)
+        self.slow_queries = 0
+        self._methods: Dict[str, MethodMetrics] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _method(self, operation: str) -> MethodMetrics:
+        """Stats entry of a method; call with the lock held"""
+        stats = self._methods.get(operation)
+        if stats is None:
+            stats = self._methods[operation] = MethodMetrics(len(self.buckets))
+        return stats
+
+    def current_operation(self) -> str:
+        """Name of the instrumented method running on this thread"""
+        return getattr(self._local, "operation", None) or UNATTRIBUTED
+
+    def set_operation(self, operation: Optional[str]) -> Optional[str]:
+        """Label this thread's queries with operation; returns the previous label"""
+        previous = getattr(self._local, "operation", None)
+        self._local.operation = operation
+        return previous
+
+    def record_call(self, operation: str):
+        with self._lock:
+            self._method(operation).calls += 1
+
+    def record_wait(self, operation: str, seconds: float):
+        with self._lock:
+            self._method(operation).wait_seconds += seconds
+
+    def record_query(self, operation: str, sql: str, params: Any, seconds: float,
+                     rows: int, failed: bool = False):
+        """Add one finished query to its method's counters and histogram"""
+        with self._lock:
+            stats = self._method(operation)
+            stats.queries += 1
+            stats.rows += rows
+            stats.query_seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            if failed:
+                stats.errors += 1
+            stats.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+            slow = self.slow_query_seconds is not None and seconds >= self.slow_query_seconds
+            if slow:
+                self.slow_queries += 1
+        if slow:
+            slow_query_logger.warning("Slow query in %s: %.1f ms, %d rows: %s params=%s",
+                                      operation, seconds * 1000, rows, " ".join(sql.split()),
+                                      redact_params(params))
+
+    def reset(self):
+        """Drop every recorded figure"""
+        with self._lock:
+            self._methods.clear()
+            self.slow_queries = 0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Figures per method, sorted by name. Latencies are in milliseconds;
+        the percentiles are estimated from the histogram.
+        """
+        with self._lock:
+            methods = {name: (stats.calls, stats.queries, stats.errors, stats.rows,
+                              stats.query_seconds, stats.max_seconds, stats.wait_seconds,
+                              list(stats.bucket_counts))
+                       for name, stats in self._methods.items()}
+        snapshot = {}
+        for name in sorted(methods):
+            calls, queries, errors, rows, seconds, max_seconds, wait, counts = methods[name]
+            entry = {
+                "calls": calls,
+                "queries": queries,
+                "errors": errors,
+                "rows": rows,
+                "query_ms": round(seconds * 1000, 3),
+                "mean_ms": round(seconds * 1000 / queries, 4) if queries else None,
+                "max_ms": round(max_seconds * 1000, 4),
+                "connection_wait_ms": round(wait * 1000, 3),
+            }
+            for label, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                value = histogram_quantile(q, self.buckets, counts)
+                if value is not None:
+                    value = min(value, max_seconds)
+                entry[label] = round(value * 1000, 4) if value is not None else None
+            snapshot[name] = entry
+        return snapshot
+
+    def to_prometheus(self, prefix: str = "student_db") -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        with self._lock:
+            methods = [(name, stats.calls, stats.queries, stats.errors, stats.rows,
+                        stats.query_seconds, stats.wait_seconds, list(stats.bucket_counts))
+                       for name, stats in sorted(self._methods.items())]
+            slow_queries = self.slow_queries
+
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: List[Tuple[str, Any]]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{labels} {value}")
+
+        def label(method: str) -> str:
+            escaped = method.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return f'method="{escaped}"'
+
+        for index, name, help_text in ((1, "calls_total", "Calls of each instrumented method."),
+                                       (2, "queries_total", "Queries run by each method."),
+                                       (3, "query_errors_total", "Queries that raised an error."),
+                                       (4, "rows_total", "Rows returned or changed by queries.")):
+            family(name, "counter", help_text,
+                   [(f"{name}{{{label(m[0])}}}", m[index]) for m in methods])
+        family("connection_wait_seconds_total", "counter",
+               "Time spent waiting for a database connection.",
+               [(f"connection_wait_seconds_total{{{label(m[0])}}}", repr(m[6])) for m in methods])
+
+        histogram = "query_duration_seconds"
+        samples = []
+        for method, _, queries, _, _, seconds, _, counts in methods:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                samples.append((f'{histogram}_bucket{{{label(method)},le="{le}"}}', cumulative))
+            samples.append((f"{histogram}_sum{{{label(method)}}}", repr(seconds)))
+            samples.append((f"{histogram}_count{{{label(method)}}}", queries))
+        family(histogram, "histogram", "Query latency.", samples)
+        family("slow_queries_total", "counter", "Queries slower than the slow-query threshold.",
+               [("slow_queries_total", slow_queries)])
+        return "\n".join(lines) + "\n"
+
+    def instrument(self, name: str, method: Callable) -> Callable:
+        """
+        Wrap a bound method so the queries it runs are attributed to name.
+
+        Iterators returned by the method (the lazy iter_* variants) are
+        labelled on their first step, when their cursor is opened.
+        """
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            self.record_call(name)
+            previous = self.set_operation(name)
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                self.set_operation(previous)
+            if isinstance(result, Iterator):
+                return self._label_iterator(result, name)
+            return result
+        return wrapper
+
+    def _label_iterator(self, iterator: Iterator, name: str) -> Iterator:
+        previous = self.set_operation(name)
+        try:
+            first = next(iterator, _END)
+        finally:
+            self.set_operation(previous)
+        if first is _END:
+            return
+        yield first
+        yield from iterator
+
+
+class InstrumentedCursor:
+    """
+    DB-API cursor wrapper that reports every statement to a QueryMetrics.
+
+    A statement is timed from execute through its fetches and recorded when
+    the next statement starts or the cursor is closed. Anything else is
+    passed through to the wrapped cursor.
+    """
+    __slots__ = ("_cursor", "_metrics", "_operation", "_sql", "_params", "_seconds",
+                 "_rows", "_failed")
+
+    def __init__(self, cursor, metrics: QueryMetrics, operation: str):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._operation = operation
+        self._sql: Optional[str] = None
+        self._params: Any = None
+        self._seconds = 0.0
+        self._rows = 0
+        self._failed = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def _run(self, execute: Callable, sql: str, params: Any, redacted: Any):
+        self._finish()
+        self._sql, self._params = sql, redacted
+        start = time.perf_counter()
+        try:
+            execute(sql, params)
+        except BaseException:
+            self._failed = True
+            raise
+        finally:
+            self._seconds = time.perf_counter() - start
+        if self._cursor.description is None:
+            self._rows = max(self._cursor.rowcount, 0)
+        return self
+
+    def execute(self, sql: str, params: Any = ()):
+        return self._run(self._cursor.execute, sql, params, params)
+
+    def executemany(self, sql: str, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        return self._run(self._cursor.executemany, sql, seq_of_params,
+                         seq_of_params[0] if seq_of_params else ())
+
+    def _fetch(self, fetch: Callable, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        except BaseException:
+            self._failed = True
+            raise
+        finally:
+            self._seconds += time.perf_counter() - start
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        if row is not None:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size: Optional[int] = None):
+        rows = self._fetch(self._cursor.fetchmany,
+                           size if size is not None else self._cursor.arraysize)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany()
+            if not rows:
+                return
+            yield from rows
+
+    def _finish(self):
+        """Record the current statement, if any"""
+        if self._sql is None:
+            return
+        self._metrics.record_query(self._operation, self._sql, self._params, self._seconds,
+                                   self._rows, self._failed)
+        self._sql = None
+        self._params = None
+        self._seconds = 0.0
+        self._rows = 0
+        self._failed = False
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
@@ -1,23 +1,199 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
-from datetime import date
-
-class Student(BaseModel):
-    id: Optional[int] = None
-    first_name: str = Field(..., min_length=2, max_length=50)
-    last_name: str = Field(..., min_length=2, max_length=50)
-    date_of_birth: date
-    email: str = Field(..., max_length=100)
-    phone: str = Field(..., max_length=15)
-    address: str = Field(..., max_length=200)
-    grade: float = Field(..., ge=0.0, le=100.0)
-    
-    class Config:
-        from_attributes = True
-
-    def full_name(self) -> str:
-        return f"{self.first_name} {self.last_name}"
-    
-    def __str__(self) -> str:
-        return (f"Student(id={self.id}, name='{self.full_name()}', "
-                f"grade={self.grade}, email='{self.email}')") 
\ No newline at end of file
+"""
+The student model: the one definition of a student, matching the students
+table.
+
+There are two ways to build a Student:
+- from_row()/from_rows() for rows read from the database. They were
+  validated when written, so these only copy values. DatabaseManager's
+  reads return Record rows, not Students; convert them with these where a
+  model object is wanted.
+- validate()/validate_many() for user input. Values are normalized (trimmed,
+  sanitized, phone formatted, grade upper-cased), and every invalid field is
+  reported at once in a StudentValidationError. validate_many() checks a
+  whole batch column by column (see validation.py), which costs far less per
+  record than validating records one at a time.
+
+DatabaseManager.add_student, update_student and update_students validate
+through this model, as do the CLI and GUI forms, so they all apply the same
+rules. add_students_bulk checks rows only when asked to (validate=True),
+with the same column validators validate_many uses.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from validation import RECORD_VALIDATORS, validate_student_records
+
+# Columns of the students table, in table order. id and created_at are
+# assigned by the database.
+STUDENT_COLUMNS = ("id", "full_name", "student_id", "course", "email", "phone",
+                   "attendance_percent", "grade", "created_at")
+
+# Validator per user-editable field
+FIELD_VALIDATORS = dict(RECORD_VALIDATORS)
+
+
+class StudentValidationError(ValueError):
+    """Invalid student input; errors maps each invalid field to the reason"""
+
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = errors
+        super().__init__("; ".join(f"{field}: {reason}" for field, reason in errors.items()))
+
+
+class Student:
+    """A student record. Construction does not validate; use validate() for input."""
+    __slots__ = STUDENT_COLUMNS
+
+    def __init__(self, full_name: str, course: str, email: str,
+                 student_id: Optional[str] = None, phone: str = '',
+                 attendance_percent: float = 0.0, grade: str = 'N/A',
+                 id: Optional[int] = None, created_at: Optional[str] = None):
+        self.id = id
+        self.full_name = full_name
+        self.student_id = student_id
+        self.course = course
+        self.email = email
+        self.phone = phone
+        self.attendance_percent = attendance_percent
+        self.grade = grade
+        self.created_at = created_at
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "Student":
+        """Build from a trusted database row (record or dict), without validation"""
+        student = object.__new__(cls)
+        student.id = row.get('id')
+        student.full_name = row['full_name']
+        student.student_id = row['student_id']
+        student.course = row['course']
+        student.email = row['email']
+        student.phone = row.get('phone')
+        student.attendance_percent = row.get('attendance_percent')
+        student.grade = row.get('grade')
+        student.created_at = row.get('created_at')
+        return student
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> List["Student"]:
+        """
+        Build from many trusted rows at once.
+
+        Rows of "SELECT * FROM students" (or any sequence of tuples in
+        STUDENT_COLUMNS order) are unpacked by position; the column order is
+        checked once, not per row.
+        """
+        if not rows:
+            return []
+        first = rows[0]
+        if isinstance(first, dict):
+            by_position = False
+        elif hasattr(first, 'keys'):
+            by_position = tuple(first.keys()) == STUDENT_COLUMNS
+        else:
+            by_position = True  # plain tuples, assumed in STUDENT_COLUMNS order
+        if not by_position:
+            return [cls.from_row(row) for row in rows]
+        new = object.__new__
+        students = []
+        append = students.append
+        for (id_, full_name, student_id, course, email, phone, attendance, grade,
+             created_at) in rows:
+            student = new(cls)
+            student.id = id_
+            student.full_name = full_name
+            student.student_id = student_id
+            student.course = course
+            student.email = email
+            student.phone = phone
+            student.attendance_percent = attendance
+            student.grade = grade
+            student.created_at = created_at
+            append(student)
+        return students
+
+    @classmethod
+    def validate(cls, data: Mapping[str, Any]) -> "Student":
+        """
+        Build from user input, normalizing every field.
+
+        An empty student_id is allowed (DatabaseManager.add_student allocates
+        one); empty phone, attendance and grade get their defaults.
+
+        Raises:
+            StudentValidationError: listing every invalid field
+        """
+        values = {}
+        errors = {}
+        for field, validator in RECORD_VALIDATORS:
+            result = validator((data.get(field),))
+            if result.valid[0]:
+                values[field] = result.values[0]
+            else:
+                errors[field] = result.errors[0]
+        if errors:
+            raise StudentValidationError(errors)
+        return cls(**values)
+
+    @classmethod
+    def validate_many(cls, records: Sequence[Any]
+                      ) -> Tuple[List[Optional["Student"]], List[Optional[str]]]:
+        """
+        Validate a batch of input records column by column.
+
+        Returns parallel lists: a Student (or None where invalid) and an
+        error reason (or None where valid) per record.
+        """
+        result = validate_student_records(records)
+        students = [cls(**record) if record is not None else None for record in result.records]
+        return students, result.errors
+
+    @staticmethod
+    def validate_field(field: str, value: Any) -> Any:
+        """
+        Validate and normalize one field (e.g. while prompting for it).
+
+        Raises:
+            StudentValidationError: if the value is invalid
+        """
+        result = FIELD_VALIDATORS[field]((value,))
+        if not result.valid[0]:
+            raise StudentValidationError({field: result.errors[0]})
+        return result.values[0]
+
+    @staticmethod
+    def validate_changes(changes: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a partial update. Fields that are absent, None or '' are
+        left out (they mean "keep the current value").
+
+        Raises:
+            StudentValidationError: listing every invalid field
+        """
+        values = {}
+        errors = {}
+        for field, value in changes.items():
+            if value is None or value == '':
+                continue
+            validator = FIELD_VALIDATORS.get(field)
+            if validator is None or field == 'student_id':
+                errors[field] = "cannot be changed"
+                continue
+            result = validator((value,))
+            if result.valid[0]:
+                values[field] = result.values[0]
+            else:
+                errors[field] = result.errors[0]
+        if errors:
+            raise StudentValidationError(errors)
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in STUDENT_COLUMNS}
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Student):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in STUDENT_COLUMNS)
+
+    def __repr__(self) -> str:
+        return (f"Student(student_id={self.student_id!r}, full_name={self.full_name!r}, "
+                f"course={self.course!r}, grade={self.grade!r})")
@@ -0,0 +1,245 @@
+"""
+Composable student queries compiled to parameterized SQL.
+
+A StudentQuery collects filters, a sort order and a row window:
+
+    StudentQuery().where(course="Computer Science", grade=("D", "F"),
+                         attendance_below=60).order_by("attendance_percent").take(100)
+
+DatabaseManager.query_students runs it as one SELECT. The SQL text depends
+only on the query's shape (which filters are set, how many values each list
+has, the sort columns), never on the values, which are always bound as
+parameters. Compiled text is kept in LRU caches, so a repeated shape skips
+SQL generation, and because the text is identical sqlite3 also reuses the
+connection's prepared statement.
+"""
+import re
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+# Distinct statement shapes kept compiled (per cache)
+STATEMENT_CACHE_SIZE = 256
+
+# Filters in the order their conditions are emitted. List-valued filters
+# (a str is one value) match any of their values.
+FILTER_NAMES = ("student_id", "course", "grade", "attendance_below", "attendance_at_least",
+                "search", "year")
+MULTI_VALUE_FILTERS = frozenset(("student_id", "course", "grade"))
+# Sortable columns declared NOT NULL in the students table; the others may
+# hold NULL, which seeks have to allow for
+NOT_NULL_COLUMNS = frozenset(("student_id", "full_name", "course", "email"))
+
+Order = Tuple[Tuple[str, bool], ...]
+
+
+def fts_match_expression(search_term: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 prefix query.
+
+    "jo doe" becomes '"jo"* "doe"*', i.e. every word must match the start of
+    a token in name, email or course. Returns None if there are no words.
+    """
+    words = re.findall(r"\w+", search_term)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _is_unset(value: Any) -> bool:
+    return value is None or (isinstance(value, (str, tuple, list)) and len(value) == 0)
+
+
+@dataclass(frozen=True)
+class StudentQuery:
+    """
+    Immutable description of a student query. where, order_by and take
+    return a new query, so a base query can be shared and refined.
+    """
+    filters: Tuple[Tuple[str, Any], ...] = ()
+    sort: Order = ()
+    limit: Optional[int] = None
+    offset: int = 0
+
+    def where(self, **filters) -> "StudentQuery":
+        """
+        Add or replace filters, combined with AND:
+            student_id, course, grade: a value or a list of values (any matches)
+            attendance_below, attendance_at_least: attendance bounds
+            search: words matched like search_students
+            year: enrollment year (the student ID prefix)
+        None or an empty list removes a filter.
+        """
+        merged = dict(self.filters)
+        for name, value in filters.items():
+            if name not in FILTER_NAMES:
+                raise TypeError(f"Unknown filter: {name!r}")
+            if name in MULTI_VALUE_FILTERS and not isinstance(value, (str, type(None))):
+                value = tuple(value)
+            if _is_unset(value):
+                merged.pop(name, None)
+            else:
+                merged[name] = value
+        return replace(self, filters=tuple(sorted(merged.items())))
+
+    def order_by(self, column: str, descending: bool = False) -> "StudentQuery":
+        """Append a sort column (the first call sets the primary key)"""
+        return replace(self, sort=self.sort + ((column, bool(descending)),))
+
+    def take(self, limit: Optional[int], offset: int = 0) -> "StudentQuery":
+        """Return at most limit rows (None = all), skipping offset"""
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError("limit and offset must not be negative")
+        return replace(self, limit=limit, offset=offset)
+
+    def filter_dict(self) -> Dict[str, Any]:
+        """The filters as keyword arguments for DatabaseManager methods"""
+        return dict(self.filters)
+
+
+def compile_filters(filters: Mapping[str, Any], fts_enabled: bool) -> Tuple[str, tuple]:
+    """
+    WHERE condition (without WHERE; "" if there are no filters) and its
+    parameters for the filters described in StudentQuery.where.
+    """
+    unknown = set(filters) - set(FILTER_NAMES)
+    if unknown:
+        raise TypeError(f"Unknown filter: {sorted(unknown)[0]!r}")
+    shape, params = [], []
+    for name in FILTER_NAMES:
+        value = filters.get(name)
+        if _is_unset(value):
+            continue
+        if name in MULTI_VALUE_FILTERS:
+            values = (value,) if isinstance(value, str) else tuple(value)
+            if name == "grade":
+                values = tuple(str(grade).upper() for grade in values)
+            shape.append((name, len(values)))
+            params.extend(values)
+        elif name == "search":
+            match = fts_match_expression(value) if fts_enabled else None
+            if match:
+                shape.append((name, "fts"))
+                params.append(match)
+            else:
+                shape.append((name, "like"))
+                params.extend((f"%{value}%",) * 3)
+        elif name == "year":
+            shape.append((name, 1))
+            params.extend((f"{int(value):04d}", f"{int(value) + 1:04d}"))
+        else:
+            shape.append((name, 1))
+            params.append(value)
+    return condition_sql(tuple(shape)), tuple(params)
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def condition_sql(shape: Tuple[Tuple[str, Any], ...]) -> str:
+    """SQL of a filter shape, as produced by compile_filters"""
+    conditions = []
+    for name, arity in shape:
+        if name in MULTI_VALUE_FILTERS:
+            conditions.append(f"{name} = ?" if arity == 1
+                              else f"{name} IN ({', '.join('?' for _ in range(arity))})")
+        elif name == "attendance_below":
+            conditions.append("attendance_percent < ?")
+        elif name == "attendance_at_least":
+            conditions.append("attendance_percent >= ?")
+        elif name == "search" and arity == "fts":
+            conditions.append("id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)")
+        elif name == "search":
+            conditions.append("(full_name LIKE ? OR email LIKE ? OR course LIKE ?)")
+        elif name == "year":
+            # IDs start with the enrollment year, so this is a range on the unique index
+            conditions.append("student_id >= ? AND student_id < ?")
+    return " AND ".join(conditions)
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def seek_plan(order: Order, nulls: Tuple[bool, ...]) -> Tuple[str, Tuple[int, ...]]:
+    """
+    Condition selecting rows that sort after a key, and the positions of the
+    key values its parameters take, in order. nulls flags the key values
+    that are NULL.
+
+    SQLite sorts NULL before every value: first ascending, last descending.
+    A single direction over a key without NULLs, where no NULL can sort
+    after it (ascending, or only NOT NULL columns), is one row-value
+    comparison, which SQLite answers with an index range scan. Otherwise it
+    expands to a >= ? AND ((a > ?) OR (a = ? AND b < ?) OR ...), comparing
+    with IS NULL where a key value is NULL and letting NULLs through where
+    they sort after it. The leading bound, left out when NULLs could fall
+    outside it, lets the index on the first column skip ahead. A descending
+    seek on a nullable column has no such bound, so SQLite walks the index
+    from its start to reach it.
+    """
+    columns = [col for col, _ in order]
+    if len({desc for _, desc in order}) == 1 and not any(nulls) \
+            and (not order[0][1] or NOT_NULL_COLUMNS.issuperset(columns)):
+        op = "<" if order[0][1] else ">"
+        return (f"({', '.join(columns)}) {op} ({', '.join('?' for _ in columns)})",
+                tuple(range(len(columns))))
+    terms, params = [], []
+    for i, (col, desc) in enumerate(order):
+        if nulls[i]:
+            if desc:
+                continue  # nothing sorts after NULL descending
+            after, after_params = f"{col} IS NOT NULL", []
+        elif not desc:
+            after, after_params = f"{col} > ?", [i]
+        elif col in NOT_NULL_COLUMNS:
+            after, after_params = f"{col} < ?", [i]
+        else:
+            after, after_params = f"({col} < ? OR {col} IS NULL)", [i]
+        equal = [f"{c} IS NULL" if null else f"{c} = ?" for c, null in zip(columns[:i], nulls)]
+        terms.append("(" + " AND ".join(equal + [after]) + ")")
+        params.extend([j for j in range(i) if not nulls[j]] + after_params)
+    condition = f"({' OR '.join(terms)})" if terms else "0"
+    first, first_desc = order[0]
+    if not nulls[0] and (not first_desc or first in NOT_NULL_COLUMNS):
+        return (f"({first} {'<=' if first_desc else '>='} ? AND {condition})",
+                (0,) + tuple(params))
+    return condition, tuple(params)
+
+
+def key_nulls(key: Sequence[Any]) -> Tuple[bool, ...]:
+    """Which values of a sort key are NULL, the shape argument of seek_plan"""
+    return tuple(value is None for value in key)
+
+
+def seek_sql(order: Order, nulls: Optional[Tuple[bool, ...]] = None) -> str:
+    """Condition selecting rows that sort after a key (see seek_plan)"""
+    return seek_plan(order, nulls or (False,) * len(order))[0]
+
+
+def seek_params(order: Order, after: Sequence[Any]) -> list:
+    """Parameters of seek_sql(order, key_nulls(after)) for the key after"""
+    if len(after) != len(order):
+        raise ValueError("after must have one value per sort column")
+    return [after[i] for i in seek_plan(order, key_nulls(after))[1]]
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def compile_statement(columns: str, condition: str, order: Order,
+                      seek: Optional[Order] = None, window: bool = False,
+                      seek_nulls: Optional[Tuple[bool, ...]] = None) -> str:
+    """
+    SELECT columns FROM students with an optional condition, a seek past a
+    key in seek order (seek_nulls flags its NULL values), ORDER BY order
+    and, with window, LIMIT ? OFFSET ?. Parameters go in that order:
+    condition, seek, limit and offset.
+    """
+    conditions = [f"({condition})"] if condition else []
+    if seek:
+        conditions.append(seek_sql(seek, seek_nulls))
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    order_clause = (" ORDER BY " + ", ".join(f"{col} {'DESC' if desc else 'ASC'}"
+                                             for col, desc in order)) if order else ""
+    window_clause = " LIMIT ? OFFSET ?" if window else ""
+    return f"SELECT {columns} FROM students{where}{order_clause}{window_clause};"
+
+
+def compiled_statement_cache_info() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters of the compiled SQL caches"""
+    return {cache.__name__: cache.cache_info()._asdict()
+            for cache in (condition_sql, seek_plan, compile_statement)}
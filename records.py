@@ -0,0 +1,54 @@
+"""
+Compact, read-only row objects for query results.
+
+Record is the connection row_factory used by DatabaseManager. It builds on
+sqlite3.Row, which stores just the row's value tuple and a reference to the
+cursor's column description: the column names are computed once per query and
+shared by every row, instead of a dict (and a fresh column list) per row.
+Lookups by name, position and slice all run in C.
+
+Records read like the dicts they replace (record['full_name'], get(), keys(),
+items()), and also by attribute (record.full_name) and position (record[0]),
+so callers that unpack plain tuples keep working. Differences from a dict:
+- iterating a record yields its values, like a tuple (but `in` tests
+  column names, like a dict);
+- a missing column raises IndexError (get() returns the default);
+- column names are matched case-insensitively.
+Use dict(record) or _asdict() where a real dict is needed (e.g. json.dumps).
+"""
+import sqlite3
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class Record(sqlite3.Row):
+    """sqlite3.Row with the rest of the read-only dict interface"""
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except IndexError:
+            return default
+
+    def values(self) -> List[Any]:
+        return list(self)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.keys(), self)
+
+    def _asdict(self) -> Dict[str, Any]:
+        return dict(zip(self.keys(), self))
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when normal attribute lookup fails, i.e. for column names
+        try:
+            return self[name]
+        except IndexError:
+            raise AttributeError(name) from None
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.keys()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{type(self).__name__}({fields})"
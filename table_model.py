@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from database import DatabaseManager, StudentRecord, DEFAULT_SORT
+
+DEFAULT_MODEL_PAGE_SIZE = 100
+DEFAULT_MODEL_MAX_PAGES = 32
+
+
+class StudentTableModel:
+    """
+    Random-access view of the student list, fetched one page at a time.
+
+    Rows are addressed by position in the current sort order (name by
+    default), after applying the current filters. Sorting and filtering run
+    in the database, so changing them only drops the cached pages. Pages
+    are kept in a small LRU, so memory stays constant however large the
+    table is. A page that follows a cached page is read with a keyset seek
+    from that page's last row, which is the common case when scrolling. A
+    jump to an arbitrary position falls back to LIMIT/OFFSET.
+    """
+
+    def __init__(self, db: DatabaseManager, page_size: int = DEFAULT_MODEL_PAGE_SIZE,
+                 max_pages: int = DEFAULT_MODEL_MAX_PAGES):
+        self.db = db
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.sort: Tuple[Tuple[str, bool], ...] = tuple(DEFAULT_SORT)
+        self.filters: Dict[str, Any] = {}
+        self._pages: "OrderedDict[int, List[StudentRecord]]" = OrderedDict()
+        self._count: Optional[int] = None
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = self.db.count_students(**self.filters)
+        return self._count
+
+    def set_sort(self, sort: Sequence[Tuple[str, bool]]):
+        """Order rows by (column, descending) pairs, most significant first"""
+        self.sort = tuple(sort)
+        self.invalidate()
+
+    def set_filters(self, **filters):
+        """Show only rows matching the filters (keyword arguments of StudentQuery.where)"""
+        self.filters = {key: value for key, value in filters.items() if value is not None}
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget cached pages and the row count (call after any write)"""
+        self._pages.clear()
+        self._count = None
+
+    def rows(self, start: int, stop: int) -> List[StudentRecord]:
+        """Return rows [start, stop), fetching any pages not yet cached"""
+        start = max(start, 0)
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+        first_page = start // self.page_size
+        last_page = (stop - 1) // self.page_size
+        rows: List[StudentRecord] = []
+        for number in range(first_page, last_page + 1):
+            rows.extend(self._page(number))
+        offset = first_page * self.page_size
+        return rows[start - offset:stop - offset]
+
+    def prefetch(self, start: int, stop: int):
+        """Make sure the pages covering [start, stop) are cached"""
+        self.rows(start, stop)
+
+    def _page(self, number: int) -> List[StudentRecord]:
+        page = self._pages.get(number)
+        if page is not None:
+            self._pages.move_to_end(number)
+            return page
+
+        after = None
+        previous = self._pages.get(number - 1)
+        if previous is not None and len(previous) == self.page_size:
+            after = self.db.sort_key(previous[-1], self.sort)
+        page = self.db.get_students_sorted(self.sort, offset=number * self.page_size,
+                                           limit=self.page_size, after=after, **self.filters)
+
+        self._pages[number] = page
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
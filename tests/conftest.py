@@ -0,0 +1,36 @@
+import pytest
+
+from database import DatabaseManager
+
+
+def make_student(n: int, **overrides):
+    """A valid add_student/add_students_bulk row, distinct for each n"""
+    student = {
+        "full_name": f"Student {n:05d}",
+        "course": "Computer Science",
+        "email": f"student{n}@example.edu",
+        "phone": "",
+        "attendance_percent": 80.0,
+        "grade": "B",
+    }
+    student.update(overrides)
+    return student
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "students.db")
+
+
+@pytest.fixture
+def db(db_path):
+    manager = DatabaseManager(db_path)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def cached_db(db_path):
+    manager = DatabaseManager(db_path, result_cache_size=64)
+    yield manager
+    manager.close()
@@ -0,0 +1,81 @@
+import asyncio
+
+from async_database import AsyncDatabaseManager
+from conftest import make_student
+from database import DatabaseManager
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def seed(db_path, count=12):
+    db = DatabaseManager(db_path)
+    rows = [make_student(i, student_id=f"2024{i:03d}", course=("Law", "Nursing")[i % 2],
+                         phone=None if i % 3 else f"+233-24-000-{i:04d}")
+            for i in range(1, count + 1)]
+    db.add_students_bulk(rows)
+    return db
+
+
+def test_sorted_reads_match_the_sync_manager(db_path):
+    db = seed(db_path)
+    sort = (("course", False), ("attendance_percent", True))
+
+    async def main():
+        async with AsyncDatabaseManager(db_path) as adb:
+            return (await adb.get_students_sorted(sort, offset=2, limit=4, course="Law"),
+                    await adb.get_students_at(5, 3),
+                    await adb.count_students(course="Nursing"),
+                    await adb.student_position(db.get_student("2024007"), sort))
+
+    window, at, count, position = run(main())
+    assert window == db.get_students_sorted(sort, offset=2, limit=4, course="Law")
+    assert at == db.get_students_at(5, 3)
+    assert count == db.count_students(course="Nursing")
+    assert position == db.student_position(db.get_student("2024007"), sort)
+    db.close()
+
+
+def test_iter_students_sorted_walks_every_row_including_null_keys(db_path):
+    db = seed(db_path)
+    sort = (("phone", False),)
+
+    async def main():
+        async with AsyncDatabaseManager(db_path) as adb:
+            return [row async for row in adb.iter_students_sorted(sort, batch_size=5)]
+
+    rows = run(main())
+    assert [row["student_id"] for row in rows] == \
+        [row["student_id"] for row in db.iter_students_sorted(sort)]
+    db.close()
+
+
+def test_data_version_changes_on_another_connections_commit(db_path):
+    db = seed(db_path, 1)
+
+    async def main():
+        async with AsyncDatabaseManager(db_path) as adb:
+            before = await adb.data_version()
+            assert await adb.data_version() == before
+            db.add_student(make_student(99, student_id="2024099"))
+            return before, await adb.data_version()
+
+    before, after = run(main())
+    assert after != before
+    db.close()
+
+
+def test_iter_students_sorted_keeps_null_rows_in_both_directions(db_path):
+    db = seed(db_path)
+
+    async def main(sort):
+        async with AsyncDatabaseManager(db_path) as adb:
+            return [row["student_id"]
+                    async for row in adb.iter_students_sorted(sort, batch_size=2)]
+
+    for sort in ((("phone", False),), (("phone", True),)):
+        expected = [row["student_id"] for row in db.iter_students_sorted(sort)]
+        assert len(expected) == db.count_students()
+        assert run(main(sort)) == expected
+    db.close()
@@ -0,0 +1,68 @@
+import pytest
+
+from conftest import make_student
+from importer import import_attendance
+
+
+@pytest.fixture
+def roster(cached_db):
+    cached_db.add_students_bulk([make_student(i, student_id=f"2024{i:03d}",
+                                              attendance_percent=80.0)
+                                 for i in range(1, 4)])
+    return cached_db
+
+
+def test_marks_update_counters_and_attendance_percent(roster):
+    marks = [("2024001", "wk1", True), ("2024001", "wk2", False), ("2024001", "wk3", True),
+             ("2024001", "wk4", True), ("2024002", "wk1", False)]
+    result = roster.record_attendance(marks, chunk_size=2)
+    assert (result.recorded, result.skipped) == (5, 0)
+    assert roster.get_attendance_counts("2024001") == (3, 4)
+    assert roster.get_student("2024001")["attendance_percent"] == 75.0
+    assert roster.get_student("2024002")["attendance_percent"] == 0.0
+    # Students without marks keep their entered value
+    assert roster.get_attendance_counts("2024003") is None
+    assert roster.get_student("2024003")["attendance_percent"] == 80.0
+
+
+def test_unknown_students_and_repeated_sessions_are_skipped(roster):
+    roster.record_attendance([("2024001", "wk1", True)])
+    result = roster.record_attendance([("2024001", "wk1", False), ("2024001", "wk2", False),
+                                       ("2024001", "wk2", True), ("1999001", "wk1", True)])
+    assert (result.recorded, result.skipped) == (1, 3)
+    assert roster.get_attendance_counts("2024001") == (1, 2)
+
+
+def test_cached_reads_see_recorded_marks(roster):
+    assert [s["student_id"] for s in roster.filter_by_attendance(50)] == []
+    roster.record_attendance([("2024002", "wk1", False)])
+    assert [s["student_id"] for s in roster.filter_by_attendance(50)] == ["2024002"]
+
+
+def test_verify_and_rebuild(roster):
+    roster.record_attendance([("2024001", "wk1", True), ("2024001", "wk2", False),
+                              ("2024002", "wk1", True)])
+    assert roster.verify_attendance() == []
+
+    with roster.get_db_cursor() as cursor:
+        cursor.execute("UPDATE attendance_counters SET present = 0 WHERE student_id = '2024001';")
+        cursor.execute("UPDATE students SET attendance_percent = 10 WHERE student_id = '2024002';")
+    assert sorted(roster.verify_attendance()) == ["2024001", "2024002"]
+
+    assert roster.rebuild_attendance() == 1  # 2024001's percent was never changed
+    assert roster.verify_attendance() == []
+    assert roster.get_attendance_counts("2024001") == (1, 2)
+    assert roster.get_student("2024002")["attendance_percent"] == 100.0
+
+
+def test_import_attendance_from_csv(roster, tmp_path):
+    path = tmp_path / "marks.csv"
+    path.write_text("student_id,session,present\n"
+                    "2024001,wk1,yes\n"
+                    "2024001,wk2,0\n"
+                    ",wk2,1\n"
+                    "2024003,wk1,true\n")
+    result = import_attendance(roster, str(path))
+    assert (result.recorded, result.skipped) == (3, 0)
+    assert roster.get_attendance_counts("2024001") == (1, 2)
+    assert roster.get_attendance_counts("2024003") == (1, 1)
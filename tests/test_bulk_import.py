@@ -0,0 +1,100 @@
+import json
+import sqlite3
+
+import pytest
+
+from conftest import make_student
+from importer import import_file
+
+
+def test_inserts_every_row_in_chunks(db):
+    result = db.add_students_bulk((make_student(i) for i in range(25)), chunk_size=10)
+    assert result.inserted == 25
+    assert result.failed == []
+    assert db.count_students() == 25
+
+
+def test_rows_without_id_get_allocated_ids(db):
+    db.add_students_bulk([make_student(1), make_student(2)])
+    ids = sorted(student["student_id"] for student in db.get_all_students())
+    assert len(set(ids)) == 2
+    assert all(len(student_id) in (7, 10) for student_id in ids)
+
+
+def test_duplicate_rows_fail_alone(db):
+    rows = [make_student(1, student_id="2024001"), make_student(2, student_id="2024001"),
+            make_student(3), make_student(4, email="student1@example.edu")]
+    result = db.add_students_bulk(rows)
+    assert result.inserted == 2
+    assert [index for index, _, _ in result.failed] == [1, 3]
+    assert db.count_students() == 2
+
+
+def test_missing_fields_are_reported_not_raised(db):
+    result = db.add_students_bulk([{"full_name": "No Course"}, make_student(1)])
+    assert result.inserted == 1
+    assert result.failed[0][0] == 0
+    assert "invalid row" in result.failed[0][2]
+
+
+def test_unbindable_value_fails_only_its_row(db):
+    rows = [make_student(1), make_student(2, full_name={"first": "Nested"}), make_student(3)]
+    result = db.add_students_bulk(rows)
+    assert result.inserted == 2
+    assert [index for index, _, _ in result.failed] == [1]
+    assert db.count_students() == 2
+
+
+def test_validate_rejects_bad_rows_and_normalizes_the_rest(db):
+    rows = [make_student(1, email="not-an-email"), make_student(2, grade="a")]
+    result = db.add_students_bulk(rows, validate=True)
+    assert result.inserted == 1
+    assert result.failed[0][0] == 0
+    assert db.get_all_students()[0]["grade"] == "A"
+
+
+def test_import_jsonl_with_nested_object(db, tmp_path):
+    path = tmp_path / "students.jsonl"
+    lines = [make_student(1), make_student(2, course={"name": "Law"}), make_student(3)]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n{broken\n")
+    result = import_file(db, str(path))
+    assert result.inserted == 2
+    assert [index for index, _, _ in result.failed] == [1, 3]
+    assert result.failed[1][2].startswith("line 4: malformed JSON")
+
+
+def test_malformed_lines_fail_alongside_validation_errors(db, tmp_path):
+    path = tmp_path / "students.jsonl"
+    path.write_text("not json\n\n" + json.dumps(make_student(1, email="bad")) + "\n"
+                    + json.dumps(make_student(2)) + "\n")
+    result = import_file(db, str(path), validate=True)
+    assert result.inserted == 1
+    assert [(index, error.split(":")[0]) for index, _, error in result.failed] == \
+        [(0, "line 1"), (1, "invalid row")]
+
+
+@pytest.mark.parametrize("chunk_size", [0, -5])
+def test_chunk_size_must_be_positive(db, chunk_size):
+    with pytest.raises(ValueError, match="chunk_size"):
+        db.add_students_bulk([make_student(1)], chunk_size=chunk_size)
+    with pytest.raises(ValueError, match="chunk_size"):
+        db.record_attendance([("2024001", "wk1", True)], chunk_size=chunk_size)
+    assert db.count_students() == 0
+
+
+def test_locked_database_aborts_the_import(db_path):
+    from database import DatabaseManager
+
+    db = DatabaseManager(db_path, busy_timeout=0.05)
+    db.add_students_bulk([make_student(1, student_id="2024001")])
+    blocker = sqlite3.connect(db_path)
+    blocker.execute("BEGIN IMMEDIATE;")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            db.add_students_bulk([make_student(i, student_id=f"2024{i:03d}")
+                                  for i in range(2, 6)], chunk_size=2)
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert db.count_students() == 1
+    db.close()
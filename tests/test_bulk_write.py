@@ -0,0 +1,98 @@
+import sqlite3
+
+import pytest
+
+from conftest import make_student
+from models import StudentValidationError
+
+
+@pytest.fixture
+def roster(db):
+    db.add_students_bulk([
+        make_student(1, student_id="2023001", course="Law", grade="C", attendance_percent=55.0),
+        make_student(2, student_id="2023002", course="Law", grade="A", attendance_percent=98.0),
+        make_student(3, student_id="2024001", course="Physics", grade="F", attendance_percent=40.0),
+        make_student(4, student_id="2024002", course="Physics", grade="B"),
+    ])
+    return db
+
+
+def grades(db):
+    return {row["student_id"]: row["grade"] for row in db.get_all_students()}
+
+
+def test_update_by_ids_reports_matched_and_unmatched(roster):
+    result = roster.update_students({"grade": "a"}, student_ids=["2024001", "9999999", "2023001",
+                                                                 "2024001"])
+    assert result.affected == 2
+    assert result.student_ids == ["2024001", "2023001"]
+    assert result.unmatched == ["9999999"]
+    assert not result.dry_run
+    assert result.elapsed >= 0
+    assert grades(roster) == {"2023001": "A", "2023002": "A", "2024001": "A", "2024002": "B"}
+
+
+def test_update_by_filter_with_clamped_attendance_delta(roster):
+    result = roster.update_students({}, attendance_delta=5, course="Law")
+    assert result.affected == 2
+    assert result.student_ids == ["2023001", "2023002"]
+    attendance = {row["student_id"]: row["attendance_percent"] for row in roster.get_all_students()}
+    assert attendance == {"2023001": 60.0, "2023002": 100.0, "2024001": 40.0, "2024002": 80.0}
+
+
+def test_ids_and_filters_combine(roster):
+    result = roster.delete_students(student_ids=["2023001", "2024001"], course="Physics")
+    assert result.student_ids == ["2024001"]
+    assert result.unmatched == ["2023001"]
+    assert roster.count_students() == 3
+
+
+def test_dry_run_writes_nothing(roster):
+    before = grades(roster)
+    update = roster.update_students({"grade": "F"}, dry_run=True, year=2024)
+    delete = roster.delete_students(dry_run=True, year=2023)
+    assert update.dry_run and delete.dry_run
+    assert update.affected == 2 and update.student_ids == ["2024001", "2024002"]
+    assert delete.affected == 2
+    assert "would change 2 students" in delete.summary()
+    assert grades(roster) == before
+
+
+def test_delete_by_filter(roster):
+    result = roster.delete_students(year=2023)
+    assert result.affected == 2
+    assert sorted(grades(roster)) == ["2024001", "2024002"]
+
+
+def test_invalid_change_writes_nothing(roster):
+    before = grades(roster)
+    with pytest.raises(StudentValidationError):
+        roster.update_students({"grade": "B", "email": "not-an-email"}, course="Law")
+    assert grades(roster) == before
+
+
+def test_failing_row_rolls_back_the_whole_batch(roster):
+    # The second row would take the first one's new email, which is UNIQUE
+    with pytest.raises(sqlite3.IntegrityError):
+        roster.update_students({"email": "shared@example.edu", "grade": "D"},
+                               student_ids=["2023001", "2023002"])
+    rows = {row["student_id"]: row for row in roster.get_all_students()}
+    assert rows["2023001"]["email"] == "student1@example.edu"
+    assert rows["2023001"]["grade"] == "C"
+
+
+def test_bulk_write_needs_a_target_and_a_change(roster):
+    with pytest.raises(ValueError, match="student_ids or at least one filter"):
+        roster.delete_students()
+    with pytest.raises(ValueError, match="No changes"):
+        roster.update_students({}, course="Law")
+    with pytest.raises(ValueError, match="not both"):
+        roster.update_students({"attendance_percent": 50}, attendance_delta=5, course="Law")
+
+
+def test_bulk_write_invalidates_the_result_cache(cached_db):
+    cached_db.add_students_bulk([make_student(1, student_id="2024001", grade="C")])
+    assert [row["student_id"] for row in cached_db.filter_by_grade("C")] == ["2024001"]
+    cached_db.update_students({"grade": "A"}, student_ids=["2024001"])
+    assert cached_db.filter_by_grade("C") == []
+    assert cached_db.get_student("2024001")["grade"] == "A"
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+
+import pytest
+
+import cli
+from conftest import make_student
+from main import StudentManagementSystem
+
+
+@pytest.fixture
+def roster(db, db_path):
+    db.add_students_bulk([
+        make_student(i, student_id=f"2024{i:03d}", course=("Law", "Music")[i % 2],
+                     grade="ABCDF"[i % 5], attendance_percent=float(i * 10))
+        for i in range(1, 8)])
+    return db_path
+
+
+def run(capsys, *argv):
+    code = cli.main(list(argv))
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+def test_get_prints_the_student(roster, capsys):
+    code, out, _ = run(capsys, "get", "2024003", "--db", roster)
+    assert code == cli.EXIT_OK
+    assert json.loads(out)["student_id"] == "2024003"
+
+
+def test_get_missing_student_fails(roster, capsys):
+    code, out, err = run(capsys, "get", "missing", "--db", roster)
+    assert code == cli.EXIT_FAILED
+    assert out == ""
+    assert "No student with ID missing" in err
+
+
+def test_list_sorts_and_windows(roster, capsys):
+    code, out, _ = run(capsys, "list", "--db", roster, "--sort", "attendance_percent:desc",
+                       "--limit", "3", "--offset", "1", "--format", "jsonl")
+    assert code == cli.EXIT_OK
+    assert [json.loads(line)["student_id"] for line in out.splitlines()] == \
+        ["2024006", "2024005", "2024004"]
+
+
+def test_filter_and_count(roster, capsys):
+    code, out, _ = run(capsys, "filter", "--db", roster, "--course", "Law",
+                       "--attendance-below", "50", "--format", "csv")
+    assert code == cli.EXIT_OK
+    assert [row["student_id"] for row in csv.DictReader(io.StringIO(out))] == \
+        ["2024002", "2024004"]
+    code, out, _ = run(capsys, "filter", "--db", roster, "--grade", "a", "--grade", "b",
+                       "--count")
+    assert json.loads(out) == {"count": 3}
+
+
+def test_add_validates_and_allocates_an_id(db_path, capsys):
+    code, out, _ = run(capsys, "add", "--db", db_path, "--name", "Ann Lee", "--course", "Law",
+                       "--email", "ann@example.edu", "--grade", "b")
+    assert code == cli.EXIT_OK
+    added = json.loads(out)
+    assert added["grade"] == "B" and added["student_id"]
+
+    code, _, err = run(capsys, "add", "--db", db_path, "--name", "Bob", "--course", "Law",
+                       "--email", "not-an-email")
+    assert code == cli.EXIT_FAILED
+    assert "email:" in err
+
+
+def test_import_reports_failures(db_path, tmp_path, capsys):
+    path = tmp_path / "students.jsonl"
+    path.write_text(json.dumps(make_student(1)) + "\n{broken\n")
+    code, out, _ = run(capsys, "import", str(path), "--db", db_path)
+    summary = json.loads(out)
+    assert code == cli.EXIT_FAILED
+    assert summary["inserted"] == 1 and summary["failed"] == 1
+    assert summary["failures"][0]["error"].startswith("line 2")
+
+
+def test_stats_and_export(roster, tmp_path, capsys):
+    code, out, _ = run(capsys, "stats", "--db", roster, "--course", "Music")
+    assert code == cli.EXIT_OK
+    assert json.loads(out)[0]["students"] == 4
+    code, _, err = run(capsys, "stats", "--db", roster, "--course", "Astronomy")
+    assert code == cli.EXIT_FAILED and "No students in Astronomy" in err
+
+    output = tmp_path / "law.jsonl"
+    code, _, _ = run(capsys, "export", "--db", roster, "-o", str(output), "--format", "jsonl",
+                     "--course", "Law")
+    assert code == cli.EXIT_OK
+    assert len(output.read_text().splitlines()) == 3
+
+
+@pytest.mark.parametrize("argv", [
+    ["list", "--sort", "bogus:up"],
+    ["list", "--sort", "nickname"],
+    ["list", "--limit", "-1"],
+    ["import", "students.csv", "--chunk-size", "0"],
+    ["frobnicate"],
+    [],
+])
+def test_usage_errors_exit_2(roster, capsys, argv):
+    with pytest.raises(SystemExit) as caught:
+        cli.main(argv + ["--db", roster] if argv else argv)
+    assert caught.value.code == 2
+    assert "usage:" in capsys.readouterr().err
+
+
+def test_menu_listing_shows_null_values_as_dashes(capsys):
+    menu = StudentManagementSystem.__new__(StudentManagementSystem)
+    menu._display_student_list([{"full_name": "Ann Lee", "student_id": "2024001",
+                                 "course": "Law", "attendance_percent": None, "grade": None},
+                                {"full_name": "Bob Ray", "student_id": "2024002",
+                                 "course": "Law", "attendance_percent": 87.25, "grade": "B"}],
+                                "Law")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[-2].split()[-2:] == ["-", "-"]
+    assert lines[-1].split()[-2:] == ["87.2", "B"]
@@ -0,0 +1,94 @@
+import sqlite3
+import threading
+
+import pytest
+
+from conftest import make_student
+from database import ConnectionPool, DatabaseManager
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = ConnectionPool(db_path, busy_timeout=2.5, cache_size_kb=1024)
+    yield pool
+    pool.close_all()
+
+
+def in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_each_thread_reuses_its_own_connection(pool):
+    conn = pool.get_connection()
+    assert pool.get_connection() is conn
+    other = in_thread(pool.get_connection)
+    assert other is not conn
+    assert in_thread(pool.get_connection) is not other
+
+
+def test_connections_are_tuned_once_opened(pool):
+    conn = pool.get_connection()
+    assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == 2500
+    assert conn.execute("PRAGMA cache_size;").fetchone()[0] == -1024
+
+
+def test_close_all_closes_every_thread_connection(pool):
+    conn = pool.get_connection()
+    other = in_thread(pool.get_connection)
+    pool.close_all()
+    for closed in (conn, other):
+        with pytest.raises(sqlite3.ProgrammingError):
+            closed.execute("SELECT 1;")
+    reopened = pool.get_connection()
+    assert reopened is not conn
+    assert reopened.execute("SELECT 1;").fetchone()[0] == 1
+
+
+def test_manager_reuses_the_pooled_connection(db):
+    db.add_student(make_student(1))
+    conn = db.pool.get_connection()
+    db.get_all_students()
+    assert db.pool.get_connection() is conn
+    db.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1;")
+
+
+def test_unpooled_manager_opens_a_connection_per_operation(db_path):
+    db = DatabaseManager(db_path, pooled=False)
+    assert db.pool is None
+    db.add_student(make_student(1))
+    assert db.count_students() == 1
+    db.close()
+
+
+def test_shared_managers_share_one_pool_until_the_last_closes(db_path):
+    first = DatabaseManager(db_path, shared=True)
+    second = DatabaseManager(db_path, shared=True)
+    assert first.pool is second.pool
+    conn = first.pool.get_connection()
+    first.close()
+    assert second.pool.get_connection() is conn
+    second.add_student(make_student(1))
+    second.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1;")
+
+
+def test_close_thread_connection_leaves_other_threads_alone(pool):
+    other = in_thread(pool.get_connection)
+    conn = pool.get_connection()
+    pool.close_thread_connection()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1;")
+    assert other.execute("SELECT 1;").fetchone()[0] == 1
+    assert pool.get_connection() is not conn
+    pool.close_thread_connection()
+    pool.close_thread_connection()      # no connection: nothing to do
+    assert pool._connections == [other]
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+
+import pytest
+
+from conftest import make_student
+from database import STUDENT_COLUMNS
+from exporter import export_students, write_csv, write_jsonl
+
+
+@pytest.fixture
+def roster(db):
+    db.add_students_bulk([
+        make_student(i, student_id=f"2024{i:03d}", course=("Law", "Music")[i % 2],
+                     grade="ABCDF"[i % 5], attendance_percent=float(i * 9),
+                     full_name=f"Ünïcode {i:02d}")
+        for i in range(1, 12)])
+    return db
+
+
+def test_streaming_variants_match_the_list_queries(roster):
+    assert list(roster.iter_students(batch_size=3)) == roster.get_all_students()
+    assert list(roster.iter_filter_by_course("Law", 2)) == roster.filter_by_course("Law")
+    assert list(roster.iter_filter_by_grade("b", 2)) == roster.filter_by_grade("B")
+    assert list(roster.iter_filter_by_attendance(50, 4)) == roster.filter_by_attendance(50)
+    assert list(roster.iter_search_students("03", 1)) == roster.search_students("03")
+
+
+def test_streaming_is_lazy(roster):
+    rows = roster.iter_students(batch_size=2)
+    first = next(rows)
+    roster.add_student(make_student(99, full_name="Zed Last"))
+    assert first["full_name"] == "Ünïcode 01"
+    assert len(list(rows)) >= 10
+
+
+def test_csv_export_round_trips(roster, tmp_path):
+    path = tmp_path / "students.csv"
+    assert export_students(roster.iter_students(batch_size=4), str(path), "csv") == 11
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert tuple(rows[0]) == STUDENT_COLUMNS
+    assert [row["student_id"] for row in rows] == \
+        [student["student_id"] for student in roster.get_all_students()]
+    assert rows[0]["full_name"] == "Ünïcode 01"
+
+
+def test_jsonl_export_writes_objects(roster, tmp_path):
+    path = tmp_path / "students.jsonl"
+    assert export_students(roster.iter_filter_by_course("Music"), str(path), "jsonl") == 6
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert records == [dict(row) for row in roster.filter_by_course("Music")]
+
+
+def test_writers_accept_plain_dicts_and_count_rows():
+    out = io.StringIO()
+    assert write_csv([make_student(1), make_student(2)], out) == 2
+    assert out.getvalue().splitlines()[0] == ",".join(STUDENT_COLUMNS)
+    out = io.StringIO()
+    assert write_jsonl(iter([]), out) == 0
+    assert out.getvalue() == ""
+
+
+def test_export_to_stdout(roster, capsys):
+    export_students(roster.iter_filter_by_grade("A"), None, "jsonl")
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["grade"] for line in lines] == ["A", "A"]
+
+
+def test_unknown_format_is_rejected(roster):
+    with pytest.raises(ValueError, match="Unsupported format"):
+        export_students(roster.iter_students(), "-", "xml")
@@ -0,0 +1,83 @@
+import pytest
+
+from conftest import make_student
+
+
+@pytest.fixture
+def course(cached_db):
+    cached_db.add_students_bulk([
+        make_student(i, student_id=f"2024{i:03d}", course="Law", grade="N/A")
+        for i in range(1, 5)] + [make_student(9, student_id="2024009", course="Music")])
+    cached_db.add_assessment("Law", "exam", weight=3)
+    cached_db.add_assessment("Law", "quiz", weight=1, max_score=20)
+    return cached_db
+
+
+def grades(db, course="Law"):
+    return {row["student_id"]: row["grade"] for row in db.filter_by_course(course)}
+
+
+def test_record_scores_skips_bad_scores_and_other_courses(course):
+    recorded = course.record_scores("Law", "quiz", [("2024001", 20), ("2024002", 21),
+                                                    ("2024003", -1), ("2024009", 10),
+                                                    ("2024999", 10)])
+    assert recorded == 1
+    with pytest.raises(ValueError, match="no assessment"):
+        course.record_scores("Law", "essay", [("2024001", 50)])
+    with pytest.raises(ValueError, match="chunk_size"):
+        course.record_scores("Law", "quiz", [("2024001", 5)], chunk_size=0)
+
+
+def test_regrade_writes_weighted_grades(course):
+    # exam weighs 3, quiz 1: (3 * exam% + quiz%) / 4
+    course.record_scores("Law", "exam", [("2024001", 95), ("2024002", 80), ("2024003", 50)],
+                         chunk_size=2)
+    course.record_scores("Law", "quiz", [("2024001", 17), ("2024002", 20), ("2024003", 20)])
+    final = {row["student_id"]: (round(row["final_score"], 2), row["grade"])
+             for row in course.get_final_grades("Law")}
+    assert final == {"2024001": (92.5, "A"), "2024002": (85.0, "B"), "2024003": (62.5, "D")}
+
+    result = course.regrade_course("Law")
+    assert result.graded == 3
+    assert result.changed == [("2024001", "N/A", "A"), ("2024002", "N/A", "B"),
+                              ("2024003", "N/A", "D")]
+    assert grades(course) == {"2024001": "A", "2024002": "B", "2024003": "D", "2024004": "N/A"}
+    assert grades(course, "Music") == {"2024009": "B"}
+
+    # A second regrade only reports what changed since
+    course.record_scores("Law", "exam", [("2024003", 100)])
+    result = course.regrade_course("Law")
+    assert result.changed == [("2024003", "D", "A")]
+
+
+def test_regrade_dry_run_writes_nothing(course):
+    course.record_scores("Law", "exam", [("2024001", 30)])
+    result = course.regrade_course("Law", dry_run=True)
+    assert result.dry_run
+    assert result.changed == [("2024001", "N/A", "F")]
+    assert "would change 1 grades" in result.summary()
+    assert grades(course)["2024001"] == "N/A"
+
+
+def test_regrade_updates_the_summary_tables(course):
+    (before,) = course.get_course_statistics("Law")
+    assert before.grades == {"N/A": 4}
+    # A missing quiz counts as zero: 3/4 of 95% is a C
+    course.record_scores("Law", "exam", [("2024001", 95), ("2024002", 95), ("2024003", 10)])
+    course.regrade_course("Law")
+
+    (after,) = course.get_course_statistics("Law")
+    assert after.grades == {"C": 2, "F": 1, "N/A": 1}
+    assert after.students == 4
+    assert course.get_overall_statistics().grades == {"B": 1, "C": 2, "F": 1, "N/A": 1}
+    assert [row["student_id"] for row in course.filter_by_grade("C")] == ["2024001", "2024002"]
+
+
+def test_deleted_assessment_drops_out_of_the_grade(course):
+    course.record_scores("Law", "exam", [("2024001", 100)])
+    course.record_scores("Law", "quiz", [("2024001", 0)])
+    assert course.get_final_grades("Law")[0]["grade"] == "C"
+    assert course.delete_assessment("Law", "quiz")
+    assert not course.delete_assessment("Law", "quiz")
+    assert [row["name"] for row in course.get_assessments("Law")] == ["exam"]
+    assert course.get_final_grades("Law")[0]["grade"] == "A"
@@ -0,0 +1,157 @@
+import queue
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+import gui
+from conftest import make_student
+from database import DEFAULT_SORT
+from gui import StudentManagementGUI
+
+
+@pytest.fixture
+def loader(db, monkeypatch):
+    """A GUI object with only the state the background loader uses (no Tk window)"""
+    monkeypatch.setattr(gui, "LOAD_BATCH_SIZE", 4)
+    app = StudentManagementGUI.__new__(StudentManagementGUI)
+    app.db = db
+    app._sort = tuple(DEFAULT_SORT)
+    app._load_generation = 1
+    return app
+
+
+def drain(batches):
+    messages = []
+    while True:
+        try:
+            messages.append(batches.get_nowait())
+        except queue.Empty:
+            return messages
+
+
+def test_worker_streams_total_then_batches_then_done(loader, db):
+    db.add_students_bulk([make_student(i, student_id=f"2024{i:03d}",
+                                       course="Law" if i % 2 else "Nursing")
+                          for i in range(1, 11)])
+    batches = queue.Queue()
+    loader._fetch_students(1, batches, {})
+    messages = drain(batches)
+
+    assert messages[0] == ("total", 10)
+    assert messages[-1] == ("done", None)
+    rows = [row for kind, batch in messages if kind == "rows" for row in batch]
+    assert [len(batch) for kind, batch in messages if kind == "rows"] == [4, 4, 2]
+    assert [iid for iid, _ in rows] == [f"2024{i:03d}" for i in range(1, 11)]
+    assert rows[0][1] == StudentManagementGUI._student_values(db.get_student("2024001"))
+
+
+def test_worker_applies_filters_and_sort(loader, db):
+    db.add_students_bulk([make_student(i, student_id=f"2024{i:03d}", course="Law",
+                                       attendance_percent=float(i * 10))
+                          for i in range(1, 6)]
+                         + [make_student(9, student_id="2024009", course="Nursing")])
+    loader._sort = (("attendance_percent", True),)
+    batches = queue.Queue()
+    loader._fetch_students(1, batches, {"course": "Law"})
+    messages = drain(batches)
+
+    assert messages[0] == ("total", 5)
+    rows = [iid for kind, batch in messages if kind == "rows" for iid, _ in batch]
+    assert rows == ["2024005", "2024004", "2024003", "2024002", "2024001"]
+
+
+def test_superseded_load_stops_without_finishing(loader, db):
+    db.add_students_bulk([make_student(i) for i in range(10)])
+    loader._load_generation = 2
+    batches = queue.Queue()
+    loader._fetch_students(1, batches, {})
+    assert drain(batches) == [("total", 10)]
+
+
+def test_worker_reports_errors_instead_of_raising(loader):
+    batches = queue.Queue()
+    loader._fetch_students(1, batches, {"no_such_filter": 1})
+    kind, error = drain(batches)[-1]
+    assert kind == "error"
+    assert isinstance(error, Exception)
+
+
+class Scheduler:
+    """Stands in for the Tk root: records root.after callbacks instead of running them"""
+
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, func, *args):
+        self.calls.append(func)
+
+
+def test_changes_committed_during_a_load_are_picked_up_after_it(loader, db_path):
+    from database import DatabaseManager
+
+    refreshes = []
+    loader.root = Scheduler()
+    loader.refresh_changes = lambda: refreshes.append(loader.db.data_version())
+    loader._data_version = loader.db.data_version()  # recorded when the load started
+    loader._loading, loader._refreshing = True, False
+
+    other = DatabaseManager(db_path)
+    other.add_student(make_student(1))
+    other.close()
+    loader._watch_database()
+    assert refreshes == []  # not while the load is still reading
+
+    loader._loading = False
+    loader._watch_database()
+    assert len(refreshes) == 1
+
+
+def test_run_releases_the_shared_database_even_if_the_main_loop_fails(db_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import database
+
+    class FailingRoot:
+        def mainloop(self):
+            raise RuntimeError("window crashed")
+
+    app = StudentManagementGUI.__new__(StudentManagementGUI)
+    app.db = database.DatabaseManager(db_path, shared=True)
+    app.root = FailingRoot()
+    app._loader = ThreadPoolExecutor(max_workers=1)
+    app._load_generation = 1
+    state = app.db._shared
+    assert state in database._shared_states.values()
+
+    with pytest.raises(RuntimeError):
+        app.run()
+    assert app.db._shared is None
+    assert state not in database._shared_states.values()
+    assert app._load_generation == 2
+
+
+def test_run_closes_the_loader_connection_of_a_pool_still_in_use(db_path):
+    from concurrent.futures import ThreadPoolExecutor
+    import sqlite3
+
+    import database
+
+    class ClosedRoot:
+        def mainloop(self):
+            pass
+
+    menu = database.DatabaseManager(db_path, shared=True)
+    app = StudentManagementGUI.__new__(StudentManagementGUI)
+    app.db = database.DatabaseManager(db_path, shared=True)
+    app.root = ClosedRoot()
+    app._loader = ThreadPoolExecutor(max_workers=1)
+    app._load_generation = 1
+    loader_conn = app._loader.submit(app.db.pool.get_connection).result()
+
+    app.run()
+    with pytest.raises(sqlite3.ProgrammingError):
+        loader_conn.execute("SELECT 1;")
+    assert menu.pool.get_connection().execute("SELECT 1;").fetchone()[0] == 1
+    assert loader_conn not in menu.pool._connections
+    menu.close()
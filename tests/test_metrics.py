@@ -0,0 +1,94 @@
+import logging
+
+import pytest
+
+from conftest import make_student
+from database import DatabaseManager
+from metrics import QueryMetrics, redact_params
+
+
+@pytest.fixture
+def instrumented(db_path):
+    manager = DatabaseManager(db_path, instrument=True, slow_query_ms=None)
+    yield manager
+    manager.close()
+
+
+def test_queries_are_attributed_to_their_method(instrumented):
+    instrumented.add_student(make_student(1, student_id="2024001"))
+    instrumented.get_student("2024001")
+    instrumented.get_student("2024999")
+    snapshot = instrumented.metrics_snapshot()
+    assert snapshot["get_student"]["calls"] == 2
+    assert snapshot["get_student"]["queries"] == 2
+    assert snapshot["get_student"]["rows"] == 1
+    assert snapshot["get_student"]["errors"] == 0
+    assert snapshot["add_student"]["calls"] == 1
+
+
+def test_streaming_queries_are_attributed_lazily(instrumented):
+    instrumented.add_students_bulk([make_student(i) for i in range(3)])
+    assert len(list(instrumented.iter_students())) == 3
+    assert instrumented.metrics_snapshot()["iter_students"]["rows"] == 3
+
+
+def test_uninstrumented_manager_has_no_metrics(db):
+    assert db.metrics is None
+    assert db.metrics_snapshot() is None
+
+
+def test_failed_query_is_counted():
+    metrics = QueryMetrics(slow_query_ms=None)
+    metrics.record_query("get_student", "SELECT 1;", (), 0.002, 0, failed=True)
+    entry = metrics.snapshot()["get_student"]
+    assert entry["errors"] == 1
+    assert entry["max_ms"] == 2.0
+
+
+def test_slow_queries_are_logged_without_their_values(caplog):
+    metrics = QueryMetrics(slow_query_ms=1)
+    with caplog.at_level(logging.WARNING):
+        metrics.record_query("search_students", "SELECT *\n  FROM students WHERE email = ?;",
+                             ("secret@example.edu",), 0.005, 1)
+        metrics.record_query("search_students", "SELECT 1;", (), 0.0001, 1)
+    assert metrics.slow_queries == 1
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert "SELECT * FROM students WHERE email = ?;" in message
+    assert "secret" not in message and "<str>" in message
+    assert redact_params({"id": 1}) == "{id: <int>}"
+
+
+def test_prometheus_output():
+    metrics = QueryMetrics(slow_query_ms=None, buckets=(0.001, 0.01))
+    metrics.record_call('get_"student"')
+    metrics.record_query('get_"student"', "SELECT 1;", (), 0.0005, 1)
+    metrics.record_query('get_"student"', "SELECT 1;", (), 0.005, 2)
+    metrics.record_query('get_"student"', "SELECT 1;", (), 0.5, 0)
+    lines = metrics.to_prometheus(prefix="test").splitlines()
+
+    label = 'method="get_\\"student\\""'
+    assert "# TYPE test_calls_total counter" in lines
+    assert f"test_calls_total{{{label}}} 1" in lines
+    assert f"test_queries_total{{{label}}} 3" in lines
+    assert f"test_rows_total{{{label}}} 3" in lines
+    assert "# TYPE test_query_duration_seconds histogram" in lines
+    assert f'test_query_duration_seconds_bucket{{{label},le="0.001"}} 1' in lines
+    assert f'test_query_duration_seconds_bucket{{{label},le="0.01"}} 2' in lines
+    assert f'test_query_duration_seconds_bucket{{{label},le="+Inf"}} 3' in lines
+    assert f"test_query_duration_seconds_count{{{label}}} 3" in lines
+    assert "test_slow_queries_total 0" in lines
+    for line in lines:
+        assert line.startswith("# ") or line.startswith("test_")
+
+
+def test_manager_prometheus_includes_startup_and_cache(db_path):
+    manager = DatabaseManager(db_path, instrument=True, result_cache_size=8)
+    try:
+        manager.get_unique_courses()
+        text = manager.metrics_prometheus()
+    finally:
+        manager.close()
+    assert 'student_db_calls_total{method="get_unique_courses"} 1' in text
+    assert 'student_db_startup_seconds{phase="init"}' in text
+    assert "student_db_result_cache_" in text
@@ -0,0 +1,70 @@
+import sqlite3
+import threading
+
+from database import DatabaseManager, LATEST_SCHEMA_VERSION, MIGRATIONS
+
+
+def build(path, version):
+    """A database migrated step by step up to version, like an older release left it"""
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    for target, _, migration in MIGRATIONS:
+        if target > version:
+            break
+        migration(cursor)
+    cursor.execute(f"PRAGMA user_version = {version};")
+    conn.commit()
+    conn.close()
+
+
+def tables(db):
+    with db.get_db_cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table';")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def test_versions_are_consecutive():
+    assert [target for target, _, _ in MIGRATIONS] == list(range(1, LATEST_SCHEMA_VERSION + 1))
+
+
+def test_new_database_is_current_without_planner_statistics(db):
+    assert db.schema_version() == LATEST_SCHEMA_VERSION
+    assert "sqlite_stat1" not in tables(db)
+
+
+def test_upgrade_from_an_earlier_release(db_path):
+    build(db_path, 9)
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO students (full_name, student_id, course, email) "
+                 "VALUES ('A', '2030000041', 'Law', 'a@example.edu');")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(db_path)
+    assert db.schema_version() == LATEST_SCHEMA_VERSION
+    assert "sqlite_stat1" not in tables(db)
+    assert db.allocate_student_id(2030) == "2030000042"
+    db.close()
+
+
+def test_id_width_migration_can_run_twice(db):
+    with db.get_db_cursor() as cursor:
+        for target, _, migration in MIGRATIONS:
+            if target >= 10:
+                migration(cursor)
+    assert db.allocate_student_id(2030) == "2030001"
+
+
+def test_migrating_closes_only_its_own_connection(db_path):
+    db = DatabaseManager(db_path, shared=True)
+    other = []
+    worker = threading.Thread(target=lambda: other.append(db.pool.get_connection()))
+    worker.start()
+    worker.join()
+    own = db.pool.get_connection()
+    own.execute(f"PRAGMA user_version = {LATEST_SCHEMA_VERSION - 1};")
+
+    assert db.migrate() == LATEST_SCHEMA_VERSION
+    assert db.pool.get_connection() is not own
+    assert other[0].execute("PRAGMA user_version;").fetchone()[0] == LATEST_SCHEMA_VERSION
+    db.close()
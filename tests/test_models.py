@@ -0,0 +1,56 @@
+import pytest
+
+from conftest import make_student
+from models import STUDENT_COLUMNS, Student, StudentValidationError
+
+
+def test_validate_normalizes_input():
+    student = Student.validate(make_student(1, full_name="  Ada Lovelace ", grade="a",
+                                            email=" ada@example.edu "))
+    assert student.full_name == "Ada Lovelace"
+    assert student.email == "ada@example.edu"
+    assert student.grade == "A"
+    assert student.student_id is None
+
+
+def test_validate_reports_every_invalid_field():
+    with pytest.raises(StudentValidationError) as caught:
+        Student.validate(make_student(1, email="not-an-email", attendance_percent=150,
+                                      grade="Z"))
+    assert set(caught.value.errors) == {"email", "attendance_percent", "grade"}
+
+
+def test_validate_many_matches_validate():
+    records = [make_student(1), make_student(2, email="bad"), make_student(3, grade="c")]
+    students, errors = Student.validate_many(records)
+    assert students[0] == Student.validate(records[0])
+    assert students[1] is None and errors[1]
+    assert students[2].grade == "C" and errors[2] is None
+
+
+def test_validate_changes_skips_blank_fields():
+    changes = Student.validate_changes({"grade": "b", "email": "", "phone": None,
+                                        "attendance_percent": "75"})
+    assert changes == {"grade": "B", "attendance_percent": 75.0}
+
+
+def test_validate_changes_rejects_id_unknown_and_invalid_fields():
+    with pytest.raises(StudentValidationError) as caught:
+        Student.validate_changes({"student_id": "2024001", "nickname": "x", "grade": "Q"})
+    assert caught.value.errors["student_id"] == "cannot be changed"
+    assert caught.value.errors["nickname"] == "cannot be changed"
+    assert "grade" in caught.value.errors
+
+
+def test_from_row_and_from_rows_read_database_rows(db):
+    db.add_student(make_student(1, student_id="2024001"))
+    db.add_student(make_student(2, student_id="2024002", phone=""))
+    rows = db.get_all_students()
+
+    single = Student.from_row(rows[0])
+    assert single.to_dict() == {column: rows[0][column] for column in STUDENT_COLUMNS}
+    assert Student.from_rows(rows) == [Student.from_row(row) for row in rows]
+    assert Student.from_rows([dict(row) for row in rows]) == Student.from_rows(rows)
+    assert Student.from_rows([tuple(row[c] for c in STUDENT_COLUMNS) for row in rows]) \
+        == Student.from_rows(rows)
+    assert Student.from_rows([]) == []
@@ -0,0 +1,84 @@
+import pytest
+
+from conftest import make_student
+from database import decode_page_token, encode_page_token
+
+
+@pytest.fixture
+def roster(db):
+    # Pairs of students share a name, so pages must break ties by ID
+    db.add_students_bulk([
+        make_student(i, student_id=f"2024{i:03d}", full_name=f"Student {i // 2:02d}",
+                     course=("Law", "Music")[i % 2], grade="ABC"[i % 3],
+                     attendance_percent=float((i * 7) % 50 + 40))
+        for i in range(1, 24)])
+    return db
+
+
+def collect(fetch_page, limit):
+    rows, token, pages = [], None, 0
+    while True:
+        page = fetch_page(limit=limit, page_token=token)
+        assert len(page.rows) <= limit
+        rows.extend(page.rows)
+        pages += 1
+        if not page.has_more:
+            return rows, pages
+        token = page.next_token
+
+
+def ids(rows):
+    return [row["student_id"] for row in rows]
+
+
+def by_name(rows):
+    return ids(sorted(rows, key=lambda row: (row["full_name"], row["student_id"])))
+
+
+@pytest.mark.parametrize("limit", [1, 4, 23, 50])
+def test_pages_cover_every_row_once(roster, limit):
+    rows, pages = collect(roster.get_students_page, limit)
+    assert ids(rows) == by_name(roster.get_all_students())
+    assert pages == max(1, -(-23 // limit))
+
+
+def test_filtered_pages(roster):
+    rows, _ = collect(lambda **kw: roster.filter_by_course_page("Law", **kw), 3)
+    assert ids(rows) == by_name(roster.filter_by_course("Law"))
+    rows, _ = collect(lambda **kw: roster.filter_by_grade_page("b", **kw), 2)
+    assert ids(rows) == by_name(roster.filter_by_grade("B"))
+    rows, _ = collect(lambda **kw: roster.search_students_page("Student 1", **kw), 4)
+    assert ids(rows) == by_name(roster.search_students("Student 1"))
+
+
+def test_attendance_pages_are_ordered_by_attendance(roster):
+    rows, _ = collect(lambda **kw: roster.filter_by_attendance_page(70, **kw), 3)
+    expected = sorted(roster.filter_by_attendance(70),
+                      key=lambda row: (row["attendance_percent"], row["student_id"]))
+    assert ids(rows) == ids(expected)
+
+
+def test_inserts_before_the_token_do_not_shift_later_pages(roster):
+    first = roster.get_students_page(limit=5)
+    roster.add_student(make_student(99, full_name="Aaron First"))
+    second = roster.get_students_page(limit=5, page_token=first.next_token)
+    assert ids(second.rows) == by_name(roster.get_all_students())[6:11]
+
+
+def test_empty_result_has_no_next_page(roster):
+    page = roster.filter_by_course_page("Astronomy")
+    assert page.rows == [] and not page.has_more
+
+
+def test_tokens_round_trip_and_reject_garbage(roster):
+    assert decode_page_token(encode_page_token(("Ann", "2024001")), 2) == ("Ann", "2024001")
+    for token in ("not base64!", encode_page_token(("Ann",))):
+        with pytest.raises(ValueError, match="Invalid page token"):
+            roster.get_students_page(page_token=token)
+    with pytest.raises(ValueError, match="limit"):
+        roster.get_students_page(limit=0)
+
+
+def test_positional_jumps_match_the_pages(roster):
+    rows, _ = collect(roster.get_students_page, 5)
+    assert ids(roster.get_students_at(10, limit=5)) == ids(rows[10:15])
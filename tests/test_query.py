@@ -0,0 +1,85 @@
+import pytest
+
+from conftest import make_student
+from query import StudentQuery, compile_statement, compiled_statement_cache_info
+
+
+@pytest.fixture
+def roster(db):
+    db.add_students_bulk([
+        make_student(1, student_id="2024001", course="Law", grade="D", attendance_percent=40,
+                     phone="+233-24-000-0003"),
+        make_student(2, student_id="2024002", course="Law", grade="F", attendance_percent=70,
+                     phone=None),
+        make_student(3, student_id="2024003", course="Law", grade="A", attendance_percent=20,
+                     phone="+233-24-000-0001"),
+        make_student(4, student_id="2024004", course="Art", grade="F", attendance_percent=10,
+                     phone=None),
+        make_student(5, student_id="2023005", course="Law", grade="F", attendance_percent=50,
+                     phone="+233-24-000-0002"),
+    ])
+    return db
+
+
+def ids(rows):
+    return [row["student_id"] for row in rows]
+
+
+def pages(db, query, limit):
+    seen, token = [], None
+    while True:
+        page = db.query_students_page(query, limit, token)
+        seen += ids(page.rows)
+        if not page.has_more:
+            return seen
+        token = page.next_token
+
+
+def test_filters_combine_with_and(roster):
+    query = StudentQuery().where(course="Law", grade=("D", "F"), attendance_below=60)
+    assert sorted(ids(roster.query_students(query))) == ["2023005", "2024001"]
+    assert roster.count_query_students(query) == 2
+    assert ids(roster.query_students(query.where(year=2024))) == ["2024001"]
+    assert len(roster.query_students(query.where(grade=None))) == 3
+
+
+def test_order_and_window(roster):
+    query = StudentQuery().order_by("attendance_percent", descending=True).take(2, 1)
+    assert ids(roster.query_students(query)) == ["2023005", "2024001"]
+    assert ids(roster.iter_query_students(query)) == ["2023005", "2024001"]
+
+
+def test_queries_are_immutable_and_validated():
+    base = StudentQuery().where(course="Law")
+    narrowed = base.where(grade="A")
+    assert base.filter_dict() == {"course": "Law"}
+    assert narrowed.filter_dict() == {"course": "Law", "grade": "A"}
+    with pytest.raises(TypeError):
+        base.where(colour="red")
+    with pytest.raises(ValueError):
+        base.take(-1)
+
+
+def test_repeated_shapes_reuse_compiled_sql(roster):
+    before = compiled_statement_cache_info()["compile_statement"]["hits"]
+    for course in ("Law", "Art", "Law"):
+        roster.query_students(StudentQuery().where(course=course))
+    assert compiled_statement_cache_info()["compile_statement"]["hits"] >= before + 2
+    assert compile_statement("*", "", (("full_name", False),)) is \
+        compile_statement("*", "", (("full_name", False),))
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_pages_keep_rows_with_null_sort_values(roster, descending, limit):
+    query = StudentQuery().order_by("phone", descending)
+    expected = ids(roster.query_students(query))
+    assert len(expected) == 5
+    assert pages(roster, query, limit) == expected
+    filtered = query.where(course="Law")
+    assert pages(roster, filtered, limit) == ids(roster.query_students(filtered))
+
+
+def test_bad_page_token_is_rejected(roster):
+    with pytest.raises(ValueError):
+        roster.query_students_page(StudentQuery(), 2, "not-a-token")
@@ -0,0 +1,36 @@
+import pytest
+
+from conftest import make_student
+
+# Full-text search is served by the FTS index, then sorted by name
+FTS_METHODS = {"search_students", "search_students_page"}
+
+
+@pytest.fixture
+def plans(db):
+    db.add_students_bulk([make_student(i) for i in range(50)])
+    return db.explain_queries()
+
+
+def test_every_public_query_is_explained(plans):
+    assert {"get_student", "update_student", "delete_student", "get_all_students",
+            "get_unique_courses", "query_students"} <= set(plans)
+    assert all(plan for plan in plans.values())
+
+
+def test_no_query_scans_the_table(plans):
+    for name, plan in plans.items():
+        for step in plan:
+            assert not (step.startswith("SCAN students ") and "INDEX" not in step), (name, plan)
+            if name not in FTS_METHODS:
+                assert "TEMP B-TREE" not in step, (name, plan)
+
+
+def test_lookups_and_seeks_use_an_index(plans):
+    for name in ("get_student", "update_student", "delete_student"):
+        assert plans[name] == ["SEARCH students USING INDEX sqlite_autoindex_students_1 "
+                               "(student_id=?)"]
+    for name in ("get_students_page", "filter_by_course_page", "filter_by_attendance_page",
+                 "filter_by_grade_page", "filter_by_course", "filter_by_grade"):
+        assert plans[name][0].startswith("SEARCH students USING INDEX idx_students_"), name
+    assert "COVERING INDEX" in plans["get_unique_courses"][0]
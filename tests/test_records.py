@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from conftest import make_student
+from database import STUDENT_COLUMNS
+from records import Record
+
+
+@pytest.fixture
+def record(db):
+    db.add_student(make_student(1, student_id="2024001", full_name="Ann Lee", grade="A"))
+    return db.get_student("2024001")
+
+
+def test_rows_are_records(record):
+    assert isinstance(record, Record)
+    assert tuple(record.keys()) == STUDENT_COLUMNS
+
+
+def test_dict_style_access(record):
+    assert record["full_name"] == "Ann Lee"
+    assert record["FULL_NAME"] == "Ann Lee"
+    assert record.get("grade") == "A"
+    assert record.get("nickname") is None
+    assert record.get("nickname", "-") == "-"
+    with pytest.raises(IndexError):
+        record["nickname"]
+    assert "email" in record and "nickname" not in record
+    assert dict(record.items()) == dict(record)
+    assert record.values() == list(record)
+
+
+def test_attribute_and_position_access(record):
+    assert record.full_name == "Ann Lee"
+    assert record.student_id == record[2] == "2024001"
+    assert record[1:3] == ("Ann Lee", "2024001")
+    with pytest.raises(AttributeError):
+        record.nickname
+    assert getattr(record, "nickname", None) is None
+    _, full_name, student_id, *_ = record
+    assert (full_name, student_id) == ("Ann Lee", "2024001")
+
+
+def test_asdict_and_json(record):
+    as_dict = record._asdict()
+    assert type(as_dict) is dict
+    assert list(as_dict) == list(STUDENT_COLUMNS)
+    assert as_dict == dict(record)
+    assert json.loads(json.dumps(record._asdict()))["grade"] == "A"
+
+
+def test_records_are_read_only_and_compact(record):
+    with pytest.raises(TypeError):
+        record["grade"] = "B"
+    with pytest.raises(AttributeError):
+        record.grade = "B"
+    assert not hasattr(record, "__dict__")
+    assert "full_name='Ann Lee'" in repr(record)
@@ -0,0 +1,84 @@
+import pytest
+
+from conftest import make_student
+from records import Record
+
+
+@pytest.fixture
+def roster(cached_db):
+    cached_db.add_students_bulk([
+        make_student(1, student_id="2024001", course="Law", grade="A", attendance_percent=90),
+        make_student(2, student_id="2024002", course="Law", grade="C", attendance_percent=60),
+        make_student(3, student_id="2024003", course="Nursing", grade="A", attendance_percent=70),
+    ])
+    return cached_db
+
+
+def ids(rows):
+    return sorted(row["student_id"] for row in rows)
+
+
+def test_get_student_returns_a_record_with_or_without_cache(db, roster):
+    db.add_student(make_student(9, student_id="2024009"))
+    for manager, student_id in ((db, "2024009"), (roster, "2024001"), (roster, "2024001")):
+        student = manager.get_student(student_id)
+        assert isinstance(student, Record)
+        assert student.student_id == student_id
+    assert roster.cache_stats()["hits"] >= 1
+
+
+def test_missing_student_is_cached_as_none(roster):
+    assert roster.get_student("1999001") is None
+    assert roster.get_student("1999001") is None
+    roster.add_student(make_student(4, student_id="1999001"))
+    assert roster.get_student("1999001")["full_name"] == "Student 00004"
+
+
+def test_update_invalidates_the_student_and_old_and_new_course(roster):
+    assert ids(roster.filter_by_course("Law")) == ["2024001", "2024002"]
+    assert ids(roster.filter_by_course("Nursing")) == ["2024003"]
+    assert roster.get_student("2024002")["course"] == "Law"
+
+    roster.update_student("2024002", {"course": "Nursing"})
+    assert roster.get_student("2024002")["course"] == "Nursing"
+    assert ids(roster.filter_by_course("Law")) == ["2024001"]
+    assert ids(roster.filter_by_course("Nursing")) == ["2024002", "2024003"]
+
+
+def test_grade_and_attendance_filters_are_invalidated(roster):
+    assert ids(roster.filter_by_grade("A")) == ["2024001", "2024003"]
+    assert ids(roster.filter_by_attendance(75)) == ["2024002", "2024003"]
+
+    roster.update_student("2024001", {"grade": "F", "attendance_percent": 10})
+    assert ids(roster.filter_by_grade("A")) == ["2024003"]
+    assert ids(roster.filter_by_grade("F")) == ["2024001"]
+    assert ids(roster.filter_by_attendance(75)) == ["2024001", "2024002", "2024003"]
+
+
+def test_unrelated_entries_survive_a_write(roster):
+    roster.filter_by_course("Nursing")
+    roster.update_student("2024001", {"phone": "+233-24-000-0000"})
+    hits = roster.cache_stats()["hits"]
+    roster.filter_by_course("Nursing")
+    assert roster.cache_stats()["hits"] == hits + 1
+
+
+def test_delete_and_course_list(roster):
+    assert roster.get_unique_courses() == ["Law", "Nursing"]
+    roster.delete_student("2024003")
+    assert roster.get_student("2024003") is None
+    assert roster.get_unique_courses() == ["Law"]
+
+
+def test_bulk_writes_clear_the_cache(roster):
+    assert ids(roster.filter_by_course("Law")) == ["2024001", "2024002"]
+    roster.update_students({"course": "Nursing"}, ["2024001"])
+    assert ids(roster.filter_by_course("Law")) == ["2024002"]
+    roster.add_students_bulk([make_student(5, student_id="2024005", course="Law")])
+    assert ids(roster.filter_by_course("Law")) == ["2024002", "2024005"]
+
+
+def test_cached_lists_are_copies(roster):
+    rows = roster.filter_by_course("Law")
+    rows.clear()
+    assert len(roster.filter_by_course("Law")) == 2
@@ -0,0 +1,65 @@
+import pytest
+
+from conftest import make_student
+from query import fts_match_expression
+
+
+@pytest.fixture
+def roster(db):
+    db.add_students_bulk([
+        make_student(1, full_name="Ama Mensah", student_id="2024001"),
+        make_student(2, full_name="Kofi Mensah-Bonsu", course="Law", student_id="2024002"),
+        make_student(3, full_name="Jonathan Doe", student_id="2024003"),
+    ])
+    return db
+
+
+def names(rows):
+    return sorted(row["full_name"] for row in rows)
+
+
+def test_match_expression_prefixes_every_word():
+    assert fts_match_expression("jo doe") == '"jo"* "doe"*'
+    assert fts_match_expression("  -- ") is None
+
+
+def test_full_text_index_is_used(roster):
+    assert roster.fts_enabled
+
+
+def test_every_word_matches_a_prefix(roster):
+    assert names(roster.search_students("mens")) == ["Ama Mensah", "Kofi Mensah-Bonsu"]
+    assert names(roster.search_students("jo do")) == ["Jonathan Doe"]
+    assert names(roster.search_students("law")) == ["Kofi Mensah-Bonsu"]
+    assert roster.search_students("mensah law doe") == []
+
+
+def test_punctuation_only_term_falls_back_to_like(roster):
+    assert names(roster.search_students("-")) == ["Kofi Mensah-Bonsu"]
+
+
+def test_index_follows_updates_and_deletes(roster):
+    roster.update_student("2024003", {"full_name": "Jonathan Appiah"})
+    assert roster.search_students("doe") == []
+    assert names(roster.search_students("appiah")) == ["Jonathan Appiah"]
+    roster.delete_student("2024001")
+    assert names(roster.search_students("mensah")) == ["Kofi Mensah-Bonsu"]
+
+
+def test_rebuild_keeps_results(roster):
+    roster.rebuild_search_index()
+    assert names(roster.search_students("mensah")) == ["Ama Mensah", "Kofi Mensah-Bonsu"]
+
+
+def test_like_fallback_matches_substrings(roster):
+    roster.fts_enabled = False
+    assert names(roster.search_students("ensa")) == ["Ama Mensah", "Kofi Mensah-Bonsu"]
+
+
+def test_streaming_and_paged_search_agree(roster):
+    rows = list(roster.iter_search_students("mensah"))
+    page = roster.search_students_page("mensah", limit=1)
+    assert names(rows) == ["Ama Mensah", "Kofi Mensah-Bonsu"]
+    assert page.has_more and len(page.rows) == 1
+    rest = roster.search_students_page("mensah", limit=1, page_token=page.next_token)
+    assert names(page.rows + rest.rows) == names(rows)
@@ -0,0 +1,131 @@
+import pytest
+
+from conftest import make_student
+from query import compile_statement
+
+
+@pytest.fixture
+def roster(db):
+    db.add_students_bulk([
+        make_student(1, student_id="2024001", full_name="Cara", course="Law",
+                     attendance_percent=9.5, grade="B"),
+        make_student(2, student_id="2024002", full_name="Abel", course="Law",
+                     attendance_percent=85.0, grade="A"),
+        make_student(3, student_id="2024003", full_name="Bea", course="Nursing",
+                     attendance_percent=100.0, grade="B"),
+        make_student(4, student_id="2024004", full_name="Abel", course="Nursing",
+                     attendance_percent=42.0, grade="A"),
+        make_student(5, student_id="2024005", full_name="Dan", course="Law",
+                     attendance_percent=85.0, grade="C"),
+    ])
+    return db
+
+
+def ids(rows):
+    return [row["student_id"] for row in rows]
+
+
+def test_attendance_sorts_numerically(roster):
+    rows = roster.get_students_sorted([("attendance_percent", False)])
+    assert ids(rows) == ["2024001", "2024004", "2024002", "2024005", "2024003"]
+    rows = roster.get_students_sorted([("attendance_percent", True)])
+    assert ids(rows) == ["2024003", "2024005", "2024002", "2024004", "2024001"]
+
+
+def test_course_and_grade_ties_are_ordered_by_name_then_id(roster):
+    assert ids(roster.get_students_sorted([("course", False)])) == \
+        ["2024002", "2024001", "2024005", "2024004", "2024003"]
+    assert ids(roster.get_students_sorted([("grade", True)])) == \
+        ["2024005", "2024001", "2024003", "2024004", "2024002"]
+
+
+def test_explicit_tie_breaks_win(roster):
+    rows = roster.get_students_sorted([("course", False), ("attendance_percent", True)])
+    assert ids(rows) == ["2024005", "2024002", "2024001", "2024003", "2024004"]
+
+
+@pytest.mark.parametrize("sort", [
+    [("full_name", False)], [("course", False)], [("course", True)], [("grade", False)],
+    [("attendance_percent", True)], [("phone", False)], [("created_at", False)],
+    [("email", True)], [("student_id", False)], [("course", False), ("full_name", False)],
+])
+def test_single_index_sorts_need_no_temp_btree(roster, sort):
+    order = roster._normalize_sort(sort)
+    with roster.get_db_cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + compile_statement("*", "", order, None, True),
+                       (10, 0))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+    assert "TEMP B-TREE" not in plan
+
+
+def test_sorting_combines_with_filters_and_seeks(roster):
+    sort = [("attendance_percent", True)]
+    first = roster.get_students_sorted(sort, limit=1, course="Law")
+    assert ids(first) == ["2024005"]
+    rest = roster.get_students_sorted(sort, after=roster.sort_key(first[0], sort),
+                                      course="Law")
+    assert ids(rest) == ["2024002", "2024001"]
+    assert ids(roster.get_students_sorted(sort, offset=1, course="Law")) == ids(rest)
+    assert roster.count_students(course="Law") == 3
+
+
+def test_student_position_matches_the_sorted_order(roster):
+    sort = [("course", True), ("full_name", True)]
+    rows = roster.get_students_sorted(sort)
+    for position, row in enumerate(rows):
+        assert roster.student_position(row, sort) == position
+
+
+def test_unknown_sort_column_is_rejected(roster):
+    with pytest.raises(ValueError):
+        roster.get_students_sorted([("id; DROP TABLE students", False)])
+
+
+@pytest.fixture
+def sparse(db):
+    """Students with NULLs in the nullable sort columns"""
+    db.add_students_bulk([
+        make_student(i, student_id=f"2024{i:03d}", course=("Law", "Art")[i % 2],
+                     phone=None if i % 3 == 0 else f"+233-24-000-{i % 4:04d}",
+                     grade=None if i % 4 == 0 else "ABC"[i % 3],
+                     attendance_percent=None if i % 5 == 0 else float(i % 3 * 10))
+        for i in range(1, 14)])
+    return db
+
+
+NULL_SORTS = [
+    [("phone", False)], [("phone", True)], [("grade", False)], [("grade", True)],
+    [("attendance_percent", True), ("phone", False)],
+    [("phone", True), ("grade", True), ("attendance_percent", True)],
+    [("course", False), ("phone", True)], [("grade", False), ("full_name", True)],
+]
+
+
+@pytest.mark.parametrize("sort", NULL_SORTS)
+@pytest.mark.parametrize("page_size", [1, 2, 5])
+def test_seeks_past_null_sort_values(sparse, sort, page_size):
+    expected = ids(sparse.get_students_sorted(sort, limit=100))
+    assert len(expected) == sparse.count_students()
+
+    seen, after = [], None
+    while True:
+        rows = sparse.get_students_sorted(sort, limit=page_size, after=after)
+        seen += ids(rows)
+        if len(rows) < page_size:
+            break
+        after = sparse.sort_key(rows[-1], sort)
+    assert seen == expected
+
+    for position, student_id in enumerate(expected):
+        assert sparse.student_position(sparse.get_student(student_id), sort) == position
+
+
+@pytest.mark.parametrize("sort", NULL_SORTS)
+def test_table_model_keeps_null_rows(sparse, sort):
+    from table_model import StudentTableModel
+
+    model = StudentTableModel(sparse, page_size=2)
+    model.set_sort(sort)
+    model.set_filters(course="Law")
+    assert ids(model.rows(0, len(model))) == \
+        ids(sparse.get_students_sorted(sort, limit=100, course="Law"))
@@ -0,0 +1,106 @@
+import asyncio
+import statistics
+
+import pytest
+
+from async_database import AsyncDatabaseManager
+from conftest import make_student
+from database import AT_RISK_THRESHOLD, histogram_percentile
+
+
+def expected(students, course=None):
+    """Statistics computed the slow way, from the student rows"""
+    rows = [s for s in students if course is None or s["course"] == course]
+    attendance = sorted(s["attendance_percent"] for s in rows)
+    grades = {}
+    for s in rows:
+        grades[s["grade"]] = grades.get(s["grade"], 0) + 1
+    return {"students": len(rows), "grades": grades,
+            "attendance_mean": pytest.approx(statistics.fmean(attendance)),
+            "attendance_median": pytest.approx(statistics.median(attendance)),
+            "at_risk": sum(1 for value in attendance if value < AT_RISK_THRESHOLD)}
+
+
+def actual(stats):
+    return {"students": stats.students, "grades": stats.grades,
+            "attendance_mean": stats.attendance_mean,
+            "attendance_median": stats.attendance_median, "at_risk": stats.at_risk}
+
+
+def check(db):
+    students = db.get_all_students()
+    by_course = {stats.course: stats for stats in db.get_course_statistics()}
+    assert sorted(by_course) == sorted({s["course"] for s in students})
+    for course, stats in by_course.items():
+        assert actual(stats) == expected(students, course)
+    assert actual(db.get_overall_statistics()) == expected(students)
+
+
+@pytest.fixture
+def roster(db):
+    db.add_students_bulk([
+        make_student(i, student_id=f"2024{i:03d}", course=("Law", "Nursing", "Music")[i % 3],
+                     grade="ABCDF"[i % 5], attendance_percent=float((i * 37) % 101))
+        for i in range(1, 31)])
+    return db
+
+
+def test_summary_matches_the_student_rows(roster):
+    check(roster)
+
+
+def test_triggers_follow_inserts_updates_and_deletes(roster):
+    roster.add_student(make_student(99, student_id="2024099", course="Art", grade="A",
+                                    attendance_percent=12.5))
+    check(roster)
+    roster.update_student("2024001", {"course": "Art", "attendance_percent": 99.0})
+    roster.update_student("2024002", {"grade": "F"})
+    check(roster)
+    roster.delete_student("2024099")
+    roster.delete_students(course="Music")
+    check(roster)
+    roster.update_students({"attendance_percent": 50.0}, ["2024004", "2024005"])
+    check(roster)
+
+
+def test_empty_courses_disappear(roster):
+    roster.delete_students(course="Law")
+    assert "Law" not in {stats.course for stats in roster.get_course_statistics()}
+    assert roster.get_course_statistics("Law") == []
+
+
+def test_percentiles_interpolate_like_numpy():
+    values, cumulative = [10.0, 20.0, 40.0], [1, 3, 4]  # data: 10, 20, 20, 40
+    assert histogram_percentile(values, cumulative, 0) == 10.0
+    assert histogram_percentile(values, cumulative, 50) == 20.0
+    assert histogram_percentile(values, cumulative, 90) == pytest.approx(34.0)
+    assert histogram_percentile(values, cumulative, 100) == 40.0
+
+
+def test_custom_percentiles_and_threshold(roster):
+    (law,) = roster.get_course_statistics("Law", percentiles=(10, 90), at_risk_below=50)
+    values = sorted(s["attendance_percent"] for s in roster.filter_by_course("Law"))
+    assert sorted(law.attendance_percentiles) == [10, 90]
+    assert law.attendance_percentiles[10] <= law.attendance_median <= \
+        law.attendance_percentiles[90]
+    assert law.at_risk == sum(1 for value in values if value < 50)
+
+
+def test_rebuild_restores_drifted_tables(roster):
+    with roster.get_db_cursor() as cursor:
+        cursor.execute("DELETE FROM course_grade_counts WHERE course = 'Law';")
+        cursor.execute("UPDATE course_attendance_counts SET students = students + 5;")
+    roster.rebuild_statistics()
+    check(roster)
+
+
+def test_async_variants(roster, db_path):
+    async def main():
+        async with AsyncDatabaseManager(db_path) as adb:
+            await adb.rebuild_statistics()
+            return (await adb.get_course_statistics("Nursing"),
+                    await adb.get_overall_statistics())
+
+    nursing, overall = asyncio.run(main())
+    assert nursing == roster.get_course_statistics("Nursing")
+    assert overall == roster.get_overall_statistics()
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import make_student
+from database import DatabaseManager
+
+
+def set_sequence(db, year, next_value, digits=3):
+    with db.get_db_cursor() as cursor:
+        cursor.execute("INSERT OR REPLACE INTO id_sequences (year, next_value, digits) "
+                       "VALUES (?, ?, ?);", (year, next_value, digits))
+
+
+def test_allocates_consecutive_ids(db):
+    assert db.allocate_student_ids(3, 2030) == ["2030001", "2030002", "2030003"]
+    assert db.allocate_student_id(2030) == "2030004"
+    assert db.allocate_student_id(2031) == "2031001"
+
+
+def test_first_allocation_starts_after_existing_ids(db):
+    db.add_student(make_student(1, student_id="2030041"))
+    assert db.allocate_student_id(2030) == "2030042"
+
+
+def test_hand_entered_ids_move_the_sequence_past_them(db):
+    assert db.allocate_student_id(2030) == "2030001"
+    db.add_student(make_student(1, student_id="2030007"))
+    db.add_students_bulk([make_student(2, student_id="2030009")])
+    assert db.allocate_student_id(2030) == "2030010"
+    # An entered ID below the counter leaves it alone
+    db.add_student(make_student(3, student_id="2030002"))
+    assert db.allocate_student_id(2030) == "2030011"
+
+
+def test_year_widens_when_three_digits_run_out(db):
+    set_sequence(db, 2030, 998)
+    assert db.allocate_student_ids(3, 2030) == ["2030000998", "2030000999", "2030001000"]
+    assert db.allocate_student_id(2030) == "2030001001"
+    assert db.allocate_student_id(2031) == "2031001"
+
+
+def test_width_is_stored_for_other_managers(db_path):
+    wide = DatabaseManager(db_path, wide_student_ids=True)
+    assert wide.allocate_student_id(2030) == "2030000001"
+    wide.close()
+    narrow = DatabaseManager(db_path)
+    assert narrow.allocate_student_id(2030) == "2030000002"
+    narrow.close()
+
+
+def test_existing_wide_ids_set_the_width(db):
+    db.add_students_bulk([make_student(1, student_id="2030000005")])
+    assert db.allocate_student_id(2030) == "2030000006"
+
+
+def test_exhausted_year_raises_value_error_and_keeps_the_counter(db):
+    set_sequence(db, 2030, 999_999, digits=6)
+    with pytest.raises(ValueError, match="exhausted"):
+        db.allocate_student_ids(2, 2030)
+    assert db.allocate_student_id(2030) == "2030999999"
+
+
+def test_exhausted_ids_are_bulk_import_failures(db):
+    set_sequence(db, datetime.now().year, 999_999, digits=6)
+    rows = [make_student(1), make_student(2, student_id="2020001"), make_student(3)]
+    result = db.add_students_bulk(rows)
+    assert result.inserted == 1
+    assert [(index, student_id) for index, student_id, _ in result.failed] == [(0, None),
+                                                                               (2, None)]
+    assert "exhausted" in result.failed[0][2]
@@ -0,0 +1,76 @@
+import pytest
+
+from conftest import make_student
+from table_model import StudentTableModel
+
+
+@pytest.fixture
+def roster(db):
+    db.add_students_bulk([
+        make_student(i, student_id=f"2024{i:03d}", full_name=f"Student {i:03d}",
+                     course=("Law", "Music", "Nursing")[i % 3],
+                     attendance_percent=float(i % 40 + 50))
+        for i in range(1, 101)])
+    return db
+
+
+@pytest.fixture
+def model(roster):
+    return StudentTableModel(roster, page_size=10, max_pages=3)
+
+
+def ids(rows):
+    return [row["student_id"] for row in rows]
+
+
+def test_rows_span_pages_in_sort_order(model, roster):
+    everything = ids(roster.get_all_students())
+    assert len(model) == 100
+    assert ids(model.rows(5, 25)) == everything[5:25]
+    assert ids(model.rows(95, 200)) == everything[95:]
+    assert model.rows(100, 110) == [] and model.rows(30, 30) == []
+    assert ids(model.rows(-5, 3)) == everything[:3]
+
+
+def test_pages_are_kept_in_a_bounded_lru(model):
+    model.rows(0, 50)
+    assert sorted(model._pages) == [2, 3, 4]
+    model.rows(20, 21)                  # touch page 2 so page 3 is the oldest
+    model.rows(70, 71)
+    assert sorted(model._pages) == [2, 4, 7]
+
+
+def test_scrolling_seeks_from_the_previous_page(model, roster, monkeypatch):
+    calls = []
+    fetch = roster.get_students_sorted
+
+    def spy(sort, offset=0, limit=None, after=None, **filters):
+        calls.append((offset, after))
+        return fetch(sort, offset=offset, limit=limit, after=after, **filters)
+
+    monkeypatch.setattr(roster, "get_students_sorted", spy)
+    model.rows(0, 30)
+    model.rows(60, 61)
+    assert calls[0] == (0, None)
+    assert [after for _, after in calls[1:3]] == [("Student 010", "2024010"),
+                                                  ("Student 020", "2024020")]
+    assert calls[3] == (60, None)       # a jump falls back to OFFSET
+
+
+def test_sort_and_filters_run_in_the_database(model, roster):
+    model.set_filters(course="Law", grade=None)
+    model.set_sort([("attendance_percent", True)])
+    law = roster.filter_by_course("Law")
+    expected = sorted(law, key=lambda row: (-row["attendance_percent"], row["full_name"],
+                                            row["student_id"]))
+    assert len(model) == len(law)
+    assert ids(model.rows(0, len(model))) == ids(expected)
+
+
+def test_invalidate_picks_up_writes(model, roster):
+    model.rows(0, 10)
+    roster.add_student(make_student(0, student_id="2024000", full_name="Aaron First"))
+    assert len(model) == 100
+    model.invalidate()
+    assert len(model) == 101
+    assert model.rows(0, 1)[0]["student_id"] == "2024000"
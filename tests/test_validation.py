@@ -0,0 +1,103 @@
+import pytest
+
+import validation
+from conftest import make_student
+from utils import sanitize_input, validate_email, validate_phone
+from validation import (
+    iter_validated_batches, sanitize_column, validate_attendance_column, validate_email_column,
+    validate_grade_column, validate_phone_column, validate_student_id_column,
+    validate_student_records
+)
+
+EMAILS = ["ann@example.edu", "a.b+c@sub.example.org", "no-at-sign", "two@@example.edu",
+          ".dot@example.edu", "dots..twice@example.edu", "ann@-bad.edu", "ann@example.e",
+          "x" * 65 + "@example.edu", "ann@" + "a" * 252 + ".edu", "ünï@example.edu", ""]
+PHONES = ["0545678910", "+233545678910", "+233-54-567-8910", "(555) 123-4567", "+44 20 7946 0958",
+          "12345", "phone", "1" * 16]
+
+
+def test_email_column_agrees_with_utils():
+    result = validate_email_column(EMAILS)
+    assert result.valid == [validate_email(email) for email in EMAILS]
+    assert result.values[0] == "ann@example.edu"
+    assert result.errors[2] == validation.BAD_AT
+    assert result.errors[4] == validation.BAD_LOCAL
+    assert result.errors[6] == validation.BAD_DOMAIN
+    assert result.errors[-1] == validation.REQUIRED
+
+
+def test_email_column_strips_and_rejects_non_text():
+    result = validate_email_column(["  ann@example.edu ", None, 42])
+    assert result.values[0] == "ann@example.edu"
+    assert result.errors[1:] == [validation.REQUIRED, validation.NOT_TEXT]
+
+
+def test_phone_column_agrees_with_utils():
+    result = validate_phone_column(PHONES)
+    assert result.valid == [validate_phone(phone) for phone in PHONES]
+    assert result.values[:3] == ["+233-54-567-8910"] * 3
+    assert result.values[3] == "5551234567"
+    assert validate_phone_column([""]).values == [""]
+    assert validate_phone_column([""], allow_empty=False).errors == [validation.REQUIRED]
+
+
+def test_text_attendance_grade_and_id_columns():
+    texts = ["  Ann   <b>Lee</b> ", "O'Brien; drop", 12]
+    assert sanitize_column(texts).values == [sanitize_input(text) for text in texts]
+    assert sanitize_column(["<>", None]).errors == [validation.REQUIRED] * 2
+    assert sanitize_column([""], required=False).values == [""]
+
+    attendance = validate_attendance_column(["75.5", 100, None, -1, "abc"])
+    assert attendance.values[:3] == [75.5, 100.0, 0.0]
+    assert attendance.errors[3:] == [validation.OUT_OF_RANGE, validation.BAD_NUMBER]
+
+    grades = validate_grade_column([" b ", None, "n/a", "E"])
+    assert grades.values[:3] == ["B", "N/A", "N/A"]
+    assert grades.errors[3] == validation.BAD_GRADE
+
+    ids = validate_student_id_column(["2024001", " 2024000001 ", "", "24001", 2024001])
+    assert ids.values[:3] == ["2024001", "2024000001", None]
+    assert ids.valid == [True, True, True, False, False]
+    assert validate_student_id_column([None], allow_empty=False).errors == [validation.REQUIRED]
+
+
+def test_records_are_normalized_or_explained():
+    records = [make_student(1, grade="a", phone="0545678910"),
+               make_student(2, email="bad", attendance_percent=101),
+               "not a record"]
+    result = validate_student_records(records)
+    assert result.valid == [True, False, False]
+    assert result.valid_count == 1
+    assert result.records[0]["grade"] == "A"
+    assert result.records[0]["phone"] == "+233-54-567-8910"
+    assert result.records[0]["student_id"] is None
+    assert result.errors[1] == (f"email: {validation.BAD_AT}; "
+                                f"attendance_percent: {validation.OUT_OF_RANGE}")
+    assert result.errors[2] == validation.NOT_A_RECORD
+
+
+def test_repeated_values_validate_like_distinct_ones():
+    records = [make_student(i % 3, course="Law" if i % 2 else "", grade="bcz"[i % 3])
+               for i in range(30)]
+    batched = validate_student_records(records)
+    one_by_one = [validate_student_records([record]) for record in records]
+    assert batched.records == [result.records[0] for result in one_by_one]
+    assert batched.errors == [result.errors[0] for result in one_by_one]
+    # Unhashable values fall back to validating the column as is
+    unhashable = [make_student(i, course=["Law"]) for i in range(3)]
+    assert validate_student_records(unhashable).records == \
+        [validate_student_records([record]).records[0] for record in unhashable]
+
+
+def test_batches_cover_the_stream():
+    records = (make_student(i) for i in range(25))
+    sizes = [len(batch.valid) for batch in iter_validated_batches(records, batch_size=10)]
+    assert sizes == [10, 10, 5]
+    assert list(iter_validated_batches([], batch_size=10)) == []
+
+
+@pytest.mark.parametrize("email", EMAILS)
+def test_fast_path_agrees_with_the_slow_path(email):
+    fast = validation.EMAIL_RE.fullmatch(email) is not None
+    slow = validation._check_email(email)[0] is not None
+    assert fast == slow
@@ -4,6 +4,19 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns shared by the per-value helpers below and by the
+# batch validators in validation.py.
+_EMAIL_LOCAL_CHARS = r"a-zA-Z0-9!#$%&'*+\-/=?^_`{|}~"
+# Dot-separated runs of allowed characters. Written without the nested
+# optional dot so that long invalid input cannot backtrack exponentially.
+EMAIL_LOCAL_RE = re.compile(rf'^[{_EMAIL_LOCAL_CHARS}]+(\.[{_EMAIL_LOCAL_CHARS}]+)*$')
+EMAIL_DOMAIN_RE = re.compile(
+    r'^[a-zA-Z0-9]([a-zA-Z0-9\-]*[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]*[a-zA-Z0-9])?)*\.[a-zA-Z]{2,}$'
+)
+PHONE_STRIP_RE = re.compile(r'[^\d+]')
+STUDENT_ID_RE = re.compile(r'^\d{4}(\d{3}|\d{6})$')
+UNSAFE_CHARS_RE = re.compile(r'[<>&;\'"]')
+
 def validate_email(email: str) -> bool:
     """
     Validate email format.
@@ -28,10 +41,7 @@ def validate_email(email: str) -> bool:
     if len(local) > 64 or len(domain) > 255:
         return False
     
-    local_pattern = r'^[a-zA-Z0-9!#$%&\'*+\-/=?^_`{|}~]+([\.]?[a-zA-Z0-9!#$%&\'*+\-/=?^_`{|}~]+)*$'
-    domain_pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9\-]*[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]*[a-zA-Z0-9])?)*\.[a-zA-Z]{2,}$'
-    
-    return bool(re.match(local_pattern, local) and re.match(domain_pattern, domain))
+    return bool(EMAIL_LOCAL_RE.match(local) and EMAIL_DOMAIN_RE.match(domain))
 
 def validate_phone(phone: str) -> bool:
     """
@@ -47,7 +57,7 @@ def validate_phone(phone: str) -> bool:
     - 0545678910 (Local Ghana format)
     """
     # Remove all non-digit characters except leading +
-    digits = re.sub(r'[^\d+]', '', phone)
+    digits = PHONE_STRIP_RE.sub('', phone)
     
     # Handle Ghanaian local format (convert 0... to +233...)
     if digits.startswith('0') and len(digits) == 10:
@@ -59,10 +69,30 @@ def validate_phone(phone: str) -> bool:
     # Check if remaining string contains only digits and has correct length
     return bool(digits.isdigit() and 10 <= len(digits) <= 15)
 
+# Student IDs are a 4-digit year followed by a zero-padded sequence number.
+# The standard format has 3 sequence digits (2024001); the wide format has 6
+# (2024000001) for years with more than 999 enrollments.
+STUDENT_ID_SEQUENCE_DIGITS = 3
+WIDE_STUDENT_ID_SEQUENCE_DIGITS = 6
+
 def validate_student_id(student_id: str) -> bool:
-    """Validate student ID format (e.g., 2024001)"""
-    pattern = r'^\d{7}$'
-    return bool(re.match(pattern, student_id))
+    """Validate student ID format (e.g., 2024001 or wide format 2024000001)"""
+    return bool(STUDENT_ID_RE.match(student_id))
+
+def format_student_id(year: int, sequence: int,
+                      digits: int = STUDENT_ID_SEQUENCE_DIGITS) -> str:
+    """
+    Format a year and sequence number as a student ID.
+
+    Raises:
+        ValueError: If the sequence does not fit in the requested width
+    """
+    if not 1 <= sequence < 10 ** digits:
+        raise ValueError(
+            f"Sequence {sequence} does not fit in {digits} digits; "
+            f"use the wide student ID format"
+        )
+    return f"{year:04d}{sequence:0{digits}d}"
 
 def format_phone_number(phone: str) -> str:
     """
@@ -73,7 +103,7 @@ def format_phone_number(phone: str) -> str:
     - 0545678910 -> +233-54-567-8910
     """
     # Remove all non-digit characters except leading +
-    digits = re.sub(r'[^\d+]', '', phone)
+    digits = PHONE_STRIP_RE.sub('', phone)
     
     # Convert local Ghana format to international
     if digits.startswith('0') and len(digits) == 10:
@@ -88,18 +118,16 @@ def format_phone_number(phone: str) -> str:
     # For other formats, keep as is with just the + if present
     return digits
 
+# (minimum score, letter), highest first; anything lower is an F
+GRADE_BOUNDARIES = ((90, 'A'), (80, 'B'), (70, 'C'), (60, 'D'))
+FAILING_GRADE = 'F'
+
 def calculate_grade(score: float) -> str:
     """Convert numerical score to letter grade"""
-    if score >= 90:
-        return 'A'
-    elif score >= 80:
-        return 'B'
-    elif score >= 70:
-        return 'C'
-    elif score >= 60:
-        return 'D'
-    else:
-        return 'F'
+    for minimum, letter in GRADE_BOUNDARIES:
+        if score >= minimum:
+            return letter
+    return FAILING_GRADE
 
 def sanitize_input(text: str) -> str:
     """
@@ -117,12 +145,17 @@ def sanitize_input(text: str) -> str:
     text = ' '.join(text.split())
     
     # Remove potentially harmful characters
-    text = re.sub(r'[<>&;\'"]', '', text)
+    text = UNSAFE_CHARS_RE.sub('', text)
     
     return text.strip()
 
 def generate_student_id(year: Optional[int] = None) -> str:
-    """Generate a unique student ID based on year and sequence"""
+    """
+    Generate a random student ID based on year and sequence.
+
+    IDs are not guaranteed unique; use DatabaseManager.allocate_student_id
+    for collision-free IDs.
+    """
     from datetime import datetime
     import random
     
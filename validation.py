@@ -0,0 +1,319 @@
+"""
+Batch validation for columns of values and streams of student records.
+
+The per-value helpers in utils.py are convenient for forms; these functions
+validate a whole column in one pass with precompiled patterns bound to
+locals, and return three parallel lists:
+- valid: True/False per input value
+- values: the normalized value (None where invalid)
+- errors: None, or a short reason for invalid values
+
+Error reasons are shared constant strings, so a valid value costs no extra
+allocation beyond its normalized form.
+"""
+import re
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from utils import (
+    EMAIL_LOCAL_RE, EMAIL_DOMAIN_RE, PHONE_STRIP_RE, STUDENT_ID_RE, UNSAFE_CHARS_RE
+)
+
+# utils.EMAIL_LOCAL_RE and utils.EMAIL_DOMAIN_RE fused into a single pattern,
+# with the 64/255 character limits of the two parts as lookaheads
+_LOCAL_CHARS = r"a-zA-Z0-9!#$%&'*+\-/=?^_`{|}~"
+_DOMAIN_LABEL = r"[a-zA-Z0-9](?:[a-zA-Z0-9\-]*[a-zA-Z0-9])?"
+EMAIL_RE = re.compile(
+    rf"(?=[^@]{{1,64}}@)[{_LOCAL_CHARS}]+(?:\.[{_LOCAL_CHARS}]+)*"
+    rf"@(?=[^@]{{1,255}}\Z){_DOMAIN_LABEL}(?:\.{_DOMAIN_LABEL})*\.[a-zA-Z]{{2,}}"
+)
+
+VALID_GRADES = frozenset(('A', 'B', 'C', 'D', 'F', 'N/A'))
+
+# Error reasons
+REQUIRED = "required"
+NOT_TEXT = "not a string"
+TOO_LONG = "too long"
+BAD_AT = "must contain exactly one @"
+BAD_LOCAL = "invalid local part"
+BAD_DOMAIN = "invalid domain"
+BAD_PHONE = "must have 10-15 digits"
+BAD_NUMBER = "not a number"
+OUT_OF_RANGE = "must be between 0 and 100"
+BAD_GRADE = "must be one of A, B, C, D, F"
+BAD_STUDENT_ID = "invalid student ID format"
+NOT_A_RECORD = "not a mapping"
+
+
+@dataclass
+class ColumnResult:
+    """Validity mask, normalized values and error reasons for one column"""
+    valid: List[bool]
+    values: List[Any]
+    errors: List[Optional[str]]
+
+    @property
+    def valid_count(self) -> int:
+        return sum(self.valid)
+
+    @property
+    def all_valid(self) -> bool:
+        return all(self.valid)
+
+
+@dataclass
+class RecordBatchResult:
+    """Per-record validity, normalized records and combined error reasons"""
+    valid: List[bool]
+    records: List[Optional[Dict[str, Any]]]
+    errors: List[Optional[str]]
+
+    @property
+    def valid_count(self) -> int:
+        return sum(self.valid)
+
+
+def validate_email_column(values: Sequence[Any]) -> ColumnResult:
+    """
+    Validate emails; normalization strips surrounding whitespace.
+
+    Same rules as utils.validate_email. The whole column is first checked
+    with one combined regex per value; only values that fail it go through
+    the slower path that strips them and works out the reason.
+    """
+    fullmatch = EMAIL_RE.fullmatch
+    valid = [fullmatch(v) is not None if v.__class__ is str else False for v in values]
+    out = list(values)
+    errors: List[Optional[str]] = [None] * len(out)
+    for i, ok in enumerate(valid):
+        if not ok:
+            value, errors[i] = _check_email(values[i])
+            out[i] = value
+            valid[i] = value is not None
+    return ColumnResult(valid, out, errors)
+
+
+def _check_email(value: Any):
+    """Slow path for one email: returns (normalized or None, error or None)"""
+    if not isinstance(value, str):
+        return None, REQUIRED if value is None else NOT_TEXT
+    value = value.strip()
+    if not value:
+        return None, REQUIRED
+    if len(value) > 320:
+        return None, TOO_LONG
+    if value.count('@') != 1:
+        return None, BAD_AT
+    local, _, domain = value.partition('@')
+    if not local or len(local) > 64 or not EMAIL_LOCAL_RE.match(local):
+        return None, BAD_LOCAL
+    if not domain or len(domain) > 255 or not EMAIL_DOMAIN_RE.match(domain):
+        return None, BAD_DOMAIN
+    return value, None
+
+
+def validate_phone_column(values: Iterable[Any], allow_empty: bool = True) -> ColumnResult:
+    """
+    Validate phone numbers and normalize them like utils.format_phone_number.
+
+    Empty values are valid (normalized to '') when allow_empty is True.
+    """
+    strip = PHONE_STRIP_RE.sub
+    valid, out, errors = [], [], []
+    add_valid, add_value, add_error = valid.append, out.append, errors.append
+
+    for value in values:
+        if value is None or value == '':
+            add_valid(allow_empty)
+            add_value('' if allow_empty else None)
+            add_error(None if allow_empty else REQUIRED)
+            continue
+        if not isinstance(value, str):
+            value = str(value)
+        digits = strip('', value)
+        if digits.startswith('0') and len(digits) == 10:
+            digits = '+233' + digits[1:]
+        bare = digits[1:] if digits.startswith('+') else digits
+        if not (bare.isdigit() and 10 <= len(bare) <= 15):
+            add_valid(False)
+            add_value(None)
+            add_error(BAD_PHONE)
+            continue
+        if digits.startswith('+233') and len(digits) == 13:
+            digits = f"{digits[:4]}-{digits[4:6]}-{digits[6:9]}-{digits[9:]}"
+        add_valid(True)
+        add_value(digits)
+        add_error(None)
+    return ColumnResult(valid, out, errors)
+
+
+def sanitize_column(values: Iterable[Any], required: bool = True) -> ColumnResult:
+    """Sanitize free text like utils.sanitize_input; empty is invalid if required"""
+    remove_unsafe = UNSAFE_CHARS_RE.sub
+    valid, out, errors = [], [], []
+    add_valid, add_value, add_error = valid.append, out.append, errors.append
+
+    for value in values:
+        if value is None:
+            value = ''
+        elif not isinstance(value, str):
+            value = str(value)
+        value = remove_unsafe('', ' '.join(value.split())).strip()
+        if required and not value:
+            add_valid(False)
+            add_value(None)
+            add_error(REQUIRED)
+        else:
+            add_valid(True)
+            add_value(value)
+            add_error(None)
+    return ColumnResult(valid, out, errors)
+
+
+def validate_attendance_column(values: Iterable[Any], default: float = 0.0) -> ColumnResult:
+    """Parse attendance percentages; None/'' become default"""
+    valid, out, errors = [], [], []
+    add_valid, add_value, add_error = valid.append, out.append, errors.append
+
+    for value in values:
+        if value is None or value == '':
+            add_valid(True)
+            add_value(default)
+            add_error(None)
+            continue
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            add_valid(False)
+            add_value(None)
+            add_error(BAD_NUMBER)
+            continue
+        if 0 <= number <= 100:
+            add_valid(True)
+            add_value(number)
+            add_error(None)
+        else:
+            add_valid(False)
+            add_value(None)
+            add_error(OUT_OF_RANGE)
+    return ColumnResult(valid, out, errors)
+
+
+def validate_grade_column(values: Iterable[Any], default: str = 'N/A') -> ColumnResult:
+    """Upper-case and check letter grades; None/'' become default"""
+    valid, out, errors = [], [], []
+    add_valid, add_value, add_error = valid.append, out.append, errors.append
+
+    for value in values:
+        grade = str(value).strip().upper() if value is not None else ''
+        if not grade:
+            grade = default
+        if grade in VALID_GRADES:
+            add_valid(True)
+            add_value(grade)
+            add_error(None)
+        else:
+            add_valid(False)
+            add_value(None)
+            add_error(BAD_GRADE)
+    return ColumnResult(valid, out, errors)
+
+
+def validate_student_id_column(values: Iterable[Any], allow_empty: bool = True) -> ColumnResult:
+    """Check student ID format; empty IDs are valid when they will be allocated"""
+    match = STUDENT_ID_RE.match
+    valid, out, errors = [], [], []
+    add_valid, add_value, add_error = valid.append, out.append, errors.append
+
+    for value in values:
+        if value is None or value == '':
+            add_valid(allow_empty)
+            add_value(None)
+            add_error(None if allow_empty else REQUIRED)
+        elif isinstance(value, str) and match(value.strip()):
+            add_valid(True)
+            add_value(value.strip())
+            add_error(None)
+        else:
+            add_valid(False)
+            add_value(None)
+            add_error(BAD_STUDENT_ID)
+    return ColumnResult(valid, out, errors)
+
+
+# Column validators applied to student records, in output column order
+RECORD_VALIDATORS = (
+    ('full_name', sanitize_column),
+    ('student_id', validate_student_id_column),
+    ('course', sanitize_column),
+    ('email', validate_email_column),
+    ('phone', validate_phone_column),
+    ('attendance_percent', validate_attendance_column),
+    ('grade', validate_grade_column),
+)
+
+
+def validate_student_records(records: Sequence[Any]) -> RecordBatchResult:
+    """
+    Validate and normalize a batch of student dicts column by column.
+
+    Returns normalized records (None where invalid) and, for invalid
+    records, a reason such as "email: invalid domain; grade: must be ...".
+    """
+    is_record = [record.__class__ is dict or isinstance(record, dict) for record in records]
+    rows = records if all(is_record) else [
+        record if mapping else {} for record, mapping in zip(records, is_record)]
+
+    names = [name for name, _ in RECORD_VALIDATORS]
+    columns = [_validate_distinct(validator, [row.get(name) for row in rows])
+               for name, validator in RECORD_VALIDATORS]
+
+    valid = [all(flags) for flags in zip(is_record, *(c.valid for c in columns))]
+    normalized: List[Optional[Dict[str, Any]]] = [
+        dict(zip(names, values)) if row_valid else None
+        for row_valid, values in zip(valid, zip(*(c.values for c in columns)))
+    ]
+    errors: List[Optional[str]] = [None] * len(valid)
+    for i, row_valid in enumerate(valid):
+        if row_valid:
+            continue
+        if not is_record[i]:
+            errors[i] = NOT_A_RECORD
+        else:
+            errors[i] = "; ".join(f"{name}: {column.errors[i]}"
+                                  for name, column in zip(names, columns) if column.errors[i])
+    return RecordBatchResult(valid, normalized, errors)
+
+
+def _validate_distinct(validator, column: List[Any]) -> ColumnResult:
+    """
+    Run a column validator on distinct values only and expand the result.
+
+    Columns such as course, grade and attendance repeat a handful of values
+    across thousands of rows, so this skips most of the per-value work.
+    """
+    try:
+        distinct = list(dict.fromkeys(column))
+    except TypeError:
+        # Unhashable values; validate the column as is
+        return validator(column)
+    if len(distinct) * 2 > len(column):
+        return validator(column)
+    result = validator(distinct)
+    lookup = {value: i for i, value in enumerate(distinct)}
+    positions = [lookup[value] for value in column]
+    return ColumnResult([result.valid[i] for i in positions],
+                        [result.values[i] for i in positions],
+                        [result.errors[i] for i in positions])
+
+
+def iter_validated_batches(records: Iterable[Any],
+                           batch_size: int = 10000) -> Iterator[RecordBatchResult]:
+    """Validate a stream of records in fixed-size batches"""
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield validate_student_records(batch)